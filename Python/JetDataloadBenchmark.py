@@ -0,0 +1,400 @@
+
+# coding: utf-8
+
+# Jet Dataload Benchmark
+# Author: Steven Henkel
+# Purpose: To measure the loader without salesforce or oracle. Synthetic BlackBerry, Good and AtHoc reports are generated, served by a local
+#          stand-in for the salesforce report export and loaded into sqlite, and the rows per second and peak memory of each stage are reported for
+#          importSalesForceToSql and appendTableList.
+# Usage: python JetDataloadBenchmark.py --rows 10000 100000 1000000 --instances BlackBerry Good AtHoc
+
+import argparse
+import http.server
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import tracemalloc
+import types
+
+import jetdataload.core
+from jetdataload.core import *
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to add the peak traced memory of each stage to ImportMetrics (tracemalloc must be tracing).
+#         The peak is read and reset whenever the stage changes, so each peak belongs to the stage that was running.
+class BenchmarkMetrics(ImportMetrics):
+    def __init__(self, tableName, reportIdentifier, instanceName = ""):
+        ImportMetrics.__init__(self, tableName, reportIdentifier, instanceName)
+        self.stagePeakBytes = collections.OrderedDict()
+        tracemalloc.reset_peak()
+
+    #Purpose: Time the stage as ImportMetrics does, recording the peak memory of the stage it pauses and of itself
+    @contextlib.contextmanager
+    def stage(self, stageName):
+        self.recordPeak()
+        with ImportMetrics.stage(self, stageName):
+            try:
+                yield self
+            finally:
+                self.recordPeak()
+
+    #Purpose: Give the peak since the last stage change to the stage running now (or "other" outside of the stages)
+    def recordPeak(self):
+        stageStack = self.threadState.__dict__.get("stageStack", [])
+        stageName = "other"
+        if(stageStack != []):
+            stageName = stageStack[-1][0]
+        self.stagePeakBytes[stageName] = max(self.stagePeakBytes.get(stageName, 0), tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to write a synthetic report export in the salesforce layout: every field quoted, a blank line, then the footer.
+#         Names contain commas and quotes (and the odd newline) so the csv quoting is exercised the same way as a real export.
+#    fileName <String>: The file to write
+#    instanceName <String>: The instance the columns are shaped like (a key of reportSpecDict)
+#    rowCount <Number>: The number of rows
+#    seed <Number>: The random seed, so a run can be repeated (default: 0)
+def generateReport(fileName, instanceName, rowCount, seed = 0):
+    randomValue = random.Random(seed)
+    columnSpecList = reportSpecDict[instanceName]["columnSpecList"]
+    baseDate = datetime.date(2012, 1, 1)
+
+    def fieldValue(kind, rowNumber):
+        if(kind == "id"):
+            return "006" + format(rowNumber, "012d")
+        elif(kind == "accountId"):
+            return "001" + format(randomValue.randrange(rowCount // 10 + 1), "012d")
+        elif(kind == "date"):
+            if(randomValue.random() < 0.02):
+                return ""
+            day = baseDate + datetime.timedelta(days = randomValue.randrange(2000))
+            return str(day.month) + "/" + str(day.day) + "/" + str(day.year)
+        elif(kind == "amount"):
+            return "{:,.2f}".format(randomValue.randrange(0, 5000000) / 100.0)
+        elif(kind == "currency"):
+            return "USD"
+        elif(kind == "integer"):
+            return str(randomValue.randrange(0, 1500))
+        elif(kind == "probability"):
+            return str(randomValue.choice([0, 10, 25, 50, 75, 90, 100])) + "%"
+        elif(kind == "name"):
+            nameString = randomValue.choice(nameList) + " " + str(randomValue.randrange(100000))
+            if(randomValue.random() < 0.05):
+                nameString += ', "' + randomValue.choice(nameList) + '"'
+            if(randomValue.random() < 0.001):
+                nameString += "\n" + randomValue.choice(nameList)
+            return nameString
+        return randomValue.choice(valueListDict.get(kind, valueListDict["text"]))
+
+    with open(fileName, "w", newline = "", encoding = "utf-8") as reportFile:
+        reportWriter = csv.writer(reportFile, quoting = csv.QUOTE_ALL, lineterminator = "\n")
+        reportWriter.writerow(listColumn(columnSpecList, 0))
+        for i in range(0, rowCount):
+            reportWriter.writerow([fieldValue(j[1], i) for j in columnSpecList])
+        reportFile.write('\n"' + reportSpecDict[instanceName]["reportName"] + '"\n"Copyright (c) 2000-2016 salesforce.com, inc. All rights reserved."\n' +
+                         '"Confidential Information - Do Not Distribute"\n"Generated By:  Benchmark  ' + str(datetime.datetime.now()) + '"\n')
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to start a local stand-in for the salesforce report export on its own thread.
+#         GET /<report identifier>?export=1 streams the file registered for that report in reportFileDict.
+#    reportFileDict <dictionary>: The report file for each report identifier
+#    byteChunkSize <Number>: The number of bytes to send at a time (default: 65536)
+#Returns: The http server (its url is "http://127.0.0.1:" + str(server.server_port) + "/"; stop it with server.shutdown())
+def startReportServer(reportFileDict, byteChunkSize = 65536):
+    class ReportHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            reportUrl = urllib.parse.urlsplit(self.path)
+            reportIdentifier = reportUrl.path.strip("/")
+            if(reportIdentifier not in reportFileDict or "export=1" not in reportUrl.query):
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=UTF-8")
+            self.send_header("Content-Length", str(os.path.getsize(reportFileDict[reportIdentifier])))
+            self.end_headers()
+            with open(reportFileDict[reportIdentifier], "rb") as reportFile:
+                shutil.copyfileobj(reportFile, self.wfile, byteChunkSize)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ReportHandler)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    return server
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to stand in for the cx_Oracle session pool with sqlite connections, so oracleConnection (and appendTableList) run against the sink
+#    fileName <String>: The sqlite database file
+class SqlitePool:
+    def __init__(self, fileName):
+        self.fileName = fileName
+
+    def acquire(self):
+        return sqlite3.connect(self.fileName, check_same_thread = False)
+
+    def release(self, connection):
+        connection.close()
+
+    def drop(self, connection):
+        connection.close()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to point the loader at a sqlite database: engineSqlAlchemy for importSalesForceToSql (with loader = 'sqlalchemy')
+#         and the oracle pool for the sql steps
+#    fileName <String>: The sqlite database file
+def useSqliteSink(fileName):
+    jetdataload.core.engineSqlAlchemy = sqlalchemy.create_engine("sqlite:///" + fileName)
+    jetdataload.core.oraclePool = SqlitePool(fileName)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to load one generated report through the stand-in and into the sink, and return its metrics
+#    serverUrl <String>: The url of the report server
+#    instanceName <String>: The instance (a key of reportSpecDict)
+#    chunkRows <Number>: The chunkRows parameter of importSalesForceToSql
+#    batchSize <Number>: The batchSize parameter of importSalesForceToSql
+#    pipelineDepth <Number>: The pipelineDepth parameter of importSalesForceToSql (default: 2)
+def benchmarkImport(serverUrl, instanceName, chunkRows, batchSize, pipelineDepth = 2):
+    reportSpec = reportSpecDict[instanceName]
+    client = SalesforceClient.fromConnection(types.SimpleNamespace(headers = {}, session_id = "benchmark"), "localhost", instanceName)
+    client.baseUrl = serverUrl
+    columnTypeOrderedDict = collections.OrderedDict([[convertSQLNames(i[0]), i[2]] for i in reportSpec["columnSpecList"]] +
+                                                    [["PY_DATA_SOURCE", sqlalchemy.types.VARCHAR(100)], ["PY_INSTANCE", sqlalchemy.types.VARCHAR(100)],
+                                                     ["PY_EXTRACTED_DATE_VALUE", sqlalchemy.types.DATE]])
+    dateMaskList = [[convertSQLNames(i[0]), "%m/%d/%Y"] for i in reportSpec["columnSpecList"] if i[1] == "date"]
+    metrics = BenchmarkMetrics(reportSpec["tableName"], reportSpec["reportIdentifier"], instanceName)
+    importSalesForceToSql(reportSpec["tableName"], reportSpec["reportIdentifier"], "localhost", columnTypeOrderedDict, dateMaskList, instanceName,
+                          ifExists = 'replace', chunkRows = chunkRows, loader = 'sqlalchemy', batchSize = batchSize, client = client,
+                          pipelineDepth = pipelineDepth, metrics = metrics)
+    return metrics.finish()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to append the loaded instance tables into a fresh history table with appendTableList, and return its metrics.
+#         Each history column is mapped from the instance column of the same name, or null when the instance does not have it.
+#    instanceNameList <List>: The instances that were loaded
+def benchmarkAppend(instanceNameList):
+    historyColumnList = []
+    for i in reportSpecDict.values():
+        for j in [convertSQLNames(k[0]) for k in i["columnSpecList"]] + ["PY_DATA_SOURCE", "PY_INSTANCE", "PY_EXTRACTED_DATE_VALUE"]:
+            historyColumnList = ifEquals(j in historyColumnList, True, historyColumnList, historyColumnList + [j])
+    table = sqlalchemy.schema.Table("OPPORTUNITY_HISTORY", sqlalchemy.schema.MetaData(),
+                                    *[sqlalchemy.schema.Column(i, sqlalchemy.types.VARCHAR(1000)) for i in historyColumnList])
+    table.drop(jetdataload.core.engineSqlAlchemy, checkfirst = True)
+    table.create(jetdataload.core.engineSqlAlchemy)
+
+    metrics = BenchmarkMetrics("OPPORTUNITY_HISTORY", "appendTableList")
+    for i in instanceNameList:
+        sourceColumnList = [convertSQLNames(j[0]) for j in reportSpecDict[i]["columnSpecList"]] + ["PY_DATA_SOURCE", "PY_INSTANCE", "PY_EXTRACTED_DATE_VALUE"]
+        with metrics.stage("postSql"):
+            appendTableList("OPPORTUNITY_HISTORY", reportSpecDict[i]["tableName"], [[j, ifEquals(j in sourceColumnList, True, j, "")] for j in historyColumnList])
+    with oracleConnection() as connection:
+        metrics.addCount("rows", connection.cursor().execute("select count(*) from OPPORTUNITY_HISTORY").fetchone()[0])
+    return metrics.finish()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn benchmark metrics into rows of [run, rows, stage, seconds, rows per second, peak MB] (a "total" row per run).
+#         The pipeline queues are added as "queue <name>" rows, with the seconds the stage after the queue waited for work (a high wait means the stage before it is the bottleneck).
+#    metrics <BenchmarkMetrics>: The metrics of the run
+#    runName <String>: The name of the run (eg "BlackBerry 100000")
+def benchmarkRows(metrics, runName):
+    recordDict = metrics.record()
+    rowList = []
+    for i, j in recordDict["stageSeconds"].items():
+        if(j > 0 or i in metrics.stagePeakBytes):
+            rowList += [[runName, recordDict["rows"], i, round(j, 3), recordDict["stageRowsPerSecond"].get(i, 0.0),
+                         round(metrics.stagePeakBytes.get(i, 0) / 1048576.0, 1)]]
+    for i, j in recordDict.get("queues", {}).items():
+        rowList += [[runName, recordDict["rows"], "queue " + i, round(j["getWaitSeconds"], 3), j["meanDepth"], ""]]
+    rowList += [[runName, recordDict["rows"], "total", round(recordDict["seconds"], 3), recordDict["rowsPerSecond"],
+                 round(max(list(metrics.stagePeakBytes.values()) + [0]) / 1048576.0, 1)]]
+    return rowList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to run the benchmark for each row count: generate the reports, load each instance, then append them into history
+#    rowCountList <List>: The report sizes to run (eg [10000, 1000000])
+#    instanceNameList <List>: The instances to generate and load (default: all of reportSpecDict)
+#    chunkRows <Number>: The chunkRows parameter of importSalesForceToSql (default: 5000)
+#    batchSize <Number>: The batchSize parameter of importSalesForceToSql (default: 5000)
+#    workDirectory <String>: Where the reports and the sqlite database are written (default: None for a temporary directory that is removed afterwards)
+#    pipelineDepth <Number>: The pipelineDepth parameter of importSalesForceToSql, 0 to run the stages one after another (default: 2)
+#Returns: The rows of benchmarkRows for every run
+def runBenchmark(rowCountList, instanceNameList = None, chunkRows = 5000, batchSize = 5000, workDirectory = None, pipelineDepth = 2):
+    instanceNameList = ifEquals(instanceNameList, None, list(reportSpecDict.keys()), instanceNameList)
+    removeDirectory = workDirectory is None
+    workDirectory = ifEquals(workDirectory, None, tempfile.mkdtemp(prefix = "jetDataloadBenchmark"), workDirectory)
+    resultList = []
+    try:
+        for rowCount in rowCountList:
+            reportFileDict = {}
+            for i in instanceNameList:
+                reportFileDict[reportSpecDict[i]["reportIdentifier"]] = os.path.join(workDirectory, reportSpecDict[i]["reportIdentifier"] + ".csv")
+                generateReport(reportFileDict[reportSpecDict[i]["reportIdentifier"]], i, rowCount)
+            databaseFile = os.path.join(workDirectory, "benchmark" + str(rowCount) + ".db")
+            if(os.path.exists(databaseFile)):
+                os.remove(databaseFile)
+            useSqliteSink(databaseFile)
+            server = startReportServer(reportFileDict)
+            tracemalloc.start()
+            try:
+                for i in instanceNameList:
+                    resultList += benchmarkRows(benchmarkImport("http://127.0.0.1:" + str(server.server_port) + "/", i, chunkRows, batchSize, pipelineDepth),
+                                                "importSalesForceToSql " + i + " " + str(rowCount))
+                resultList += benchmarkRows(benchmarkAppend(instanceNameList), "appendTableList " + str(rowCount))
+            finally:
+                tracemalloc.stop()
+                server.shutdown()
+                server.server_close()
+                jetdataload.core.engineSqlAlchemy.dispose()
+    finally:
+        if(removeDirectory):
+            shutil.rmtree(workDirectory, ignore_errors = True)
+    return resultList
+
+nameList = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Cyberdyne", "Soylent", "Tyrell", "Wonka", "Vandelay"]
+valueListDict = {"text": ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot"],
+                 "stage": ["Prospecting", "Qualification", "Needs Analysis", "Proposal/Price Quote", "Negotiation/Review", "Closed Won", "Closed Lost"],
+                 "region": ["North America", "EMEA", "APAC", "LATAM"],
+                 "country": ["United States", "Canada", "United Kingdom", "Germany", "France", "Japan", "Australia", "Brazil"],
+                 "product": ["BES12", "BBM Enterprise", "Good Work", "Good Access", "AtHoc Alert", "WatchDox", "SecuSUITE"],
+                 "person": ["Jane Smith", "John Doe", "Alex Chen", "Priya Patel", "Sam O'Neil", "Maria Garcia"],
+                 "forecast": ["Pipeline", "Best Case", "Commit", "Closed", "Omitted"],
+                 "source": ["Web", "Partner", "Trade Show", "Referral", "Cold Call", ""],
+                 "type": ["New Business", "Existing Business", "Renewal"]}
+
+reportSpecDict = collections.OrderedDict([
+    ["BlackBerry", {"tableName": "BB_OPPORTUNITIES", "reportIdentifier": "00OF0000006hM3t", "reportName": "BlackBerry Opportunities", "columnSpecList": [
+        ["Opportunity ID", "id", sqlalchemy.types.VARCHAR(100)],
+        ["Stage", "stage", sqlalchemy.types.VARCHAR(100)],
+        ["Product Family", "product", sqlalchemy.types.VARCHAR(100)],
+        ["BlackBerry Region", "region", sqlalchemy.types.VARCHAR(100)],
+        ["BlackBerry Country", "country", sqlalchemy.types.VARCHAR(100)],
+        ["Account Name", "name", sqlalchemy.types.VARCHAR(200)],
+        ["Product Name", "product", sqlalchemy.types.VARCHAR(200)],
+        ["Amount (converted) Currency", "currency", sqlalchemy.types.VARCHAR(100)],
+        ["Amount (converted)", "amount", sqlalchemy.types.VARCHAR(100)],
+        ["Net to BlackBerry Revenue (converted) Currency", "currency", sqlalchemy.types.VARCHAR(100)],
+        ["Net to BlackBerry Revenue (converted)", "amount", sqlalchemy.types.VARCHAR(100)],
+        ["Opportunity Name", "name", sqlalchemy.types.VARCHAR(200)],
+        ["Opportunity Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Close Date", "date", sqlalchemy.types.VARCHAR(100)],
+        ["Last Stage Change Date", "date", sqlalchemy.types.VARCHAR(100)],
+        ["Probability (%)", "probability", sqlalchemy.types.VARCHAR(100)],
+        ["Age", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Stage Duration", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Created Date", "date", sqlalchemy.types.VARCHAR(100)],
+        ["Last Modified Date", "date", sqlalchemy.types.VARCHAR(100)],
+        ["Forecast Category", "forecast", sqlalchemy.types.VARCHAR(100)],
+        ["Account Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Product Code", "text", sqlalchemy.types.VARCHAR(100)],
+        ["Account ID", "accountId", sqlalchemy.types.VARCHAR(100)],
+        ["Primary Campaign Source", "source", sqlalchemy.types.VARCHAR(100)],
+        ["Lead Source", "source", sqlalchemy.types.VARCHAR(100)],
+        ["Billing Country", "country", sqlalchemy.types.VARCHAR(100)],
+        ["BlackBerry Sales Sub Group", "text", sqlalchemy.types.VARCHAR(100)]]}],
+    ["Good", {"tableName": "GOOD_OPPORTUNITIES", "reportIdentifier": "00O16000007gKx8", "reportName": "Good Opportunities", "columnSpecList": [
+        ["Opportunity ID", "id", sqlalchemy.types.VARCHAR(100)],
+        ["Stage", "stage", sqlalchemy.types.VARCHAR(100)],
+        ["Product Family", "product", sqlalchemy.types.VARCHAR(100)],
+        ["Product Name", "product", sqlalchemy.types.VARCHAR(100)],
+        ["Opportunity Name", "name", sqlalchemy.types.VARCHAR(200)],
+        ["Opportunity Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Created By", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Account Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Primary Campaign Source", "source", sqlalchemy.types.VARCHAR(100)],
+        ["Account Name", "name", sqlalchemy.types.VARCHAR(300)],
+        ["Type", "type", sqlalchemy.types.VARCHAR(100)],
+        ["Logo Type", "type", sqlalchemy.types.VARCHAR(100)],
+        ["Amount (converted) Currency", "currency", sqlalchemy.types.VARCHAR(100)],
+        ["Amount (converted)", "amount", sqlalchemy.types.VARCHAR(100)],
+        ["Total Sales Price (converted) Currency", "currency", sqlalchemy.types.VARCHAR(100)],
+        ["Total Sales Price (converted)", "amount", sqlalchemy.types.VARCHAR(100)],
+        ["Age", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Stage Duration", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Last Modified Date", "date", sqlalchemy.types.DATE],
+        ["Created Date", "date", sqlalchemy.types.DATE],
+        ["Close Date", "date", sqlalchemy.types.DATE],
+        ["Last Stage Change Date", "date", sqlalchemy.types.DATE],
+        ["Lead Source", "source", sqlalchemy.types.VARCHAR(100)],
+        ["Forecast Category", "forecast", sqlalchemy.types.VARCHAR(100)],
+        ["Probability (%)", "probability", sqlalchemy.types.VARCHAR(100)],
+        ["Territory Name", "region", sqlalchemy.types.VARCHAR(100)],
+        ["Account ID", "accountId", sqlalchemy.types.VARCHAR(100)],
+        ["Product Code", "text", sqlalchemy.types.VARCHAR(100)],
+        ["Billing Country", "country", sqlalchemy.types.VARCHAR(100)]]}],
+    ["AtHoc", {"tableName": "ATHOC_OPPORTUNITIES", "reportIdentifier": "00O37000001YKC1", "reportName": "AtHoc Opportunities", "columnSpecList": [
+        ["Opportunity ID", "id", sqlalchemy.types.VARCHAR(100)],
+        ["AtHoc Stage", "stage", sqlalchemy.types.VARCHAR(100)],
+        ["Account Name", "name", sqlalchemy.types.VARCHAR(100)],
+        ["Product", "product", sqlalchemy.types.VARCHAR(100)],
+        ["Opportunity Name", "name", sqlalchemy.types.VARCHAR(200)],
+        ["Amount (converted) Currency", "currency", sqlalchemy.types.VARCHAR(100)],
+        ["Amount (converted)", "amount", sqlalchemy.types.VARCHAR(100)],
+        ["Opportunity Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Close Date", "date", sqlalchemy.types.DATE],
+        ["Age", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Stage Duration", "integer", sqlalchemy.types.VARCHAR(100)],
+        ["Created Date", "date", sqlalchemy.types.DATE],
+        ["Budget Likelihood", "probability", sqlalchemy.types.VARCHAR(100)],
+        ["Last Modified Date", "date", sqlalchemy.types.DATE],
+        ["Lead Source", "source", sqlalchemy.types.VARCHAR(100)],
+        ["Sector", "text", sqlalchemy.types.VARCHAR(100)],
+        ["Account Owner", "person", sqlalchemy.types.VARCHAR(100)],
+        ["Forecast Category", "forecast", sqlalchemy.types.VARCHAR(100)],
+        ["Account ID", "accountId", sqlalchemy.types.VARCHAR(100)],
+        ["Billing Country", "country", sqlalchemy.types.VARCHAR(100)]]}]
+])
+
+if __name__ == "__main__":
+    argumentParser = argparse.ArgumentParser(description = "Benchmark the salesforce to sql loader against generated reports, a local report server and sqlite")
+    argumentParser.add_argument("--rows", type = int, nargs = "+", default = [10000], help = "The report sizes to run (eg 10000 1000000 5000000)")
+    argumentParser.add_argument("--instances", nargs = "+", default = list(reportSpecDict.keys()), choices = list(reportSpecDict.keys()))
+    argumentParser.add_argument("--chunk-rows", type = int, default = 5000)
+    argumentParser.add_argument("--batch-size", type = int, default = 5000)
+    argumentParser.add_argument("--pipeline-depth", type = int, default = 2, help = "0 runs the import stages one after another")
+    argumentParser.add_argument("--work-directory", default = None, help = "Keep the generated reports and sqlite databases here")
+    argumentParser.add_argument("--json", default = None, help = "Also write the results to this file as JSON")
+    arguments = argumentParser.parse_args()
+
+    resultList = runBenchmark(arguments.rows, arguments.instances, arguments.chunk_rows, arguments.batch_size, arguments.work_directory, arguments.pipeline_depth)
+    headerList = ["run", "rows", "stage", "seconds", "rows/s (mean depth for queues)", "peak MB"]
+    print(pd.DataFrame(resultList, columns = headerList).to_string(index = False))
+    if(arguments.json is not None):
+        with open(arguments.json, "w") as jsonFile:
+            json.dump([dict(zip(headerList, i)) for i in resultList], jsonFile, indent = 2)
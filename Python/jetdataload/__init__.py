@@ -0,0 +1,8 @@
+# coding: utf-8
+
+# Jet Dataload
+# Author: Steven Henkel
+# Purpose: Pull data out of salesforce into a consolidated sql table. The helpers are in jetdataload.core, the reports loaded in jetdataload.jobs,
+#          and python -m jetdataload runs the jobs by name (see jetdataload.__main__).
+
+from jetdataload.core import *
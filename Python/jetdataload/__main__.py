@@ -0,0 +1,55 @@
+# coding: utf-8
+
+# Jet Dataload Command Line
+# Author: Steven Henkel
+# Purpose: To run the jobs of jetdataload.jobs by name, without the notebook. Run from the folder with the login and user credential files.
+# Usage: python -m jetdataload list
+#        python -m jetdataload run OPPORTUNITIES IS_MARKETING --max-workers 4
+#        python -m jetdataload run BB_OPPORTUNITIES --replay
+#        python -m jetdataload serve
+
+import argparse
+import sys
+
+from jetdataload.jobs import *
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to run the command line, and return the exit code (1 when oracle rejected rows; a job that fails raises its error)
+#    argumentList <List>: The arguments (default: None for sys.argv)
+def main(argumentList = None):
+    argumentParser = argparse.ArgumentParser(prog = "python -m jetdataload", description = "Load salesforce reports into oracle by table or schedule entry")
+    subParsers = argumentParser.add_subparsers(dest = "command", required = True)
+    subParsers.add_parser("list", help = "List the tables and schedule entries that can be run")
+    runParser = subParsers.add_parser("run", help = "Load the tables or schedule entries named, once")
+    runParser.add_argument("names", nargs = "+", help = "Tables (eg BB_OPPORTUNITIES) or schedule entries (eg OPPORTUNITIES)")
+    runParser.add_argument("--replay", action = "store_true", help = "Load the cached exports again instead of exporting from salesforce")
+    runParser.add_argument("--max-workers", type = int, default = 4, help = "The number of tables to load at the same time")
+    serveParser = subParsers.add_parser("serve", help = "Keep refreshing the schedule entries, each on its own interval")
+    serveParser.add_argument("names", nargs = "*", help = "The schedule entries to run (default: all of them)")
+    serveParser.add_argument("--max-workers", type = int, default = 2, help = "The number of schedule entries that can run at the same time")
+    arguments = argumentParser.parse_args(argumentList)
+
+    if(arguments.command == "list"):
+        for i, j in jobFunctionDict.items():
+            print(i)
+        for i in scheduleList:
+            print(i[0] + " (every " + str(i[2]) + " minutes): " + ", ".join(i[1]))
+        return 0
+
+    jobTableNames(ifEquals(arguments.names, [], None, arguments.names))
+    connectOracle()
+    if(arguments.command == "run"):
+        resultList = runJobs(arguments.names, ifEquals(arguments.replay, True, replayOptionDict, refreshOptionDict), arguments.max_workers)
+        for i in resultList:
+            print(i[0] + " " + i[1] + ": " + str(len(i[2])) + " rejected rows")
+        return ifEquals(any([i[2] != [] for i in resultList]), True, 1, 0)
+
+    jobScheduler(ifEquals(arguments.names, [], None, arguments.names), maxWorkers = arguments.max_workers).run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4021 @@
+# coding: utf-8
+
+# Jet Dataload
+# Author: Steven Henkel
+# Purpose: The helper functions of the Jet Dataload notebook, to pull data out of salesforce into a consolidated sql table.
+#          Importing this module has no side effects: nothing is read, logged into or connected to, and pandas, numpy, sqlalchemy, cx_Oracle,
+#          simple_salesforce, requests and pyarrow are only imported when a function first uses them (see LazyModule).
+# Change Notes:
+#     2026-10-18: The 2016 importSalesForceToSql (rebuildFlag, printLog, columnTypes, batch) was left out of the package. The notebook defined it
+#                 and then replaced it with the current importSalesForceToSql of the same name, and it called webBaseTable and insertLoop,
+#                 which no longer exist.
+
+import datetime
+import base64
+import collections
+import codecs
+import csv
+import concurrent.futures
+import contextlib
+import urllib.parse
+import threading
+import decimal
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import json
+import multiprocessing.resource_tracker
+import multiprocessing.shared_memory
+import os
+import queue
+import re
+import time
+import warnings
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to stand in for a module until one of its attributes is first used, and only then import it (with the submodules given).
+#         The heavy libraries are only loaded by the code paths that need them, eg listing the jobs never imports pandas or cx_Oracle.
+#    moduleName <String>: The module (eg pandas)
+#    submoduleList <List>: Submodules to import with it, that the module does not import itself (eg pyarrow.parquet) (default: [])
+#Tests:
+#    LazyModule("pandas").DataFrame = pandas.DataFrame
+class LazyModule:
+    def __init__(self, moduleName, submoduleList = []):
+        self.moduleName = moduleName
+        self.submoduleList = list(submoduleList)
+        self.module = None
+
+    def __getattr__(self, attributeName):
+        if(self.module is None):
+            module = importlib.import_module(self.moduleName)
+            for i in self.submoduleList:
+                importlib.import_module(i)
+            self.module = module
+        return getattr(self.module, attributeName)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return true if a module can be imported (eg an optional library is installed), without importing it
+#    moduleName <String>: The module
+def moduleAvailable(moduleName):
+    return importlib.util.find_spec(moduleName) is not None
+
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+simple_salesforce = LazyModule("simple_salesforce")
+requests = LazyModule("requests")
+cx_Oracle = LazyModule("cx_Oracle")
+sqlalchemy = LazyModule("sqlalchemy", ["sqlalchemy.dialects.oracle", "sqlalchemy.pool"])
+
+# pyarrow is only needed to write and read the snapshot archive, and to send parsed shards back from the parse workers
+pyarrow = LazyModule("pyarrow", ["pyarrow.parquet", "pyarrow.ipc"])
+
+# cryptography is only needed to cache the salesforce sessions (see storeSalesforceSession)
+cryptography = LazyModule("cryptography", ["cryptography.fernet"])
+
+# The oracle pool and the sqlAlchemy engine are set by cxOracleConnection
+oraclePool = None
+engineSqlAlchemy = None
+
+#Date Created: 2016-05-06
+#Last Editted: 2016-05-06
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to import a text file and split it into a single list
+#    file <String>: The name of the file to insert
+#    delimiter <String>: The delimiter used to seperate elements in the list
+def txtToList(file, delimiter = "\n"):
+    if(file[-4:] != ".txt"):
+        fileName = file+".txt"
+    else:
+        fileName = file
+    try:
+        with open (fileName, "r") as userFile:
+            return userFile.read().split(delimiter)
+    except:
+        return "File does not exist!"
+
+#Date Created: 2015-11-04
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: The connection is opened in threaded mode so the concurrent imports can share it (V1 - V1.1)
+#     2026-10-18: Replaced the single connection and cursor with a cx_Oracle session pool. The sqlAlchemy engine checks its connections out of the same pool. (V1.1 - V2)
+#Purpose: The purpose of this function is to establish a db connection pool in the package. Use oracleConnection() to check a connection out of it.
+#    name <string>: The name of the schema
+#    password <string>: The pw for the schema.
+#    connection <string>: The connection string for the schema.
+#    poolSize <Number>: The maximum number of connections in the pool (default: 4)
+#    statementCacheSize <Number>: The number of statements each connection keeps parsed (default: 50)
+#    pingInterval <Number>: The number of idle seconds after which a connection is checked before it is handed out (default: 60)
+def cxOracleConnection(name, password, connection, poolSize = 4, statementCacheSize = 50, pingInterval = 60):
+    global oraclePool, engineSqlAlchemy
+    oraclePool = cx_Oracle.SessionPool(name, password, connection, min = 1, max = poolSize, increment = 1, threaded = True,
+                                       getmode = cx_Oracle.SPOOL_ATTRVAL_WAIT, stmtcachesize = statementCacheSize)
+    oraclePool.ping_interval = pingInterval
+    # Closing a pooled connection releases it back to the pool, so sqlAlchemy does no pooling of its own
+    engineSqlAlchemy = sqlalchemy.create_engine("oracle+cx_oracle://", creator = oraclePool.acquire, poolclass = sqlalchemy.pool.NullPool)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to check a connection out of the oracle pool for a with block, and give it back afterwards.
+#         If the block fails, the work is rolled back. A connection that cannot even roll back (eg it was dropped) is removed from the pool instead of being reused.
+#Tests:
+#    with oracleConnection() as connection:
+#        connection.cursor().execute("select 1 from dual")
+@contextlib.contextmanager
+def oracleConnection():
+    connection = oraclePool.acquire()
+    try:
+        yield connection
+    except:
+        try:
+            connection.rollback()
+        except cx_Oracle.DatabaseError:
+            oraclePool.drop(connection)
+            raise
+        oraclePool.release(connection)
+        raise
+    oraclePool.release(connection)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return true if an oracle error means the connection was lost (so the work can be retried on a new connection)
+#    error <cx_Oracle.DatabaseError>: The error raised
+def isConnectionLost(error):
+    try:
+        return error.args[0].code in [28, 1012, 1033, 1034, 1089, 3113, 3114, 3135, 12153, 12537, 12541, 12571]
+    except:
+        return False
+
+# The characters convertSQLNames replaces with an underscore (the apostrophe is removed), and the runs of underscores it collapses into one
+sqlNameTable = str.maketrans(dict([[i, "_"] for i in " <>:;,?\\()/[]#.$%-!&"] + [["'", None]]))
+underscorePattern = re.compile("_{2,}")
+
+#Date Created: 2015-09-15
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: The characters are replaced in one translate (sqlNameTable) and the underscores collapsed with one regex, instead of 30 replace passes.
+#                 A leading digit is checked with isdecimal instead of isNumber (the names are the same) (V1 - V2)
+#Purpose: The purpose of this function is to convert a string into a typical SQL column name
+#    columnEntry <string>: the name to convert to a sql name. 
+#Tests:
+#    convertSQLNames("Amount (converted)") = 'AMOUNT_CONVERTED_'
+#    convertSQLNames("1st Owner's Region") = 'C_1ST_OWNERS_REGION'
+def convertSQLNames (columnEntry):
+    columnEntry = underscorePattern.sub("_", columnEntry.translate(sqlNameTable))
+    if(columnEntry[0].isdecimal()):
+        columnEntry = "C_" + columnEntry
+    columnEntry=columnEntry[:30]
+    return columnEntry.upper()
+
+#Date Created: 2016-03-16
+#Last Editted: 2016-03-16
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to clean code with if = type if statements by turning it into a function
+#     ifValue <value>: If this value
+#     equalsValue <value>: Equals this value
+#     thenValue <value>: then this value
+#     elseValue <value>: else this value
+#     equals <boolean>: If set to false, the function is equivalent to ifNotEquals. (default = True)
+def ifEquals (ifValue, equalsValue, thenValue, elseValue, equals = True):
+    if (equals and ifValue == equalsValue or not equals and ifValue != equalsValue):
+        return thenValue
+    else:
+        return elseValue
+
+#Date Created: 2016-03-11
+#Last Editted: 2016-04-05
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2016-04-05: Made the code simpler with list comprehension as well as allowing the value to be returned if the function crashes (V1 - V2)
+#Purpose: The purpose of this function is to take a list, and return a list with a function applied to it's elements
+#    baseList <String>: The original list
+#    function <function>: The function to apply to the elements
+#    skipFlag: If False, return the parameter to the function as a value without applying the function (default: False)
+def listFunction (baseList, function, tableType = False, parameters = [], tableTypeIndex = -1):
+    if(tableType):
+        return [[ifEquals(k,tableTypeIndex,tryFunction(function,listify(j) + parameters,j),j) for k,j in enumerate(i)] for i in baseList]
+    else:
+        return [tryFunction(function,listify(i) + parameters,i) for i in baseList]
+
+#Date Created: 2016-04-05
+#Last Editted: 2016-04-05
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is is to try to apply a function with parameters, and if it fails, return a value
+#    function <function>: The function to apply
+#    parameterList <string or list of strings>: The parameters for a function
+#    exceptReturnValue: The value to return if the function fails to execute
+def tryFunction (function, parameterList, exceptReturnValue):
+    parameters = listify(parameterList)
+    try:
+        return function(*parameters)
+    except:
+        return exceptReturnValue
+    
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The derived keys are kept in sessionKeyCache, so the key derivation runs once per process for each salt instead of on every login (V1 - V1.1)
+#Purpose: The purpose of this function is to return the cipher a cached salesforce session is encrypted with.
+#         The key is derived from the password and security token, so the session can only be read by someone who could log in anyway.
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+#    salt <Bytes>: The random salt stored with the session
+def salesforceSessionCipher(password, token, salt):
+    cacheKey = hashlib.sha256((str(password) + "\n" + str(token)).encode("utf-8") + salt).hexdigest()
+    with sessionKeyCacheLock:
+        key = sessionKeyCache.get(cacheKey)
+    if(key is None):
+        key = hashlib.pbkdf2_hmac("sha256", (str(password) + str(token)).encode("utf-8"), salt, sessionKeyIterations)
+        with sessionKeyCacheLock:
+            sessionKeyCache[cacheKey] = key
+    return cryptography.fernet.Fernet(base64.urlsafe_b64encode(key))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the cached session of a salesforce user as [session id, instance] (eg na1.salesforce.com),
+#         or None if there is none, it has expired (or is about to, see sessionMarginSeconds) or it can't be decrypted with the credentials given.
+#    user <String>: The salesforce username
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+def cachedSalesforceSession(user, password, token):
+    if(not moduleAvailable("cryptography")):
+        return None
+    with sessionCacheLock:
+        try:
+            with open(sessionCacheFile) as cacheFile:
+                sessionEntry = json.load(cacheFile).get(hashlib.sha256(str(user).encode("utf-8")).hexdigest())
+        except (IOError, ValueError):
+            return None
+    if(sessionEntry is None):
+        return None
+    try:
+        sessionDict = json.loads(salesforceSessionCipher(password, token, bytes.fromhex(sessionEntry["salt"])).decrypt(sessionEntry["session"].encode("ascii")))
+    except cryptography.fernet.InvalidToken:
+        return None
+    if(sessionDict["expires"] - sessionMarginSeconds <= time.time()):
+        return None
+    return [sessionDict["sessionId"], sessionDict["instance"]]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: Every session this process stores uses the same salt (sessionKeySalt), so its key is only derived once (V1 - V1.1)
+#Purpose: The purpose of this function is to cache the session of a salesforce user, encrypted (see salesforceSessionCipher), with when it expires (sessionSeconds from now).
+#         The cache file is only readable by its owner, and is keyed by a hash of the username. Nothing is cached if cryptography is not installed.
+#    user <String>: The salesforce username
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+#    sessionId <String>: The session id
+#    instance <String>: The host the session belongs to (eg na1.salesforce.com)
+def storeSalesforceSession(user, password, token, sessionId, instance):
+    if(not moduleAvailable("cryptography")):
+        return
+    salt = sessionKeySalt
+    sessionString = json.dumps({"sessionId": sessionId, "instance": instance, "expires": time.time() + sessionSeconds})
+    sessionEntry = {"salt": salt.hex(), "session": salesforceSessionCipher(password, token, salt).encrypt(sessionString.encode("utf-8")).decode("ascii")}
+    with sessionCacheLock:
+        try:
+            with open(sessionCacheFile) as cacheFile:
+                sessionDict = json.load(cacheFile)
+        except (IOError, ValueError):
+            sessionDict = {}
+        sessionDict[hashlib.sha256(str(user).encode("utf-8")).hexdigest()] = sessionEntry
+        with open(os.open(sessionCacheFile + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as cacheFile:
+            json.dump(sessionDict, cacheFile, indent = 2, sort_keys = True)
+        os.replace(sessionCacheFile + ".tmp", sessionCacheFile)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return a simple_salesforce session for a user, reusing the cached session until it expires and only logging in
+#         (and caching the new session) when there is none.
+#    user <String>: The salesforce username
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+#    refresh <Boolean>: If true, always log in (eg salesforce said the cached session is no longer valid) (default: False)
+def salesforceLogin(user, password, token, refresh = False):
+    sessionList = None
+    if(not refresh):
+        sessionList = cachedSalesforceSession(user, password, token)
+    if(sessionList is not None):
+        return simple_salesforce.Salesforce(session_id = sessionList[0], instance = sessionList[1])
+    connection = simple_salesforce.Salesforce(user, password, token)
+    storeSalesforceSession(user, password, token, connection.session_id, connection.sf_instance)
+    return connection
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return true if salesforce refused a request because the session is no longer valid:
+#         a 401 (eg INVALID_SESSION_ID) from the apis, or the report export being redirected to the login page.
+#    response <Response>: The requests response
+def salesforceSessionExpired(response):
+    if(response.status_code == 401):
+        return True
+    return response.history != [] and ("ec=302" in response.url or urllib.parse.urlparse(response.url).netloc.startswith("login."))
+
+sessionCacheFile = "salesforceSessions.json"
+sessionSeconds = 7200
+sessionMarginSeconds = 300
+sessionKeyIterations = 200000
+sessionCacheLock = threading.Lock()
+# The keys derived by salesforceSessionCipher, by a hash of the credentials and salt, and the random salt the sessions stored by this process are encrypted with
+sessionKeyCache = {}
+sessionKeyCacheLock = threading.Lock()
+sessionKeySalt = os.urandom(16)
+salesforceCredentialList = [None, None, None]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the share of the daily api requests an org has used, from a Sforce-Limit-Info header (eg api-usage=18/5000), or None
+#    limitInfo <String>: The header (default: None)
+#Tests:
+#    apiUsageFraction("api-usage=25/100;per-app-api-usage=17/250(appName=sample)") = 0.25
+#    apiUsageFraction(None) = None
+def apiUsageFraction(limitInfo = None):
+    usageMatch = re.search(r"(?:^|[^-])api-usage=(\d+)/(\d+)", ifEquals(limitInfo, None, "", limitInfo))
+    if(usageMatch is None or int(usageMatch.group(2)) == 0):
+        return None
+    return int(usageMatch.group(1)) / int(usageMatch.group(2))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return true if salesforce refused a request because the org is over a limit (too many requests at once,
+#         REQUEST_LIMIT_EXCEEDED or the server is busy), so it should be retried later instead of failing
+#    status <Number>: The http status code
+#    content <String>: The response body
+def salesforceThrottled(status, content):
+    return status in [429, 503] or (status == 403 and "REQUEST_LIMIT_EXCEEDED" in str(content))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: A streamed response keeps its slot until it is closed (see call holdSlot and holdResponse), so a long export counts against the limit (V1 - V1.1)
+#Purpose: The purpose of this class is to limit the number of requests sent to one salesforce org at the same time, adjusting the limit as the org responds
+#         (additive increase, multiplicative decrease). Each response that comes back in good time raises the limit by 1/limit (about 1 per round of requests),
+#         up to maxConcurrency. The limit is halved (down to 1) when the org throttles a request, when the Sforce-Limit-Info header shows the daily api usage
+#         above governorUsageHighWater, or when a request takes more than governorLatencyFactor times the average of its kind (eg export, so the quick bulk polls
+#         don't make every export look slow); at most once per average request time, so one slow spell does not halve it several times.
+#         Requests over the limit wait for a slot, and throttled requests are retried after a backoff. A streamed response (eg a report export) keeps its slot
+#         until it has been read and closed, since salesforce is still sending it.
+#         The orgs are shared with other integrations, so a fixed number of workers is either too timid or gets the loads throttled.
+#    maxConcurrency <Number>: The most requests at the same time (default: governorMaxConcurrency)
+#    startConcurrency <Number>: The limit to start at (default: governorStartConcurrency)
+#Tests:
+#    governor = RequestGovernor(8, 2)
+#    governor.call(lambda: [requests.get(url), False, None]) = the response
+class RequestGovernor:
+    def __init__(self, maxConcurrency = None, startConcurrency = None):
+        self.maxConcurrency = ifEquals(maxConcurrency, None, governorMaxConcurrency, maxConcurrency)
+        self.concurrency = float(min(ifEquals(startConcurrency, None, governorStartConcurrency, startConcurrency), self.maxConcurrency))
+        self.inFlight = 0
+        self.latencyDict = {}
+        self.lastDecrease = 0.0
+        self.apiUsage = None
+        self.requestCount = 0
+        self.throttleCount = 0
+        self.condition = threading.Condition()
+
+    #Purpose: Wait for a slot under the current limit and take it
+    def acquire(self):
+        with self.condition:
+            while(self.inFlight >= int(self.concurrency)):
+                self.condition.wait()
+            self.inFlight += 1
+
+    #Purpose: Give a slot back and adjust the limit by how the request went
+    #    latencySeconds <Number>: How long the request took (default: None when it failed, which leaves the limit as it is)
+    #    throttled <Boolean>: True if the org throttled the request (default: False)
+    #    apiUsage <Number>: The share of the daily api requests used, from the response (see apiUsageFraction) (default: None)
+    #    latencyKey <String>: The kind of request, that its time is averaged with (default: "request")
+    #    keepSlot <Boolean>: If true, only adjust the limit and keep the slot, for releaseSlot to give back (default: False)
+    def release(self, latencySeconds = None, throttled = False, apiUsage = None, latencyKey = "request", keepSlot = False):
+        with self.condition:
+            if(not keepSlot):
+                self.inFlight -= 1
+            self.requestCount += 1
+            self.apiUsage = ifEquals(apiUsage, None, self.apiUsage, apiUsage)
+            if(latencySeconds is not None):
+                slow = latencyKey in self.latencyDict and latencySeconds > governorLatencyFactor * self.latencyDict[latencyKey]
+                averageSeconds = self.latencyDict.get(latencyKey, latencySeconds)
+                if(throttled or slow or (apiUsage is not None and apiUsage >= governorUsageHighWater)):
+                    self.throttleCount += ifEquals(throttled, True, 1, 0)
+                    if(time.monotonic() - self.lastDecrease >= averageSeconds):
+                        self.concurrency = max(self.concurrency / 2, 1.0)
+                        self.lastDecrease = time.monotonic()
+                else:
+                    self.concurrency = min(self.concurrency + 1 / self.concurrency, float(self.maxConcurrency))
+                # The average only learns from requests that were not throttled (a throttled response comes back quickly)
+                if(not throttled):
+                    self.latencyDict[latencyKey] = averageSeconds + governorLatencySmoothing * (latencySeconds - averageSeconds)
+            self.condition.notify_all()
+
+    #Purpose: Give back a slot that was kept with keepSlot (see release)
+    def releaseSlot(self):
+        with self.condition:
+            self.inFlight -= 1
+            self.condition.notify_all()
+
+    #Purpose: Run a request in a slot and return its result, retrying it after a backoff (doubling each time) while the org throttles it.
+    #         The result of the last attempt is returned if it is still throttled after governorMaxRetries.
+    #    function <Function>: Sends the request and returns [result, throttled, api usage (or None)]
+    #    latencyKey <String>: The kind of request (see release) (default: "request")
+    #    holdSlot <Boolean>: If true, the slot of the result returned is kept (its time still adjusts the limit), and must be given back
+    #                        with releaseSlot, eg by holdResponse once a streamed response is closed (default: False)
+    def call(self, function, latencyKey = "request", holdSlot = False):
+        for attempt in range(governorMaxRetries + 1):
+            self.acquire()
+            startTime = time.monotonic()
+            resultList = None
+            try:
+                resultList = function()
+            finally:
+                if(resultList is None):
+                    self.release()
+                else:
+                    self.release(time.monotonic() - startTime, resultList[1], resultList[2], latencyKey,
+                                 holdSlot and (not resultList[1] or attempt == governorMaxRetries))
+            if(not resultList[1] or attempt == governorMaxRetries):
+                return resultList[0]
+            retryAfter = str(getattr(resultList[0], "headers", {}).get("Retry-After", ""))
+            if(retryAfter.isdigit()):
+                time.sleep(int(retryAfter))
+            else:
+                time.sleep(governorBackoffSeconds * 2 ** attempt)
+
+    #Purpose: Give the slot kept for a streamed response (see call holdSlot) back the first time the response is closed, and return the response
+    #    response <requests response>: The response
+    def holdResponse(self, response):
+        closeResponse = response.close
+        releaseLock = threading.Lock()
+        def closeAndRelease():
+            try:
+                closeResponse()
+            finally:
+                if(releaseLock.acquire(blocking = False)):
+                    self.releaseSlot()
+        response.close = closeAndRelease
+        return response
+
+    #Purpose: Return [limit, requests in flight, average seconds by kind of request, api usage, requests, throttled requests]
+    def status(self):
+        with self.condition:
+            return [int(self.concurrency), self.inFlight, dict(self.latencyDict), self.apiUsage, self.requestCount, self.throttleCount]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the RequestGovernor of a salesforce org, so every client (and every job) of the org shares one limit
+#    instance <String>: The string before salesforce.com that the instance refers to.
+def instanceGovernor(instance):
+    with governorLock:
+        if(instance not in governorDict):
+            governorDict[instance] = RequestGovernor()
+        return governorDict[instance]
+
+governorMaxConcurrency = 8
+governorStartConcurrency = 2
+governorUsageHighWater = 0.9
+governorLatencyFactor = 3.0
+governorLatencySmoothing = 0.2
+governorMaxRetries = 5
+governorBackoffSeconds = 2
+governorDict = {}
+governorLock = threading.Lock()
+
+#Date Created: 2016-03-07
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: Reuse the cached session until it expires instead of logging in every run, and keep the credentials to log in again with (V1 - V2)
+#Purpose: The purpose of this function is to allow a user to import data from Salesforce into Oracle.
+#         The session is kept in salesforceConnectionVariable and the credentials in salesforceCredentialList, for the functions not given a SalesforceClient.
+#    user <String>: The salesforce username
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+def salesforceConnection(user,password,token):
+    global salesforceConnectionVariable, salesforceCredentialList
+    salesforceConnectionVariable = salesforceLogin(user, password, token)
+    salesforceCredentialList = [user, password, token]
+    
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.3
+#Change Notes:
+#     2026-10-18: Reuse the cached session (see salesforceLogin), and log in again once when salesforce says the session is no longer valid (V1 - V1.1)
+#     2026-10-18: Send the requests through the RequestGovernor of the org, so they queue and back off instead of being throttled (V1.1 - V1.2)
+#     2026-10-18: Streamed responses hold their governor slot until they are closed, and a response that raises for its status is closed (V1.2 - V1.3)
+#Purpose: The purpose of this class is to hold the salesforce session for one instance, so several instances can be logged in (and pulled from) at the same time.
+#         salesforceConnection keeps one session in a global, so a second login replaces the first.
+#    user <String>: The salesforce username
+#    password <String>: The salesforce password
+#    token <String>: The salesforce security token
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    instanceName <String>: The name of the instance to add into the sql tables (eg BlackBerry) (default: "")
+#    baseUrl <String>: The url the reports are exported from (default: None for https://<instance>.salesforce.com/)
+class SalesforceClient:
+    def __init__(self, user, password, token, instance, instanceName = "", baseUrl = None):
+        self.user = user
+        self.password = password
+        self.token = token
+        self.instance = instance
+        self.instanceName = instanceName
+        self.baseUrl = ifEquals(baseUrl, None, "https://" + instance + ".salesforce.com/", baseUrl)
+        self.connection = None
+        self.loginLock = threading.Lock()
+        self.governor = instanceGovernor(instance)
+
+    #Purpose: Wrap an existing simple_salesforce session (eg salesforceConnectionVariable) without logging in again
+    #    connection <Salesforce>: The simple_salesforce session
+    #    instance <String>: The string before salesforce.com that the instance refers to.
+    #    instanceName <String>: The name of the instance (default: "")
+    #    credentialList <List>: [user, password, token] to log in again with when the session expires (default: [None, None, None] to raise instead)
+    @classmethod
+    def fromConnection(cls, connection, instance, instanceName = "", credentialList = [None, None, None]):
+        client = cls(credentialList[0], credentialList[1], credentialList[2], instance, instanceName)
+        client.connection = connection
+        return client
+
+    #Purpose: Log into salesforce, reusing the cached session unless refresh is true (see salesforceLogin). Returns the client so it can be created and logged in on one line.
+    #    refresh <Boolean>: If true, always log in (default: False)
+    def login(self, refresh = False):
+        self.connection = salesforceLogin(self.user, self.password, self.token, refresh)
+        return self
+
+    #Purpose: Return the simple_salesforce session, logging in first if there is none yet
+    def session(self):
+        with self.loginLock:
+            if(self.connection is None):
+                self.login()
+            return self.connection
+
+    #Purpose: Replace a session salesforce no longer accepts with a new login, and return the new session. When several threads find the same session
+    #         expired, only the first logs in. Raises the error given if the client has no credentials to log in with (see fromConnection).
+    #    connection <Salesforce>: The session that was refused
+    #    error <Exception>: The error to raise when the client can't log in again
+    def renewSession(self, connection, error):
+        if(self.user is None):
+            raise error
+        with self.loginLock:
+            if(self.connection is connection):
+                self.login(refresh = True)
+            return self.connection
+
+    #Purpose: Send a request with the session through the governor of the org (see RequestGovernor) and return the response,
+    #         logging in again and retrying once if the session is no longer valid (see salesforceSessionExpired).
+    #         The governor measures the time until the response headers arrive (a report export is run before its first byte is sent).
+    #         A streamed response keeps its governor slot until it is closed (responseBytes closes it once it has been read, or the reader stops).
+    #    method <String>: The http method (eg get)
+    #    url <String>: The url
+    #    latencyKey <String>: The kind of request, for the governor (eg export) (default: "request")
+    #    keywordDict <dictionary>: Any other requests arguments (eg stream, json)
+    def sessionRequest(self, method, url, latencyKey = "request", **keywordDict):
+        def governedRequest(connection):
+            def sendRequest():
+                response = requests.request(method, url, headers = connection.headers, cookies = {'sid' : connection.session_id}, **keywordDict)
+                content = ""
+                if(response.status_code == 403):
+                    content = response.text
+                throttled = salesforceThrottled(response.status_code, content)
+                if(throttled):
+                    response.close()
+                return [response, throttled, apiUsageFraction(response.headers.get("Sforce-Limit-Info"))]
+            if(keywordDict.get("stream", False)):
+                return self.governor.holdResponse(self.governor.call(sendRequest, latencyKey, holdSlot = True))
+            return self.governor.call(sendRequest, latencyKey)
+
+        connection = self.session()
+        response = governedRequest(connection)
+        if(salesforceSessionExpired(response)):
+            response.close()
+            response = governedRequest(self.renewSession(connection, requests.HTTPError("The salesforce session has expired (" + url + ")", response = response)))
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
+
+    #Purpose: Call the simple_salesforce session through the governor of the org and return the result, logging in again and retrying once if the session has expired
+    #    function <Function>: Called with the session (eg lambda connection: connection.query(soql))
+    #    latencyKey <String>: The kind of call, for the governor (eg query) (default: "call")
+    def sessionCall(self, function, latencyKey = "call"):
+        def governedCall(connection):
+            def sendCall():
+                try:
+                    result = function(connection)
+                except simple_salesforce.SalesforceError as e:
+                    if(salesforceThrottled(e.status, e.content)):
+                        return [e, True, None]
+                    raise
+                usage = getattr(connection, "api_usage", {}).get("api-usage")
+                usageFraction = None
+                if(usage is not None and usage.total > 0):
+                    usageFraction = usage.used / usage.total
+                return [result, False, usageFraction]
+            result = self.governor.call(sendCall, latencyKey)
+            if(isinstance(result, simple_salesforce.SalesforceError)):
+                raise result
+            return result
+
+        connection = self.session()
+        try:
+            return governedCall(connection)
+        except simple_salesforce.SalesforceExpiredSession as e:
+            return governedCall(self.renewSession(connection, e))
+
+    #Purpose: Return the csv export link for a report
+    #    reportIdentifier <String>: The identifier string for the report in the link to the salesforce page (eg 00OG0000006h6nl)
+    #    filterList <2D List>: Report filter overrides as [report column, operator, value] (eg [["LAST_UPDATE","ge","9/28/2016"]]) (default: [])
+    def reportUrl(self, reportIdentifier, filterList = []):
+        filterString = ""
+        for i, j in enumerate(filterList):
+            filterString += ("&pc" + str(i) + "=" + urllib.parse.quote(j[0]) + "&pn" + str(i) + "=" + urllib.parse.quote(j[1]) +
+                             "&pv" + str(i) + "=" + urllib.parse.quote(j[2]))
+        return self.baseUrl + reportIdentifier + "?export=1&enc=UTF-8&xf=csv" + filterString
+
+    #Purpose: Start streaming the csv export of a report and return the requests response
+    #    reportIdentifier <String>: The identifier string for the report
+    #    filterList <2D List>: Report filter overrides (see reportUrl) (default: [])
+    def exportReport(self, reportIdentifier, filterList = []):
+        return self.sessionRequest("get", self.reportUrl(reportIdentifier, filterList), "export", stream = True)
+
+    #Purpose: Stream a report export and yield the raw bytes a block at a time
+    #    reportIdentifier <String>: The identifier string for the report
+    #    byteChunkSize <Number>: The number of bytes to read from the socket at a time (default: 65536)
+    #    filterList <2D List>: Report filter overrides (see reportUrl) (default: [])
+    #    metrics <ImportMetrics>: If given, the socket reads are timed as the download stage and the bytes counted as bytesReceived (default: None)
+    def exportBytes(self, reportIdentifier, byteChunkSize = 65536, filterList = [], metrics = None):
+        with metricsStage(metrics, "download"):
+            response = self.exportReport(reportIdentifier, filterList)
+        return responseBytes(response, byteChunkSize, metrics)
+
+    #Purpose: Stream a report export and yield it as parsed chunks (see streamCsvRows)
+    #    reportIdentifier <String>: The identifier string for the report
+    #    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+    #    byteChunkSize <Number>: The number of bytes to read from the socket at a time (default: 65536)
+    #    filterList <2D List>: Report filter overrides (see reportUrl) (default: [])
+    #    metrics <ImportMetrics>: The metrics to record the download in (see exportBytes) (default: None)
+    def reportChunks(self, reportIdentifier, chunkRows = 5000, byteChunkSize = 65536, filterList = [], metrics = None):
+        return streamCsvRows(self.exportBytes(reportIdentifier, byteChunkSize, filterList, metrics), chunkRows)
+
+    #Purpose: Return the analytics api describe of a report (its columns, their labels and types, and its filters)
+    #    reportIdentifier <String>: The identifier string for the report
+    def describeReport(self, reportIdentifier):
+        return self.sessionCall(lambda connection: connection.restful("analytics/reports/" + reportIdentifier + "/describe"), "describe")
+
+    #Purpose: Run a SOQL query through the REST api and yield the records as chunks of rows, paging with query_more. The header is the first row of the first chunk.
+    #    soql <String>: The query
+    #    fieldList <List>: The fields to put in the rows, in order, as paths from the queried object (eg Account.Name)
+    #    labelList <List>: The header (default: None for the fields)
+    #    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+    #    includeDeleted <Boolean>: If true, query deleted and archived records as well (queryAll) (default: False)
+    #    metrics <ImportMetrics>: If given, the api calls are timed as the download stage (default: None)
+    def queryChunks(self, soql, fieldList, labelList = None, chunkRows = 5000, includeDeleted = False, metrics = None):
+        with metricsStage(metrics, "download"):
+            result = self.sessionCall(lambda connection: connection.query(soql, include_deleted = includeDeleted), "query")
+        chunkList = [list(ifEquals(labelList, None, fieldList, labelList))]
+        while True:
+            for record in result["records"]:
+                chunkList += [[soqlValueString(soqlFieldValue(record, i)) for i in fieldList]]
+                if(len(chunkList) >= chunkRows):
+                    yield chunkList
+                    chunkList = []
+            if(result["done"]):
+                break
+            with metricsStage(metrics, "download"):
+                nextRecords = result["nextRecordsUrl"].rsplit("/", 1)[-1]
+                result = self.sessionCall(lambda connection: connection.query_more(nextRecords, include_deleted = includeDeleted), "query")
+        if(chunkList != []):
+            yield chunkList
+
+    #Purpose: Run a SOQL query as a Bulk API 2.0 query job and yield the csv results as chunks of rows (see streamCsvRows), a page (maxRecords) at a time.
+    #         The header is the first row of the first chunk.
+    #    soql <String>: The query
+    #    labelList <List>: The header (default: None for the field names bulk returns)
+    #    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+    #    byteChunkSize <Number>: The number of bytes to read from the socket at a time (default: 65536)
+    #    includeDeleted <Boolean>: If true, query deleted and archived records as well (queryAll) (default: False)
+    #    maxRecords <Number>: The number of records in each page of results (default: 100000)
+    #    metrics <ImportMetrics>: If given, the api calls and the results are recorded as the download stage (default: None)
+    def bulkQueryChunks(self, soql, labelList = None, chunkRows = 5000, byteChunkSize = 65536, includeDeleted = False, maxRecords = 100000, metrics = None):
+        jobUrl = self.session().base_url + "jobs/query"
+        with metricsStage(metrics, "download"):
+            response = self.sessionRequest("post", jobUrl, "bulkJob", json = {"operation": ifEquals(includeDeleted, True, "queryAll", "query"), "query": soql,
+                                                                              "contentType": "CSV", "columnDelimiter": "COMMA", "lineEnding": "LF"})
+            jobUrl += "/" + response.json()["id"]
+            while(response.json()["state"] != "JobComplete"):
+                if(response.json()["state"] in ["Failed", "Aborted"]):
+                    raise ValueError("Bulk query job " + jobUrl + " " + response.json()["state"] + ": " + str(response.json().get("errorMessage")))
+                time.sleep(bulkPollSeconds)
+                response = self.sessionRequest("get", jobUrl, "bulkJob")
+
+        locator = ""
+        firstPage = True
+        while(locator != "null"):
+            with metricsStage(metrics, "download"):
+                response = self.sessionRequest("get", jobUrl + "/results?maxRecords=" + str(maxRecords) + ifEquals(locator, "", "", "&locator=" + locator),
+                                               "bulkResults", stream = True)
+            locator = response.headers.get("Sforce-Locator", "null") or "null"
+            firstChunk = True
+            for chunkList in streamCsvRows(responseBytes(response, byteChunkSize, metrics), chunkRows):
+                # Every page starts with the header: relabel it on the first page and drop it on the others
+                if(firstChunk and firstPage):
+                    chunkList[0] = list(ifEquals(labelList, None, chunkList[0], labelList))
+                elif(firstChunk):
+                    chunkList = chunkList[1:]
+                firstChunk = False
+                if(chunkList != []):
+                    yield chunkList
+            firstPage = False
+
+#Date Created: 2016-03-07
+#Last Editted: 2016-03-07
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to split a string into a 2 dimensional list based on 2 delimiters
+#    baseString <String>: a string to split into a list
+#    splitDelimiterFirst <String>: The delimiter to split the string into "rows"
+#    splitDelimiterSecond <String>: The delimiter to split the string into "columns"
+def split2D(baseString, splitDelimiterFirst, splitDelimiterSecond):
+    newList = []
+    for i in baseString.split(splitDelimiterFirst):
+        newList += [i.split(splitDelimiterSecond)]
+    return newList
+
+#Date Created: 2016-03-07
+#Last Editted: 2016-03-07
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to remove a string from a 2 dimensional list
+#    baseString <String>: a string to split into a list
+#    removeString <String>: the string to remove
+def removeStringList2D(baseList,removeString):
+    newList = []
+    for i in range(0,len(baseList)):
+        rowList = []
+        for j in range(0,len(baseList[0])):
+            try:
+                rowList += [baseList[i][j].replace(removeString,"")]
+            except:
+                continue
+        newList += [rowList]
+    return newList
+       
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn an iterable of encoded byte blocks into lines of text, keeping the line endings so the csv module can rejoin quoted fields that span multiple lines
+#    byteIterator <iterable of bytes>: The blocks to decode (eg response.iter_content())
+#    encoding <String>: The encoding of the bytes. utf-8-sig also drops the byte order mark salesforce adds. (default: "utf-8-sig")
+def iterTextLines(byteIterator, encoding = "utf-8-sig"):
+    decoder = codecs.getincrementaldecoder(encoding)(errors = "replace")
+    remainder = ""
+    for block in byteIterator:
+        lines = (remainder + decoder.decode(block)).split("\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    remainder += decoder.decode(b"", True)
+    if(remainder != ""):
+        yield remainder
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to parse a salesforce csv export as it streams in, yielding 2 dimensional lists of at most chunkRows rows.
+#         Quoting follows RFC-4180, so embedded commas, quotes and newlines are kept in their field. The report footer (everything after the first blank line) is dropped.
+#         The header is the first row of the first chunk.
+#    byteIterator <iterable of bytes>: The blocks of the export (eg response.iter_content())
+#    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+#    encoding <String>: The encoding of the export (default: "utf-8-sig")
+#Tests:
+#    list(streamCsvRows([b'"a","b"\n"1","x,\n""y"""\n\n"Footer"\n'])) = [[['a', 'b'], ['1', 'x,\n"y"']]]
+def streamCsvRows(byteIterator, chunkRows = 5000, encoding = "utf-8-sig"):
+    chunkList = []
+    for row in csv.reader(iterTextLines(byteIterator, encoding)):
+        if(row == []):
+            break
+        chunkList += [row]
+        if(len(chunkList) >= chunkRows):
+            yield chunkList
+            chunkList = []
+    if(chunkList != []):
+        yield chunkList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.3
+#Change Notes:
+#     2026-10-18: The request is made through a SalesforceClient, which defaults to the global salesforceConnection session (V1 - V1.1)
+#     2026-10-18: Added report filter overrides (V1.1 - V1.2)
+#     2026-10-18: Added metrics (V1.2 - V1.3)
+#Purpose: The purpose of this function is to stream a salesforce report export and yield it as parsed chunks, so only one chunk is held in memory at a time
+#    reportIdentifier <String>: The identifier string for the report in the link to the salesforce page (eg 00OG0000006h6nl)
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+#    byteChunkSize <Number>: The number of bytes to read from the socket at a time (default: 65536)
+#    client <SalesforceClient>: The session to export with (default: None for the salesforceConnection session)
+#    filterList <2D List>: Report filter overrides as [report column, operator, value] (default: [])
+#    metrics <ImportMetrics>: The metrics to record the download in (default: None)
+def salesforceReportChunks(reportIdentifier, instance, chunkRows = 5000, byteChunkSize = 65536, client = None, filterList = [], metrics = None):
+    if(client is None):
+        client = SalesforceClient.fromConnection(salesforceConnectionVariable, instance, credentialList = salesforceCredentialList)
+    return client.reportChunks(reportIdentifier, chunkRows, byteChunkSize, filterList, metrics)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to yield the bytes of a streamed requests response a block at a time, and close it afterwards
+#    response <requests response>: The response (requested with stream = True)
+#    byteChunkSize <Number>: The number of bytes to read from the socket at a time
+#    metrics <ImportMetrics>: If given, the reads are timed as the download stage and the bytes counted as bytesReceived (default: None)
+def responseBytes(response, byteChunkSize, metrics = None):
+    byteIterator = response.iter_content(byteChunkSize)
+    if(metrics is not None):
+        byteIterator = metrics.timedIterator(byteIterator, "download", "bytesReceived")
+    try:
+        for block in byteIterator:
+            yield block
+    finally:
+        response.close()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the value of a field path (eg Account.Owner.Name) from a SOQL query record, or None if a relationship on the way is empty
+#    record <dictionary>: The record
+#    fieldPath <String>: The field, with the relationships before it separated by dots
+#Tests:
+#    soqlFieldValue({"Account": {"Name": "Acme"}}, "Account.Name") = "Acme"
+#    soqlFieldValue({"Account": None}, "Account.Name") = None
+def soqlFieldValue(record, fieldPath):
+    for i in fieldPath.split("."):
+        if(record is None):
+            return None
+        record = record.get(i)
+    return record
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn a SOQL query value into the string the rest of the load expects, as the report export would have it (null is "", a checkbox is 1 or 0)
+#    value <any>: The value from the query
+def soqlValueString(value):
+    if(value is None):
+        return ""
+    elif(value is True or value is False):
+        return str(int(value))
+    return str(value)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to write a value as a SOQL literal for a field of the given report data type.
+#         Dates may be given as the report filters have them (m/d/yyyy) and are written as SOQL dates (or datetimes at midnight UTC).
+#    value <String>: The value
+#    dataType <String>: The report data type of the field (eg string, date, datetime, currency, boolean)
+#Tests:
+#    soqlLiteral("9/28/2016", "datetime") = "2016-09-28T00:00:00Z"
+#    soqlLiteral("O'Neil", "string") = "'O\\'Neil'"
+def soqlLiteral(value, dataType):
+    value = str(value)
+    if(dataType in ["date", "datetime"]):
+        dateMatch = re.match(r"^([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})$", value)
+        if(dateMatch is not None):
+            value = dateMatch.group(3) + "-" + dateMatch.group(1).zfill(2) + "-" + dateMatch.group(2).zfill(2)
+        if(dataType == "datetime" and "T" not in value):
+            value += "T00:00:00Z"
+        return value
+    elif(dataType in ["currency", "double", "int", "percent", "number"]):
+        return value
+    elif(dataType == "boolean"):
+        return ifEquals(value.lower() in ["1", "true"], True, "true", "false")
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn the definition of a report (from SalesforceClient.describeReport) into a SOQL query that returns the same rows and columns.
+#         The report columns are mapped to fields with fieldMapDict and then the standard mapping of the report type (reportTypeDict); a custom field
+#         column (eg Opportunity.Region__c) is used as is. The report filters (when they are all and-ed), the standard date filter and the filter overrides are the where clause.
+#         Report-only columns (eg AGE, or converted amounts) have no field, so they must be mapped in fieldMapDict, otherwise a ValueError lists them.
+#    describeDict <dictionary>: The report describe
+#    fieldMapDict <dictionary>: The SOQL field (path from the queried object) for report columns, ahead of the standard mapping (default: {})
+#    filterList <2D List>: Filter overrides as [report column, operator, value] with the export operators (eq, ne, lt, gt, le, ge, co, nc, sw) (default: [])
+#Returns: [SOQL query, list of the selected fields, list of the report column labels]
+def reportSoql(describeDict, fieldMapDict = {}, filterList = []):
+    reportMetadata = describeDict["reportMetadata"]
+    reportType = reportMetadata["reportType"]["type"]
+    objectName, standardFieldDict = reportTypeDict.get(reportType, [reportType, {}])
+
+    columnInfoDict = {}
+    for i in describeDict.get("reportTypeMetadata", {}).get("categories", []):
+        columnInfoDict.update(i.get("columns", {}))
+    columnInfoDict.update(describeDict.get("reportExtendedMetadata", {}).get("detailColumnInfo", {}))
+
+    def columnField(column):
+        if(column in fieldMapDict):
+            return fieldMapDict[column]
+        elif(column in standardFieldDict):
+            return standardFieldDict[column]
+        elif(column.endswith("__c") and "." in column):
+            return ifEquals(column.split(".")[0], objectName, column.split(".", 1)[1], column)
+        return None
+
+    def columnFilter(column, operator, value):
+        dataType = columnInfoDict.get(column, {}).get("dataType")
+        if(dataType is None):
+            dataType = ifEquals(columnField(column).endswith(("CreatedDate", "LastModifiedDate", "SystemModstamp")), True, "datetime",
+                                ifEquals(columnField(column).endswith("Date"), True, "date", "string"))
+        if(operator in ["contains", "notContain", "startsWith"]):
+            likeString = soqlLiteral(ifEquals(operator, "startsWith", "", "%") + value + "%", "string")
+            return ifEquals(operator, "notContain", "(not " + columnField(column) + " like " + likeString + ")", columnField(column) + " like " + likeString)
+        elif(operator in ["equals", "notEqual"] and "," in value and dataType not in ["currency", "double", "int", "percent"]):
+            return (columnField(column) + ifEquals(operator, "equals", " in (", " not in (") +
+                    columnListString([soqlLiteral(i.strip(), dataType) for i in value.split(",")]) + ")")
+        return columnField(column) + " " + soqlOperatorDict[operator] + " " + soqlLiteral(value, dataType)
+
+    unmappedList = [i for i in reportMetadata["detailColumns"] if columnField(i) is None]
+    whereList = []
+    reportFilterList = [[i["column"], i["operator"], i["value"]] for i in reportMetadata.get("reportFilters", [])]
+    dateFilter = reportMetadata.get("standardDateFilter") or {}
+    if(dateFilter.get("startDate")):
+        reportFilterList += [[dateFilter["column"], "greaterOrEqual", dateFilter["startDate"]]]
+    if(dateFilter.get("endDate")):
+        reportFilterList += [[dateFilter["column"], "lessOrEqual", dateFilter["endDate"]]]
+    reportFilterList += [[i[0], exportOperatorDict.get(i[1], i[1]), i[2]] for i in filterList]
+    unmappedList += [i[0] for i in reportFilterList if columnField(i[0]) is None and i[0] not in unmappedList]
+    if(unmappedList != []):
+        raise ValueError("These report columns have no SOQL field, add them to fieldMapDict: " + columnListString(unmappedList))
+    if(reportMetadata.get("reportBooleanFilter")):
+        raise ValueError("Reports with filter logic (" + reportMetadata["reportBooleanFilter"] + ") cannot be turned into SOQL, pass the query in soql instead")
+    for i in reportFilterList:
+        whereList += [columnFilter(i[0], i[1], i[2])]
+
+    fieldList = [columnField(i) for i in reportMetadata["detailColumns"]]
+    labelList = [columnInfoDict.get(i, {}).get("label", i) for i in reportMetadata["detailColumns"]]
+    soql = "select " + columnListString(fieldList) + " from " + objectName
+    if(whereList != []):
+        soql += " where " + columnListString(whereList, "", "", False, " and ")
+    return [soql, fieldList, labelList]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the fields selected by a SOQL query, in order (eg ["Id", "Account.Name"])
+#    soql <String>: The query (without subqueries)
+#Tests:
+#    soqlFieldList("SELECT Id, Account.Name FROM Opportunity WHERE Amount > 0") = ["Id", "Account.Name"]
+def soqlFieldList(soql):
+    selectMatch = re.match(r"^\s*select\s+(.*?)\s+from\s", soql, re.IGNORECASE | re.DOTALL)
+    if(selectMatch is None):
+        raise ValueError("Could not find the select list of: " + soql)
+    return [i.strip() for i in selectMatch.group(1).split(",")]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to pull a report through the api instead of the export link, yielding the same chunks as salesforceReportChunks,
+#         so the report is not held to the export row limit. The query is built from the report definition (see reportSoql) unless it is given.
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+#    client <SalesforceClient>: The session to query with (default: None for the salesforceConnection session)
+#    filterList <2D List>: Filter overrides (see reportSoql) (default: [])
+#    metrics <ImportMetrics>: The metrics to record the download in (default: None)
+#    extractMode <String>: 'soql' to page through the REST api, or 'bulk' to run a Bulk API 2.0 query job (default: 'soql')
+#    soql <String>: The query to run instead of the one built from the report. The header is then the selected fields. (default: None)
+#    fieldMapDict <dictionary>: The SOQL fields of report columns with no standard field (see reportSoql) (default: {})
+def soqlReportChunks(reportIdentifier, instance, chunkRows = 5000, client = None, filterList = [], metrics = None, extractMode = 'soql', soql = None, fieldMapDict = {}):
+    if(client is None):
+        client = SalesforceClient.fromConnection(salesforceConnectionVariable, instance, credentialList = salesforceCredentialList)
+    if(soql is None):
+        with metricsStage(metrics, "download"):
+            soql, fieldList, labelList = reportSoql(client.describeReport(reportIdentifier), fieldMapDict, filterList)
+    elif(filterList != []):
+        raise ValueError("Filter overrides (eg incremental loads) need the query built from the report, so soql must be None")
+    else:
+        fieldList = soqlFieldList(soql)
+        labelList = fieldList
+    if(extractMode == 'bulk'):
+        return client.bulkQueryChunks(soql, labelList, chunkRows, metrics = metrics)
+    return client.queryChunks(soql, fieldList, labelList, chunkRows, metrics = metrics)
+
+bulkPollSeconds = 5
+soqlOperatorDict = {"equals": "=", "notEqual": "!=", "lessThan": "<", "greaterThan": ">", "lessOrEqual": "<=", "greaterOrEqual": ">="}
+exportOperatorDict = {"eq": "equals", "ne": "notEqual", "lt": "lessThan", "gt": "greaterThan", "le": "lessOrEqual", "ge": "greaterOrEqual",
+                      "co": "contains", "nc": "notContain", "sw": "startsWith"}
+opportunityFieldDict = {"OPPORTUNITY_ID": "Id", "OPPORTUNITY_NAME": "Name", "STAGE_NAME": "StageName", "ACCOUNT_ID": "AccountId", "ACCOUNT_NAME": "Account.Name",
+                        "ACCOUNT_OWNER": "Account.Owner.Name", "FULL_NAME": "Owner.Name", "AMOUNT": "Amount", "CLOSE_DATE": "CloseDate",
+                        "CREATED_DATE": "CreatedDate", "CREATED": "CreatedBy.Name", "LAST_UPDATE": "LastModifiedDate", "LAST_STAGE_CHANGE_DATE": "LastStageChangeDate",
+                        "PROBABILITY": "Probability", "FORECAST_CATEGORY": "ForecastCategoryName", "LEAD_SOURCE": "LeadSource", "TYPE": "Type",
+                        "CAMPAIGN_SOURCE": "Campaign.Name", "BILLING_COUNTRY": "Account.BillingCountry", "CURRENCY_ISO_CODE": "CurrencyIsoCode"}
+reportTypeDict = {"Opportunity": ["Opportunity", opportunityFieldDict],
+                  "OpportunityProduct": ["OpportunityLineItem", dict([[i, "Opportunity." + j] for i, j in opportunityFieldDict.items()] +
+                                                                     [["OPPORTUNITY_ID", "OpportunityId"], ["PRODUCT_NAME", "Product2.Name"],
+                                                                      ["PRODUCT_FAMILY", "Product2.Family"], ["PRODUCT_CUSTOMER_ID", "ProductCode"],
+                                                                      ["QUANTITY", "Quantity"], ["UNIT_PRICE", "UnitPrice"], ["TOTAL_PRICE", "TotalPrice"]])]}
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the path (without the extension) a report export is cached at in exportCacheDirectory, keyed by instance and report.
+#         A filtered export (eg an incremental pull) is cached separately from the full report.
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    filterList <2D List>: The report filter overrides of the export (default: [])
+#Tests:
+#    exportCacheFile("00OF0000006h3bl", "na5") = os.path.join(exportCacheDirectory, "na5_00OF0000006h3bl")
+def exportCacheFile(reportIdentifier, instance, filterList = []):
+    fileName = instance + "_" + reportIdentifier
+    if(filterList != []):
+        fileName += "_" + hashlib.sha256(json.dumps(filterList).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(exportCacheDirectory, fileName)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to hash the data of a report export as it streams in. The footer (everything after the first blank line outside of quotes)
+#         is left out of the hash, because its "Generated By" line holds the time of the export and would make every download hash differently.
+class ExportHash:
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self.quoteCount = 0
+        self.previousByte = b""
+        self.complete = False
+
+    #Purpose: Add the next block of the export. A blank line only ends the data when an even number of quotes came before it (ie it is not inside a field).
+    #    block <bytes>: The next block
+    def update(self, block):
+        if(self.complete or block == b""):
+            return
+        searchBlock = self.previousByte + block
+        position = searchBlock.find(b"\n\n")
+        while(position != -1):
+            dataEnd = position + 1 - len(self.previousByte)
+            if((self.quoteCount + block.count(b'"', 0, dataEnd)) % 2 == 0):
+                self.hasher.update(block[:dataEnd])
+                self.complete = True
+                return
+            position = searchBlock.find(b"\n\n", position + 1)
+        self.hasher.update(block)
+        self.quoteCount += block.count(b'"')
+        self.previousByte = block[-1:]
+
+    #Purpose: Return the hash as a hex string
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The .json index is written beside the cached one and renamed over it, and the old index is removed before the export is swapped,
+#                 so an index never describes a different export (V1 - V1.1)
+#Purpose: The purpose of this function is to download a report export into the export cache, gzip compressed, and return the hash of its data (see ExportHash).
+#         The export is written beside the cached one and renamed over it once it is complete, so a failed download leaves the last export in place.
+#         The hash, size and time of the export are kept beside it in a .json file.
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    client <SalesforceClient>: The session to export with (default: None for the salesforceConnection session)
+#    filterList <2D List>: Report filter overrides (default: [])
+#    byteChunkSize <Number>: The number of bytes to read from the socket at a time (default: 65536)
+#    metrics <ImportMetrics>: The metrics to record the download in (default: None)
+def refreshExportCache(reportIdentifier, instance, client = None, filterList = [], byteChunkSize = 65536, metrics = None):
+    if(client is None):
+        client = SalesforceClient.fromConnection(salesforceConnectionVariable, instance, credentialList = salesforceCredentialList)
+    cacheFile = exportCacheFile(reportIdentifier, instance, filterList)
+    os.makedirs(exportCacheDirectory, exist_ok = True)
+    contentHash = ExportHash()
+    byteCount = 0
+    with gzip.open(cacheFile + ".csv.gz.tmp", "wb", compresslevel = exportCacheCompression) as cacheOutput:
+        for block in client.exportBytes(reportIdentifier, byteChunkSize, filterList, metrics):
+            with metricsStage(metrics, "download"):
+                contentHash.update(block)
+                cacheOutput.write(block)
+                byteCount += len(block)
+    with open(cacheFile + ".json.tmp", "w") as indexFile:
+        json.dump(collections.OrderedDict([["reportIdentifier", reportIdentifier], ["instance", instance], ["filterList", filterList],
+                                           ["sha256", contentHash.hexdigest()], ["bytes", byteCount],
+                                           ["cachedDateTime", datetime.datetime.now().isoformat()]]), indexFile, indent = 2)
+    # Stopping between the two renames leaves the export with no index, which cachedExportHash reads as not cached
+    try:
+        os.remove(cacheFile + ".json")
+    except FileNotFoundError:
+        pass
+    os.replace(cacheFile + ".csv.gz.tmp", cacheFile + ".csv.gz")
+    os.replace(cacheFile + ".json.tmp", cacheFile + ".json")
+    return contentHash.hexdigest()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: An index that is not a json object is read as not cached as well (V1 - V1.1)
+#Purpose: The purpose of this function is to return the data hash of the cached export of a report (see refreshExportCache), or None if it is not cached
+#         (or its index is missing or cannot be read)
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    filterList <2D List>: The report filter overrides of the export (default: [])
+def cachedExportHash(reportIdentifier, instance, filterList = []):
+    try:
+        with open(exportCacheFile(reportIdentifier, instance, filterList) + ".json") as indexFile:
+            return json.load(indexFile)["sha256"]
+    except (IOError, ValueError, KeyError, TypeError):
+        return None
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to yield the cached export of a report as parsed chunks (see streamCsvRows), without going to salesforce
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    chunkRows <Number>: The maximum number of rows in each yielded chunk (default: 5000)
+#    byteChunkSize <Number>: The number of bytes to decompress at a time (default: 65536)
+#    filterList <2D List>: The report filter overrides of the export (default: [])
+#    metrics <ImportMetrics>: If given, the reads of the cache are timed as the download stage (default: None)
+def cachedReportChunks(reportIdentifier, instance, chunkRows = 5000, byteChunkSize = 65536, filterList = [], metrics = None):
+    for chunkList in streamCsvRows(cachedExportBytes(reportIdentifier, instance, byteChunkSize, filterList, metrics), chunkRows):
+        yield chunkList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to yield the raw bytes of the cached export of a report a block at a time (decompressed)
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    byteChunkSize <Number>: The number of bytes to decompress at a time (default: 65536)
+#    filterList <2D List>: The report filter overrides of the export (default: [])
+#    metrics <ImportMetrics>: If given, the reads of the cache are timed as the download stage (default: None)
+def cachedExportBytes(reportIdentifier, instance, byteChunkSize = 65536, filterList = [], metrics = None):
+    cacheFile = exportCacheFile(reportIdentifier, instance, filterList) + ".csv.gz"
+    if(not os.path.exists(cacheFile)):
+        raise IOError("There is no cached export of report " + reportIdentifier + " (" + instance + ") at " + cacheFile)
+    with gzip.open(cacheFile, "rb") as cacheInput:
+        byteIterator = iter(lambda: cacheInput.read(byteChunkSize), b"")
+        if(metrics is not None):
+            byteIterator = metrics.timedIterator(byteIterator, "download")
+        for block in byteIterator:
+            yield block
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: A block without a record end no longer raises an IndexError (V1 - V1.1)
+#Purpose: The purpose of this function is to split the raw bytes of a csv export into shards of chunkRows records (the header counts as a record of the first shard),
+#         so each shard can be parsed on its own. A newline ends a record when an even number of quotes came before it (ie it is not inside a field),
+#         which is found for a whole block at a time with numpy. The export ends at the first blank line outside of quotes, so the footer is left out.
+#         The shards hold the same rows as the chunks of streamCsvRows.
+#    byteIterator <iterable of bytes>: The blocks of the export (eg exportBytes or cachedExportBytes)
+#    chunkRows <Number>: The number of records in each shard (default: 5000)
+#Tests:
+#    list(shardExportRecords([b'"a","b"\n"1","x\n"\n"2","y"\n\n"Footer"\n'], 2)) = [b'"a","b"\n"1","x\n"\n', b'"2","y"\n']
+def shardExportRecords(byteIterator, chunkRows = 5000):
+    pendingBytes = bytearray()
+    quoteCount = 0
+    recordCount = 0
+    lastEnd = -1
+    for block in byteIterator:
+        if(len(block) == 0):
+            continue
+        blockArray = np.frombuffer(block, dtype = np.uint8)
+        newlineArray = np.flatnonzero(blockArray == 10)
+        quoteArray = np.cumsum(blockArray == 34)
+        endArray = newlineArray[(quoteCount + quoteArray[newlineArray]) % 2 == 0] + len(pendingBytes)
+        quoteCount = (quoteCount + int(quoteArray[-1])) % 2
+        pendingBytes += block
+
+        # A record end straight after another one is a blank line
+        blankArray = np.flatnonzero(np.diff(endArray, prepend = lastEnd) == 1)
+        complete = len(blankArray) > 0
+        if(complete):
+            endArray = endArray[:blankArray[0]]
+
+        shardStart = 0
+        for i in range(chunkRows - recordCount - 1, len(endArray), chunkRows):
+            yield bytes(pendingBytes[shardStart:endArray[i] + 1])
+            shardStart = int(endArray[i]) + 1
+        recordCount = (recordCount + len(endArray)) % chunkRows
+        if(len(endArray)):
+            lastEnd = int(endArray[-1])
+        lastEnd -= shardStart
+        del pendingBytes[:shardStart]
+        if(complete):
+            if(recordCount > 0):
+                yield bytes(pendingBytes[:lastEnd + 1])
+            return
+    if(pendingBytes.strip() != b""):
+        yield bytes(pendingBytes)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to parse and transform one shard of an export (see shardExportRecords) in a parse worker process:
+#         the invalid ids are filtered out and the dates converted, as transformChunks does. The rows that are kept are written to shared memory
+#         as an arrow IPC stream (see writeSharedBatch), so they go back to the loader without pickling a list per row.
+#    shardBytes <bytes>: The shard
+#    columnList <List>: The columns of the report (see reportColumnList)
+#    dateMaskList <2d String List>: the 2d list (column name, python datetime object mask) to use to change string dates to datetime objects
+#    skipHeader <Boolean>: If true, the first record is the header and is dropped (default: False)
+#Returns: [shared memory name, size] for readSharedBatch
+def transformShard(shardBytes, columnList, dateMaskList, skipHeader = False):
+    rowList = []
+    for chunkList in streamCsvRows([shardBytes]):
+        rowList += chunkList
+    if(skipHeader):
+        rowList = rowList[1:]
+    batch = ReportBatch.fromRows(columnList, rowList)
+    batch.filterString(columnList[0], " ", False)
+    convertDateColumns(batch, dateMaskList)
+    return writeSharedBatch(batch, listColumn(dateMaskList, 0))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to write the rows of a ReportBatch that pass its filters into a new shared memory block as an arrow IPC stream.
+#         The size of the stream is measured first, so it is written straight into the block. The block is left for readSharedBatch to remove.
+#    batch <ReportBatch>: The batch
+#    dateColumnList <List>: The columns that hold dates
+#Returns: [shared memory name, size]
+def writeSharedBatch(batch, dateColumnList):
+    arrowTable = batchArrowTable(batch, batchArrowSchema(batch, dateColumnList))
+    sizeStream = pyarrow.MockOutputStream()
+    with pyarrow.ipc.new_stream(sizeStream, arrowTable.schema) as streamWriter:
+        streamWriter.write_table(arrowTable)
+    sharedBlock = multiprocessing.shared_memory.SharedMemory(create = True, size = max(sizeStream.size(), 1))
+    try:
+        sharedBuffer = pyarrow.py_buffer(sharedBlock.buf)
+        with pyarrow.ipc.new_stream(pyarrow.FixedSizeBufferWriter(sharedBuffer), arrowTable.schema) as streamWriter:
+            streamWriter.write_table(arrowTable)
+        del sharedBuffer, streamWriter
+    except BaseException:
+        sharedBlock.close()
+        sharedBlock.unlink()
+        raise
+    sharedBlock.close()
+    return [sharedBlock.name, sizeStream.size()]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to read a ReportBatch back from a shared memory block (see writeSharedBatch) and remove the block.
+#         The arrow stream is read in place, and only the python values of the batch are copied out of it.
+#    sharedBatch <List>: [shared memory name, size]
+def readSharedBatch(sharedBatch):
+    sharedBlock = multiprocessing.shared_memory.SharedMemory(name = sharedBatch[0])
+    try:
+        arrowTable = pyarrow.ipc.open_stream(pyarrow.py_buffer(sharedBlock.buf)[:sharedBatch[1]]).read_all()
+        batch = arrowReportBatch(arrowTable.combine_chunks())
+        del arrowTable
+    finally:
+        sharedBlock.close()
+        sharedBlock.unlink()
+    return batch
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The pool is started with the fork context, since the default start method is spawn on some platforms and newer pythons (V1 - V1.1)
+#Purpose: The purpose of this function is to parse and transform an export on a pool of parseWorkers processes and yield the shards as ReportBatches, in order.
+#         The export is split at record boundaries (see shardExportRecords) and each shard is sent to transformShard; the header is read here.
+#         Up to 2 shards per worker are in flight, so the workers stay busy while the loader works through the batches before them.
+#         If the loader stops early, the shards still in flight are finished and their shared memory removed.
+#         The workers are forked, so they see the functions (and dateParseCache) of the process that started them.
+#    byteIterator <iterable of bytes>: The blocks of the export (eg exportBytes or cachedExportBytes)
+#    dateMaskList <2d String List>: the 2d list (column name, python datetime object mask) to use to change string dates to datetime objects
+#    chunkRows <Number>: The number of records in each shard (default: 5000)
+#    parseWorkers <Number>: The number of worker processes (default: 4)
+#    skipChunks <Number>: The number of shards at the start to skip (eg the chunks a resumed load already committed) (default: 0)
+#    metrics <ImportMetrics>: If given, waiting for and reading back the shards is timed as the parse stage (default: None)
+def shardedReportBatches(byteIterator, dateMaskList, chunkRows = 5000, parseWorkers = 4, skipChunks = 0, metrics = None):
+    if(not moduleAvailable("pyarrow")):
+        raise ImportError("The parse workers need pyarrow (pip install pyarrow)")
+    columnList = None
+    futureList = collections.deque()
+    # The workers must share this process's resource tracker, otherwise the tracker of a worker removes the blocks it wrote when it exits
+    multiprocessing.resource_tracker.ensure_running()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers = parseWorkers, mp_context = multiprocessing.get_context("fork"))
+    try:
+        for chunkNumber, shardBytes in enumerate(shardExportRecords(byteIterator, chunkRows)):
+            if(columnList is None):
+                columnList = reportColumnList(next(streamCsvRows([shardBytes], 1))[0])
+            if(chunkNumber < skipChunks):
+                continue
+            futureList.append(executor.submit(transformShard, shardBytes, columnList, dateMaskList, chunkNumber == 0))
+            if(len(futureList) >= parseWorkers * 2):
+                with metricsStage(metrics, "parse"):
+                    batch = readSharedBatch(futureList.popleft().result())
+                yield batch
+        while(len(futureList) > 0):
+            with metricsStage(metrics, "parse"):
+                batch = readSharedBatch(futureList.popleft().result())
+            yield batch
+    finally:
+        executor.shutdown(wait = True, cancel_futures = True)
+        for i in futureList:
+            if(not i.cancelled() and i.exception() is None):
+                discardSharedBatch(i.result())
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to remove a shared memory block (see writeSharedBatch) without reading it
+#    sharedBatch <List>: [shared memory name, size]
+def discardSharedBatch(sharedBatch):
+    sharedBlock = multiprocessing.shared_memory.SharedMemory(name = sharedBatch[0])
+    sharedBlock.close()
+    sharedBlock.unlink()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the data hash of the export that was last loaded into a table from a report, or None
+#    tableName <String>: The table the report is loaded into
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    filterList <2D List>: The report filter overrides of the export (default: [])
+def exportLoadedHash(tableName, reportIdentifier, instance, filterList = []):
+    with exportCacheLock:
+        try:
+            with open(os.path.join(exportCacheDirectory, exportLoadedFile)) as loadedFile:
+                loadedDict = json.load(loadedFile)
+        except (IOError, ValueError):
+            return None
+    return loadedDict.get(tableName, {}).get(os.path.basename(exportCacheFile(reportIdentifier, instance, filterList)))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to record the data hash of the export that was just loaded into a table from a report.
+#         When the load replaced the table, the hashes of the other reports loaded into it are forgotten (their rows are gone, so they must be loaded again).
+#    tableName <String>: The table the report was loaded into
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    filterList <2D List>: The report filter overrides of the export
+#    contentHash <String>: The data hash of the export
+#    replaceTable <Boolean>: True if the load replaced the table
+def setExportLoadedHash(tableName, reportIdentifier, instance, filterList, contentHash, replaceTable):
+    loadedFileName = os.path.join(exportCacheDirectory, exportLoadedFile)
+    with exportCacheLock:
+        try:
+            with open(loadedFileName) as loadedFile:
+                loadedDict = json.load(loadedFile)
+        except (IOError, ValueError):
+            loadedDict = {}
+        if(replaceTable):
+            loadedDict[tableName] = {}
+        loadedDict.setdefault(tableName, {})[os.path.basename(exportCacheFile(reportIdentifier, instance, filterList))] = contentHash
+        os.makedirs(exportCacheDirectory, exist_ok = True)
+        with open(loadedFileName + ".tmp", "w") as loadedFile:
+            json.dump(loadedDict, loadedFile, indent = 2, sort_keys = True)
+        os.replace(loadedFileName + ".tmp", loadedFileName)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the date ranges to partition a report by (see importSalesForceToSql partitionList), every number of months
+#         from the start date until the end date. The boundaries fall on the first of a month. The first range is open at the start and the last at the end,
+#         so no row is left out of every partition.
+#    startDate <date>: The first boundary (eg the month the oldest rows were created in)
+#    endDate <date>: The date to stop adding boundaries at (eg today) (default: None for today)
+#    months <Number>: The number of months in each range (default: 12)
+#Tests:
+#    datePartitions(datetime.date(2014,1,1), datetime.date(2016,3,1)) = [[None, datetime.date(2015,1,1)], [datetime.date(2015,1,1), datetime.date(2016,1,1)], [datetime.date(2016,1,1), None]]
+def datePartitions(startDate, endDate = None, months = 12):
+    endDate = ifEquals(endDate, None, datetime.date.today(), endDate)
+    boundaryList = []
+    monthNumber = startDate.month - 1 + months
+    while(datetime.date(startDate.year + monthNumber // 12, monthNumber % 12 + 1, 1) < endDate):
+        boundaryList += [datetime.date(startDate.year + monthNumber // 12, monthNumber % 12 + 1, 1)]
+        monthNumber += months
+    return [[i, j] for i, j in zip([None] + boundaryList, boundaryList + [None])]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the report filter overrides of each partition of a report: the filters of the export, with the partition
+#         column on or after the start of the range and before its end
+#    filterList <2D List>: The report filter overrides of the export (eg the incremental watermark)
+#    partitionFilter <String>: The report filter column to partition on (eg CREATED_DATE)
+#    partitionList <2D List>: The [start date, end date] of each partition, None for an open end (see datePartitions)
+#Tests:
+#    reportPartitionFilters([], "CREATED_DATE", [[None, datetime.date(2015,1,1)], [datetime.date(2015,1,1), None]]) = [[["CREATED_DATE", "lt", "1/1/2015"]], [["CREATED_DATE", "ge", "1/1/2015"]]]
+def reportPartitionFilters(filterList, partitionFilter, partitionList):
+    partitionFilterList = []
+    for i, j in partitionList:
+        rangeFilterList = []
+        if(i is not None):
+            rangeFilterList += [[partitionFilter, "ge", str(i.month) + "/" + str(i.day) + "/" + str(i.year)]]
+        if(j is not None):
+            rangeFilterList += [[partitionFilter, "lt", str(j.month) + "/" + str(j.day) + "/" + str(j.year)]]
+        partitionFilterList += [filterList + rangeFilterList]
+    return partitionFilterList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the filter list a partitioned export is known by as a whole (for the loaded hashes and the checkpoints):
+#         the filters of the export and one that names every partition
+#    filterList <2D List>: The report filter overrides of the export
+#    partitionFilter <String>: The report filter column partitioned on
+#    partitionList <2D List>: The [start date, end date] of each partition
+def partitionKeyFilter(filterList, partitionFilter, partitionList):
+    return filterList + [[partitionFilter, "partitions", json.dumps([[str(i), str(j)] for i, j in partitionList])]]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to download every partition of a report into the export cache at the same time (see refreshExportCache),
+#         and return one hash for all of them. The requests are held to the limit of the org by its RequestGovernor, so the partitions queue there instead of hammering it.
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    client <SalesforceClient>: The session to export with (default: None for the salesforceConnection session)
+#    partitionFilterList <3D List>: The report filter overrides of each partition (see reportPartitionFilters)
+#    metrics <ImportMetrics>: The metrics to record the downloads in (default: None)
+def refreshPartitionCache(reportIdentifier, instance, client, partitionFilterList, metrics = None):
+    with concurrent.futures.ThreadPoolExecutor(max_workers = min(len(partitionFilterList), governorMaxConcurrency)) as executor:
+        hashList = list(executor.map(lambda i: refreshExportCache(reportIdentifier, instance, client, i, metrics = metrics), partitionFilterList))
+    return hashlib.sha256("".join(hashList).encode("ascii")).hexdigest()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the hash of the cached partitions of a report (see refreshPartitionCache), or None if any of them is not cached
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    partitionFilterList <3D List>: The report filter overrides of each partition (see reportPartitionFilters)
+def cachedPartitionHash(reportIdentifier, instance, partitionFilterList):
+    hashList = [cachedExportHash(reportIdentifier, instance, i) for i in partitionFilterList]
+    if(None in hashList):
+        return None
+    return hashlib.sha256("".join(hashList).encode("ascii")).hexdigest()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to yield the parsed chunks of several partitions of a report as one export: the header once, then the rows of each partition in order.
+#         A row whose key (eg OPPORTUNITY_ID) already came from an earlier partition is dropped, so overlapping ranges load each record once.
+#         The rows of a key within one partition (eg the products of an opportunity) are all kept.
+#    chunkIteratorList <List>: The chunk iterator of each partition (eg cachedReportChunks)
+#    keyColumnList <List>: The columns (by sql name) a row is identified by. Those the report does not have are left out, and with none left nothing is dropped.
+#    metrics <ImportMetrics>: If given, the dropped rows are counted as duplicateRows (default: None)
+def mergePartitionChunks(chunkIteratorList, keyColumnList, metrics = None):
+    headerRow = None
+    keyIndexList = []
+    seenKeySet = set()
+    for chunkIterator in chunkIteratorList:
+        partitionKeySet = set()
+        for chunkNumber, dataList in enumerate(chunkIterator):
+            # The first chunk of each partition starts with the header: keep it for the first partition and check it matches for the others
+            firstChunk = headerRow is None
+            if(firstChunk):
+                headerRow = dataList[0]
+                columnList = reportColumnList(headerRow)
+                keyIndexList = [columnList.index(i) for i in keyColumnList if i in columnList]
+            elif(chunkNumber == 0 and dataList[0] != headerRow):
+                raise ValueError("The partitions of the report have different columns: " + str(headerRow) + " and " + str(dataList[0]))
+            rowList = ifEquals(chunkNumber, 0, dataList[1:], dataList)
+
+            if(keyIndexList != []):
+                keyList = [tuple([i[j] for j in keyIndexList if j < len(i)]) for i in rowList]
+                partitionKeySet.update(keyList)
+                keptList = [i for i, j in zip(rowList, keyList) if j not in seenKeySet]
+                if(metrics is not None and len(keptList) < len(rowList)):
+                    metrics.addCount("duplicateRows", len(rowList) - len(keptList))
+                rowList = keptList
+            if(firstChunk):
+                yield [headerRow] + rowList
+            elif(rowList != []):
+                yield rowList
+        seenKeySet.update(partitionKeySet)
+
+exportCacheDirectory = "exportCache"
+exportCacheCompression = 6
+exportLoadedFile = "loadedHashes.json"
+exportCacheLock = threading.Lock()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to archive one extract, as it is transformed, into a parquet snapshot in snapshotDirectory, partitioned as
+#         instance=<instance name>/report=<report identifier>/extract_date=<yyyy-mm-dd>/<extract time>.parquet.
+#         Every chunk is written as a row group with dictionary encoded pages, so the repeated values of a report (stages, owners, countries) are stored once per page.
+#         Date columns are timestamps and everything else is a string, as the report had it. The file is written beside its name and renamed once commit() is called,
+#         so a failed load leaves no snapshot behind. Used in a with block, it commits when the block ends and aborts if the block fails.
+#    reportIdentifier <String>: The identifier string for the report
+#    instance <String>: The string before salesforce.com that the instance refers to.
+#    instanceName <String>: The name of the instance, the first partition (default: "" for the instance)
+#    extractedDateTime <datetime>: The time of the extract (default: None for now)
+#    dateColumnList <List>: The columns that hold dates (eg the columns of dateMaskList) (default: [])
+#    metadataDict <dictionary>: Extra values to keep in the file metadata (eg the filter overrides) (default: {})
+class SnapshotWriter:
+    def __init__(self, reportIdentifier, instance, instanceName = "", extractedDateTime = None, dateColumnList = [], metadataDict = {}):
+        if(not moduleAvailable("pyarrow")):
+            raise ImportError("The snapshot archive needs pyarrow (pip install pyarrow)")
+        self.extractedDateTime = ifEquals(extractedDateTime, None, datetime.datetime.now(), extractedDateTime)
+        self.dateColumnList = list(dateColumnList)
+        self.fileName = os.path.join(snapshotPartition(ifEquals(instanceName, "", instance, instanceName), reportIdentifier, self.extractedDateTime.date()),
+                                     self.extractedDateTime.strftime("%H%M%S%f") + ".parquet")
+        self.metadataDict = collections.OrderedDict([["reportIdentifier", reportIdentifier], ["instance", instance], ["instanceName", instanceName],
+                                                     ["extractedDateTime", self.extractedDateTime.isoformat()]])
+        self.metadataDict.update([[i, json.dumps(j)] for i, j in metadataDict.items()])
+        self.writer = None
+        self.rowCount = 0
+
+    #Purpose: Add the rows of a batch that pass its filters as a row group. The schema is set by the first batch.
+    #    batch <ReportBatch>: The transformed batch (before convertNumberColumns)
+    def write(self, batch):
+        if(self.writer is None):
+            schema = batchArrowSchema(batch, self.dateColumnList, dict([[i, str(j)] for i, j in self.metadataDict.items()]))
+            os.makedirs(os.path.dirname(self.fileName), exist_ok = True)
+            self.writer = pyarrow.parquet.ParquetWriter(self.fileName + ".tmp", schema, compression = snapshotCompression, use_dictionary = True)
+        self.writer.write_table(batchArrowTable(batch, self.writer.schema))
+        self.rowCount += len(batch)
+        return self
+
+    #Purpose: Finish the file and move it into the archive. Returns the file name (or None when no batch was written).
+    def commit(self):
+        if(self.writer is None):
+            return None
+        self.writer.close()
+        os.replace(self.fileName + ".tmp", self.fileName)
+        return self.fileName
+
+    #Purpose: Remove the part written so far (eg when the load failed)
+    def abort(self):
+        if(self.writer is not None):
+            self.writer.close()
+            os.remove(self.fileName + ".tmp")
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        if(exceptionType is None):
+            self.commit()
+        else:
+            self.abort()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the directory of the snapshot archive that holds the snapshots of a report for one day
+#    instanceName <String>: The name of the instance
+#    reportIdentifier <String>: The identifier string for the report
+#    extractDate <date>: The day of the extract
+#Tests:
+#    snapshotPartition("Good", "00O16000007gKx8", datetime.date(2016, 9, 28)) = os.path.join(snapshotDirectory, "instance=Good", "report=00O16000007gKx8", "extract_date=2016-09-28")
+def snapshotPartition(instanceName, reportIdentifier, extractDate):
+    return os.path.join(snapshotDirectory, "instance=" + instanceName, "report=" + reportIdentifier, "extract_date=" + extractDate.isoformat())
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to list the snapshots in the archive, oldest first, optionally only those of an instance, a report or a range of extract dates
+#    instanceName <String>: The name of the instance (default: None for all)
+#    reportIdentifier <String>: The identifier string for the report (default: None for all)
+#    startDate <date>: The first extract date to include (default: None)
+#    endDate <date>: The last extract date to include (default: None)
+#    latestOnly <Boolean>: If true, only the last snapshot of each instance and report is returned (default: False)
+#Returns: A 2D list of [instance name, report identifier, extract date, file name]
+def snapshotFiles(instanceName = None, reportIdentifier = None, startDate = None, endDate = None, latestOnly = False):
+    fileList = []
+    for directory, directoryList, fileNameList in os.walk(snapshotDirectory):
+        partitionDict = dict([i.split("=", 1) for i in os.path.relpath(directory, snapshotDirectory).split(os.sep) if "=" in i])
+        if(sorted(partitionDict) != ["extract_date", "instance", "report"]):
+            continue
+        extractDate = datetime.date.fromisoformat(partitionDict["extract_date"])
+        if(instanceName is not None and partitionDict["instance"] != instanceName or reportIdentifier is not None and partitionDict["report"] != reportIdentifier or
+           startDate is not None and extractDate < startDate or endDate is not None and extractDate > endDate):
+            continue
+        fileList += [[partitionDict["instance"], partitionDict["report"], extractDate, os.path.join(directory, i)] for i in fileNameList if i.endswith(".parquet")]
+    fileList.sort(key = lambda i: [i[2], os.path.basename(i[3]), i[0], i[1]])
+    if(latestOnly):
+        fileList = list(collections.OrderedDict([[(i[0], i[1]), i] for i in fileList]).values())
+    return fileList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to open a snapshot as a memory mapped pyarrow table, with the strings kept dictionary encoded, so only the pages that are read are paged in
+#    fileName <String>: The snapshot file (see snapshotFiles)
+#    columnList <List>: The columns to read (default: None for all)
+def readSnapshot(fileName, columnList = None):
+    if(not moduleAvailable("pyarrow")):
+        raise ImportError("The snapshot archive needs pyarrow (pip install pyarrow)")
+    schema = pyarrow.parquet.read_schema(fileName, memory_map = True)
+    return pyarrow.parquet.read_table(fileName, columns = columnList, memory_map = True,
+                                      read_dictionary = [i.name for i in schema if pyarrow.types.is_string(i.type) and (columnList is None or i.name in columnList)])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to yield a snapshot as ReportBatches (one per row group, the chunks it was written in), ready for mapColumns and the loaders.
+#         Dictionary encoded strings are decoded once per distinct value. Dates come back as python datetimes and nulls as None.
+#    fileName <String>: The snapshot file (see snapshotFiles)
+#    columnList <List>: The columns to read (default: None for all)
+def snapshotBatches(fileName, columnList = None):
+    snapshotTable = readSnapshot(fileName, columnList)
+    for recordBatch in snapshotTable.to_batches():
+        yield arrowReportBatch(recordBatch)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the pyarrow schema a ReportBatch is stored with: date columns (and datetime constants) are timestamps and everything else is a string
+#    batch <ReportBatch>: The batch
+#    dateColumnList <List>: The columns that hold dates (eg the columns of dateMaskList)
+#    metadataDict <dictionary>: String values to keep in the schema metadata (default: None)
+def batchArrowSchema(batch, dateColumnList, metadataDict = None):
+    fieldList = []
+    for i in batch.columnList:
+        isDate = i in dateColumnList or isinstance(batch.constantValues.get(i), datetime.datetime)
+        fieldList += [pyarrow.field(i, ifEquals(isDate, True, pyarrow.timestamp("us"), pyarrow.string()))]
+    return pyarrow.schema(fieldList, metadata = metadataDict)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn the rows of a ReportBatch that pass its filters into a pyarrow table with a schema (see batchArrowSchema).
+#         Columns of the schema the batch does not have are null, and values that do not fit the column type are stored as strings.
+#    batch <ReportBatch>: The batch
+#    schema <pyarrow schema>: The schema of the table
+def batchArrowTable(batch, schema):
+    arrayList = []
+    for i in schema.names:
+        values = batch.columnValues(i) if i in batch.columnList else np.full(len(batch), None, dtype = object)
+        fieldType = schema.field(i).type
+        try:
+            arrayList += [pyarrow.array(values, type = fieldType)]
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            arrayList += [pyarrow.array([j if j is None or isinstance(j, (str, datetime.datetime)) else str(j) for j in values], type = fieldType)]
+    return pyarrow.Table.from_arrays(arrayList, schema = schema)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn a pyarrow record batch back into a ReportBatch. Dictionary encoded strings are decoded once per distinct value.
+#         Dates come back as python datetimes and nulls as None.
+#    recordBatch <pyarrow RecordBatch>: The record batch (or a table without dictionary columns)
+def arrowReportBatch(recordBatch):
+    columnArrayList = []
+    for i in recordBatch.columns:
+        columnArray = np.empty(len(i), dtype = object)
+        if(pyarrow.types.is_dictionary(i.type)):
+            dictionaryValues = np.empty(len(i.dictionary), dtype = object)
+            dictionaryValues[:] = i.dictionary.to_pylist()
+            columnArray[:] = dictionaryValues[i.indices.fill_null(0).to_numpy(zero_copy_only = False)]
+            columnArray[i.is_null().to_numpy(zero_copy_only = False)] = None
+        else:
+            columnArray[:] = i.to_pylist()
+        columnArrayList += [columnArray]
+    return ReportBatch(recordBatch.schema.names, columnArrayList)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to load archived snapshots into a table through a column mapping list, without going to salesforce,
+#         eg to rebuild OPPORTUNITY_HISTORY with a new mapping: loadSnapshots("OPPORTUNITY_HISTORY", snapshotFiles("Good", "00O16000007gKx8"), goodHistoryColumnList)
+#         Each snapshot batch is inserted with oracleBulkInsert (and committed) on its own.
+#    tableName <String>: The table to insert into (it must exist)
+#    fileList <2D List>: The snapshots to load (from snapshotFiles)
+#    columnList <2D List>: The list of [target column, source column] to map together (see appendTableList)
+#    batchSize <Number>: The number of rows to bind in each executemany (default: 5000)
+#    metrics <ImportMetrics>: The metrics to record the load in (default: None to record and write its own run log entry)
+#Returns: A 2D list of the rows Oracle rejected as [batch number, offset in batch, row offset, error message]
+def loadSnapshots(tableName, fileList, columnList, batchSize = 5000, metrics = None):
+    ownMetrics = metrics is None
+    if(ownMetrics):
+        metrics = ImportMetrics(tableName, "loadSnapshots")
+    errorList = []
+    rowOffset = 0
+    sourceColumnList = list(collections.OrderedDict.fromkeys([i[1] for i in columnList if indexExists(i, 1) and i[1] != ""]))
+    try:
+        for i in fileList:
+            snapshotColumnList = pyarrow.parquet.read_schema(i[3]).names
+            for batch in metrics.timedIterator(snapshotBatches(i[3], [j for j in sourceColumnList if j in snapshotColumnList]), "parse"):
+                with metrics.stage("load"):
+                    chunkErrorList = oracleBulkInsert(batch.mapColumns(columnList), tableName, {}, batchSize, rowOffset)
+                errorList += chunkErrorList
+                metrics.addCount("rows", len(batch))
+                metrics.addCount("chunks")
+                metrics.addCount("rejectedRows", len(chunkErrorList))
+                rowOffset += len(batch)
+    except Exception:
+        if(ownMetrics):
+            metrics.finish("failed").write()
+        raise
+    if(ownMetrics):
+        metrics.finish().write()
+    return errorList
+
+snapshotDirectory = "snapshotArchive"
+snapshotCompression = "zstd"
+
+#Date Created: 2016-03-07
+#Last Editted: 2016-03-16
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2.1
+#Change Notes:
+#     2016-03-16: allowed for the possiblity of adding a list (V1 - V2)
+#     2016-07-28: allow adding column to start or end (V12 - V2.1)
+#Purpose: The purpose of this function to add a 'column' to a list with the option of adding a header if the list is setup like a table.
+#    baseList <2D list>: a list of multiple dimensions
+#    columnName <Sting>: The heading element for the new column. To add the same value to the entire list, put the same value here.
+#    columnValue <Value>: a value (string, int etc) to be added to the list
+#    columnValueList <boolean>: if true, allow the addition of a list rather than a default value. (default = False)
+#    end <boolean>: If true, add the column to the end, else the start (default = True)
+#Tests:
+#    listAddColumn ([["a","b","c"],[1,2,3],[3,4,5],[5,6,7]], "d",0, end = False) = [['d', 'a', 'b', 'c'], [0, 1, 2, 3], [0, 3, 4, 5], [0, 5, 6, 7]]
+def listAddColumn (baseList, columnName, columnValue, columnValueList = False, end = True):
+    newBaseList = []
+    for i in range(0,len(baseList)):
+        if(i == 0):
+            if(end):
+                newBaseList += [baseList[0] + [columnName]]
+            else:
+                newBaseList += [[columnName] + baseList[0]]
+        else:
+            if(columnValueList):
+                if(end):
+                    newBaseList += [baseList[i] + [columnValue[i - 1]]]
+                else:
+                    newBaseList += [[columnValue[i - 1]] + baseList[i]]
+            else:
+                if(end):
+                    newBaseList += [baseList[i] + [columnValue]]
+                else:
+                    newBaseList += [[columnValue] + baseList[i]] 
+    return newBaseList
+
+#Date Created: 2015-11-06
+#Last Editted: 2016-05-27
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes: 
+#    2016-05-27: greatly simplified using str (V1 - V2)
+#Purpose: The purpose of this function is to convert a python datetime into a recognizable datetime format for Oracle (YYYY-MM-DD HH24:MI:SS)
+#    dateTime <datetime>: The date you want to convert
+def toSqlDateTime (dateTime):
+    return str(dateTime)[:19]    
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the time between two datetimes as a string of hours, minutes and seconds, with the total seconds
+#    startDateTime <datetime>: The start time
+#    endDateTime <datetime>: The end time
+#Tests:
+#    timeDifference(datetime.datetime(2016,1,1,0,0,0), datetime.datetime(2016,1,1,1,2,3)) = "01:02:03 (seconds: 3723)"
+def timeDifference(startDateTime, endDateTime):
+    seconds = int((endDateTime - startDateTime).total_seconds())
+    return ("%02d:%02d:%02d" % (seconds // 3600, seconds % 3600 // 60, seconds % 60)) + " (seconds: " + str(seconds) + ")"
+
+#Date Created: 2016-05-27
+#Last Editted: 2016-05-27
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes: 
+#    2016-05-27: greatly simplified using str (V1 - V2)
+#Purpose: The purpose of this function is to convert a string into a python datetime object
+#         While this isn't much of a change of the original functionality, this simplifies it's use with listFunction
+#    dateTime <datetime>: The date you want to convert
+def stringToDate(dateString, dateMask = "%Y-%m-%d %H:%M:%S"):
+    return datetime.datetime.strptime(dateString,dateMask)
+
+#Date Created: 2016-03-09
+#Last Editted: 2016-03-09
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to change the value into a list. If already a list, leave as is.
+#    value <any>: The value to turn into a list
+def listify (value):
+    try:
+        value.count(1)
+        return value
+    except:
+        return [value]
+    
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return a name with an identifier added, cut so it stays within the 30 characters of an oracle name
+#    element <String>: The name
+#    identifier <Number>: The identifier (0 for none)
+#Tests:
+#    uniqueNameCandidate("STAGE", 2) = 'STAGE2'
+def uniqueNameCandidate(element, identifier):
+    padding = ifEquals(identifier, 0, "", str(identifier))
+    if(len(element) + len(padding) > 30):
+        return element[:-(len(element + padding) - 30)] + padding
+    return element + padding
+
+#Date Created: 2016-03-07
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: Loops over the identifiers (see uniqueNameCandidate) instead of recursing (V1 - V2)
+#Purpose: The purpose of this function is to add an element to a list, and if it already exists, add an identifier
+#    baseList <1D List>: an existing list (or set)
+#    element <String>: An element to add to a list
+#    identifier=0 <Number>: The first identifier to try
+def addUniqueListElement (baseList, element, identifier=0):
+    while(uniqueNameCandidate(element, identifier) in baseList):
+        identifier += 1
+    return uniqueNameCandidate(element, identifier)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: The names are made unique against a set, each name carrying on from the last identifier it was given, and the columns are remembered
+#                 per header in headerColumnCache, so the runs, partitions and shards of a report reuse them (V1 - V1.1)
+#     2026-10-18: headerColumnCache is read and written under headerColumnCacheLock, since the jobs of importSalesForceToSqlConcurrent share it (V1.1 - V1.2)
+#Purpose: The purpose of this function is to turn the header of a report into the sql names of its columns, making sure the names will be unique
+#    headerRow <List>: The header of the report
+#Tests:
+#    reportColumnList(["Stage", "Stage", "Amount (converted)"]) = ['STAGE', 'STAGE1', 'AMOUNT_CONVERTED_']
+def reportColumnList(headerRow):
+    headerKey = tuple(headerRow)
+    with headerColumnCacheLock:
+        columnList = headerColumnCache.get(headerKey)
+    if(columnList is not None):
+        return list(columnList)
+    columnList = []
+    columnSet = set()
+    identifierDict = {}
+    for i in listFunction(headerRow, convertSQLNames):
+        identifier = identifierDict.get(i, 0)
+        while(uniqueNameCandidate(i, identifier) in columnSet):
+            identifier += 1
+        identifierDict[i] = identifier + 1
+        columnSet.add(uniqueNameCandidate(i, identifier))
+        columnList += [uniqueNameCandidate(i, identifier)]
+    with headerColumnCacheLock:
+        if(len(headerColumnCache) > headerColumnCacheSize):
+            headerColumnCache.clear()
+        headerColumnCache[headerKey] = columnList
+    return list(columnList)
+
+headerColumnCache = {}
+headerColumnCacheSize = 1000
+headerColumnCacheLock = threading.Lock()
+    
+#Date Created: 2016-04-01
+#Last Editted: 2016-04-01
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return a 2 dimensional list from a list of strings as a delimiter
+#    baseList <list>: the list to split
+#    delimiter <String>: The string to act as a delimiter for splitting (Default: "~~~")
+def splitListLoop(baseList, delimiter = "~~~"):
+    splitList = []
+    for i in baseList:
+        splitList += [i.split(delimiter)]
+    return splitList
+
+#Date Created: 2016-05-10
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.3
+#Change Notes:
+#     2026-10-18: Runs on a connection checked out of the oracle pool (V1 - V1.1)
+#     2026-10-18: The select list is built by mappingSelectList (V1.1 - V1.2)
+#     2026-10-18: The select is no longer in brackets, so the statement also runs against the sqlite benchmark sink (V1.2 - V1.3)
+#Purpose: The purpose of this function is to append the values from one table into another, specifying which columns map together
+#    table1 <String>: The table to insert into
+#    table2 <String>: The table to insert
+#    columnList <String>: The list of columns to map together
+def appendTableList(table1, table2, columnList):
+    with oracleConnection() as connection:
+        connection.cursor().execute("insert into " + table1 + "(" + columnListString(listColumn(columnList,0)) + 
+                ") select " + columnListString(mappingSelectList(columnList)) + " from " + table2)
+        connection.commit()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to turn a column mapping list (the splitListLoop blocks) into the select list for it: "source as target", or "null as target" when there is no source column
+#    columnList <2D List>: The list of [target column, source column] to map together
+#Tests:
+#    mappingSelectList([["A","B"],["C",""],["D"]]) = ['B as A', 'null as C', 'null as D']
+def mappingSelectList(columnList):
+    newList = []
+    for i in columnList:
+        if indexExists(i, 1):
+            if(i[1] == ""):
+                newList += ["null as " + i[0]]
+            else:
+                newList += [i[1] + " as " + i[0]]
+        else:
+            newList += ["null as " + i[0]]
+    return newList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: Open rows with no hash (appended before ROW_HASH was added, or by appendTableList or historyTableName) and open rows hashed by an earlier
+#                 rowHashExpression are hashed again first, so they are matched instead of closed and appended again (V1 - V1.1)
+#Purpose: The purpose of this function is to append several tables into a history table keeping only the rows that changed, instead of a full copy of every table on every run.
+#         Each mapped row is hashed (rowHashExpression) and compared with the open rows of the history (VALID_TO is null) with the same key:
+#             - open rows of the instances being loaded whose key and hash are no longer in the tables are closed (VALID_TO is set to the time of the run)
+#             - rows whose key and hash are not open yet (new or changed) are inserted with VALID_FROM set to the time of the run
+#         so an unchanged opportunity is stored once, and its rows as of any date are those with VALID_FROM <= date and (VALID_TO is null or VALID_TO > date).
+#         Both statements run in one transaction. A key may have several rows (eg one per product), each of them is versioned on its own.
+#         The ROW_HASH, VALID_FROM and VALID_TO columns (and an index on the key and hash) are added to the history table the first time.
+#         Open rows with no hash are hashed (see refreshRowHashes) before the changes are found, so a row that did not change is not appended again.
+#    table1 <String>: The history table to insert into
+#    tableMappingList <2D List>: The list of [table to insert, column mapping list (see appendTableList)]
+#    keyColumnList <List>: The (target) columns that identify an opportunity (default: ["OPPORTUNITY_ID","PY_INSTANCE"])
+#    hashExcludeList <List>: The (target) columns left out of the hash because they change on every run (default: ["PY_EXTRACTED_DATE_VALUE"])
+#    scopeColumn <String>: Only open rows with a value of this column that is being loaded can be closed, so loading one instance leaves the others open (default: "PY_INSTANCE")
+#    metrics <ImportMetrics>: The metrics to record the statements in as the postSql stage (default: None to record and write its own run log entry)
+def consolidateTableChanges(table1, tableMappingList, keyColumnList = ["OPPORTUNITY_ID","PY_INSTANCE"], hashExcludeList = ["PY_EXTRACTED_DATE_VALUE"],
+                            scopeColumn = "PY_INSTANCE", metrics = None):
+    ownMetrics = metrics is None
+    if(ownMetrics):
+        metrics = ImportMetrics(table1, "consolidateTableChanges")
+    columnList = listColumn(tableMappingList[0][1], 0)
+    selectList = []
+    for i in tableMappingList:
+        selectList += ["select " + columnListString(mappingSelectList(i[1])) + " from " + i[0]]
+    unionSql = columnListString(selectList, "", "", False, " union all ")
+    hashColumnList = [i for i in columnList if i not in hashExcludeList]
+    keySql = columnListString([i + " = h." + i for i in keyColumnList + ["ROW_HASH"]], "n.", "", False, " and ")
+    runDateTime = datetime.datetime.now().replace(microsecond = 0)
+    try:
+        with metrics.stage("postSql"):
+            columnTypeDict = prepareChangeHistory(table1, keyColumnList)
+            changeSql = ("select n.*, " + rowHashExpression(hashColumnList, "n.", columnTypeDict) + " as ROW_HASH from (" + unionSql + ") n")
+            with oracleConnection() as connection:
+                metrics.addCount("rehashedRows", refreshRowHashes(table1, hashColumnList, columnTypeDict, connection))
+                changeCursor = connection.cursor()
+                changeCursor.execute("update " + table1 + " h set VALID_TO = :1 where h.VALID_TO is null and h.ROW_HASH is not null" +
+                                     " and h." + scopeColumn + " in (select " + scopeColumn + " from (" + unionSql + "))" +
+                                     " and not exists (select 1 from (" + changeSql + ") n where " + keySql + ")", [runDateTime])
+                metrics.addCount("closedRows", max(changeCursor.rowcount, 0))
+                changeCursor.execute("insert /*+ APPEND */ into " + table1 + " (" + columnListString(columnList + ["ROW_HASH", "VALID_FROM", "VALID_TO"]) + ")" +
+                                     " select " + columnListString(columnList + ["ROW_HASH"], "n.") + ", :1, null from (" + changeSql + ") n" +
+                                     " where not exists (select 1 from " + table1 + " h where h.VALID_TO is null and " + keySql + ")", [runDateTime])
+                metrics.addCount("rows", max(changeCursor.rowcount, 0))
+                connection.commit()
+    except Exception:
+        if(ownMetrics):
+            metrics.finish("failed").write()
+        raise
+    if(ownMetrics):
+        metrics.finish().write()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: Each column is hashed with MD5 instead of the 32 bit ora_hash, so two values of a column that collide no longer hide a change.
+#                 Dates and numbers are written with fixed formats, so the hash does not depend on the session formats. (V1 - V2)
+#Purpose: The purpose of this function is to return the sql for a stable hash of a row, as 32 hex characters. Each column is written as text (dates as YYYY-MM-DD HH24:MI:SS
+#         and numbers with a '.' point, after a cast to the type of the history column, as the insert would) and hashed with MD5, or is N when it is null.
+#         The column hashes are joined in column order with commas and hashed with MD5 again. Hashing each column first keeps the text short however wide the columns are
+#         (a row of 4000 characters would overflow the concatenation), and each piece is 32 hex characters or N, so no value can run into the next.
+#    columnList <List>: The columns to hash, in order
+#    prefix <String>: The table alias to put in front of each column (eg "n.") (default: "")
+#    columnTypeDict <dictionary>: The oracle data type of each column (eg DATE or NUMBER, see prepareChangeHistory); other columns are hashed as text (default: {})
+#Tests:
+#    rowHashExpression(["A"]) = "rawtohex(standard_hash(nvl2(A, rawtohex(standard_hash(to_char(A), 'MD5')), 'N'), 'MD5'))"
+def rowHashExpression(columnList, prefix = "", columnTypeDict = {}):
+    hashList = []
+    for i in columnList:
+        if(columnTypeDict.get(i) == "DATE"):
+            textSql = "to_char(cast(" + prefix + i + " as date), 'YYYY-MM-DD HH24:MI:SS')"
+        elif(columnTypeDict.get(i) == "NUMBER"):
+            textSql = "to_char(cast(" + prefix + i + " as number), 'TM9', 'NLS_NUMERIC_CHARACTERS = ''.,''')"
+        else:
+            textSql = "to_char(" + prefix + i + ")"
+        hashList += ["nvl2(" + prefix + i + ", rawtohex(standard_hash(" + textSql + ", 'MD5')), 'N')"]
+    return "rawtohex(standard_hash(" + columnListString(hashList, "", "", False, " || ',' || ") + ", 'MD5'))"
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to hash the open rows of a history table that have no ROW_HASH (eg appended before the column was added, or by appendTableList),
+#         so consolidateTableChanges matches them instead of appending them again. When the first open row shows the hashes were made by an earlier rowHashExpression,
+#         every open row is hashed again. It is not committed.
+#    tableName <String>: The history table
+#    hashColumnList <List>: The columns that are hashed, in order
+#    columnTypeDict <dictionary>: The oracle data type of each column (see prepareChangeHistory)
+#    connection <cx_Oracle connection>: The connection (and transaction) to use
+#Returns: The number of rows hashed
+def refreshRowHashes(tableName, hashColumnList, columnTypeDict, connection):
+    hashSql = rowHashExpression(hashColumnList, "h.", columnTypeDict)
+    hashCursor = connection.cursor()
+    hashCursor.execute("select h.ROW_HASH, " + hashSql + " from " + tableName + " h where h.VALID_TO is null and h.ROW_HASH is not null fetch first 1 rows only")
+    row = hashCursor.fetchone()
+    staleSql = ifEquals(row is not None and row[0] != row[1], True, "h.ROW_HASH is not null or ", "")
+    hashCursor.execute("update " + tableName + " h set ROW_HASH = " + hashSql + " where h.VALID_TO is null and (" + staleSql + "h.ROW_HASH is null)")
+    return max(hashCursor.rowcount, 0)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: Returns the data type of each column, for rowHashExpression (V1 - V1.1)
+#Purpose: The purpose of this function is to add the change detection columns (ROW_HASH, VALID_FROM, VALID_TO) to a history table, and an index on the key and hash
+#         for the lookups of consolidateTableChanges, when they are not there yet
+#    tableName <String>: The history table
+#    keyColumnList <List>: The columns that identify an opportunity
+#Returns: A dictionary of column name to oracle data type (eg VARCHAR2, NUMBER or DATE)
+def prepareChangeHistory(tableName, keyColumnList):
+    with oracleConnection() as connection:
+        prepareCursor = connection.cursor()
+        prepareCursor.execute("select column_name, data_type from user_tab_columns where table_name = upper(:1)", [tableName])
+        columnTypeDict = dict(prepareCursor.fetchall())
+        existingColumnList = list(columnTypeDict.keys())
+        newColumnList = [i + " " + j for i, j in [["ROW_HASH", "VARCHAR2(32)"], ["VALID_FROM", "DATE"], ["VALID_TO", "DATE"]] if i not in existingColumnList]
+        if(newColumnList != []):
+            prepareCursor.execute("alter table " + tableName + " add (" + columnListString(newColumnList) + ")")
+        prepareCursor.execute("select count(*) from user_indexes where index_name = upper(:1)", [tableName[:22] + "_ROWHASH"])
+        if(prepareCursor.fetchone()[0] == 0):
+            prepareCursor.execute("create index " + tableName[:22] + "_ROWHASH on " + tableName + " (" + columnListString(keyColumnList + ["ROW_HASH", "VALID_TO"]) + ")")
+    return columnTypeDict
+    
+#Date Created: 2016-03-09
+#Last Editted: 2016-03-09
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return a comma seperated list of the input values
+#    columnList <List>: The list of values to separate
+#    prefix <String>: The value to add to the beginning of the strings (Default = "")
+#    suffix <String>: The value to add to the end of the strings (Default = "")
+#    finalComma <Boolean>: Choose False to not include the final delimiter, True to include. (Default = False)
+#    delimiter <String>: Choose what delimiter you want between the values. (Default = ", ")
+def columnListString (columnList, prefix = "", suffix = "", finalComma = False, delimiter = ", "):
+    finalString = ""
+    if(finalComma):
+        for i in range(0, len(columnList)):
+            padding = delimiter
+            finalString += prefix + columnList[i] + suffix + padding
+    else:
+        for i in range(0, len(columnList)):
+            padding = delimiter
+            if (i == len(columnList) - 1):
+                padding = ""
+            finalString += prefix + columnList[i] + suffix + padding
+    return finalString
+
+#Date Created: 2016-05-10
+#Last Editted: 2016-05-10
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return a specified column in a list
+#    baseList <List>: The list
+#    index <number>: The index in the list to return values for
+#    default <value>: The default value to return in the value at an index does not exist.
+def listColumn(baseList, index, default = ""):
+    newList = []
+    for i in baseList:
+        if indexExists(i, index):
+            newList += [i[index]]
+        else:
+            newList += [default]
+    return newList
+
+#Date Created: 2016-05-10
+#Last Editted: 2016-05-10
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to find the indexes for the string dates to change into python date objects*
+#    dateMastList <2D String List>: A list with column names and python object date masks
+#    orderedDict <ordered dictionary>: The ordered dictionary that will be used with sqlAlchemy
+def dateMaskListIndex(dateMaskList, orderedDict):
+    newList = []
+    for i in dateMaskList:
+        for j, k in enumerate(list(orderedDict)):
+            if(i[0] == k):
+                newList += [i + [j]]
+    return newList
+
+#Date Created: 2016-05-10
+#Last Editted: 2016-05-10
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to filter a 2D list for only the rows that contain or do not contain a string*
+#    dataList <2D String List>: A 2 dimensional list
+#    index <number>: the index in the list to search the string for
+#    baseString <String>: the string to search for
+#    include <Boolean>: if the string is found, include or exclude the row based on this value (default = True to include)
+def matrixStringFilter (dataList, index, baseString, include = True):
+    newList = []
+    for i in dataList:
+        if (i[index].find(baseString) == -1 and not(include) or 
+            i[index].find(baseString) != -1 and include):
+            newList += [i]
+    return newList
+
+#Date Created: 2016-05-10
+#Last Editted: 2016-05-10
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is return true or false based on if an index exists for a list
+#    baseList <list>: A 2 dimensional list
+#    index <number>: the index to see if it exists
+def indexExists(baseList, index):
+    try:
+        a = baseList[index]
+        return True
+    except:
+        return False
+
+#Date Created: 2015-09-15
+#Last Editted: 2015-09-15
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is return true or false based on if an value is an integer (or chosen otherwise)
+#    value <any>: any value, typically string
+#    function <number>: the number function to use as a criteria
+def isNumber(value, function = "int"):
+    try:
+        exec(function + "(value)")
+        return True
+    except ValueError:
+        return False
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to hold a chunk of a report as columns (one numpy buffer per column) rather than a 2 dimensional list of rows,
+#         so that the transform steps do not copy the whole table each time.
+#         Constant columns (eg PY_DATA_SOURCE) are stored once as a value, and filters only update a row mask. Rows are only built when the loader asks for them.
+#    columnList <List>: The column names, in order
+#    columnArrayList <List>: One numpy array (or list) per column, all the same length
+#Tests:
+#    ReportBatch.fromRows(["a","b"],[["1 2","x"],["3","y"]]).filterString("a"," ",False).addConstantColumn("c",0).rowTuples() = [('3', 'y', 0)]
+class ReportBatch:
+    def __init__(self, columnList, columnArrayList):
+        self.columnList = list(columnList)
+        self.columnArrays = collections.OrderedDict()
+        self.constantValues = {}
+        self.rowMask = None
+        self.rowCount = 0
+        for i, j in zip(self.columnList, columnArrayList):
+            self.columnArrays[i] = np.asarray(j, dtype = object)
+            self.rowCount = len(self.columnArrays[i])
+
+    #Purpose: Build a batch from a header and a 2 dimensional list of rows. Short rows are padded with "".
+    #    columnList <List>: The column names
+    #    rowList <2D List>: The rows, without the header
+    @classmethod
+    def fromRows(cls, columnList, rowList):
+        columnArrayList = []
+        for j in range(0, len(columnList)):
+            columnArray = np.empty(len(rowList), dtype = object)
+            columnArray[:] = [i[j] if j < len(i) else "" for i in rowList]
+            columnArrayList += [columnArray]
+        return cls(columnList, columnArrayList)
+
+    def __len__(self):
+        if(self.rowMask is None):
+            return self.rowCount
+        return int(self.rowMask.sum())
+
+    #Purpose: Add a column that has the same value on every row. This only stores the value.
+    #    columnName <String>: The heading for the new column
+    #    columnValue <Value>: The value for every row
+    def addConstantColumn(self, columnName, columnValue):
+        if(columnName not in self.columnList):
+            self.columnList += [columnName]
+        self.columnArrays.pop(columnName, None)
+        self.constantValues[columnName] = columnValue
+        return self
+
+    #Purpose: Replace (or add) a column with a buffer that covers every row of the batch, including rows that are masked out.
+    #    columnName <String>: The heading for the column
+    #    columnArray <numpy array or list>: The values, one per row
+    def setColumn(self, columnName, columnArray):
+        if(columnName not in self.columnList):
+            self.columnList += [columnName]
+        self.constantValues.pop(columnName, None)
+        self.columnArrays[columnName] = np.asarray(columnArray, dtype = object)
+        return self
+
+    #Purpose: The equivalent of matrixStringFilter. Only the row mask is updated, the column buffers are untouched.
+    #    columnName <String>: The column to search the string for
+    #    baseString <String>: The string to search for
+    #    include <Boolean>: if the string is found, include or exclude the row based on this value (default = True to include)
+    def filterString(self, columnName, baseString, include = True):
+        found = np.fromiter((baseString in i for i in self.columnValues(columnName, masked = False)), dtype = bool, count = self.rowCount)
+        return self.filterMask(found if include else ~found)
+
+    #Purpose: Keep only the rows where rowMask is True (combined with any earlier filter)
+    #    rowMask <numpy boolean array>: One flag per row of the batch
+    def filterMask(self, rowMask):
+        if(self.rowMask is None):
+            self.rowMask = np.asarray(rowMask, dtype = bool)
+        else:
+            self.rowMask = self.rowMask & rowMask
+        return self
+
+    #Purpose: Apply a function to every value of one column (the equivalent of listFunction with tableType = True, but only the one column is rebuilt)
+    #    columnName <String>: The column to apply the function to
+    #    function <function>: The function to apply
+    #    parameters <List>: The extra parameters for the function
+    def applyColumnFunction(self, columnName, function, parameters = []):
+        if(columnName in self.constantValues):
+            self.constantValues[columnName] = tryFunction(function, listify(self.constantValues[columnName]) + parameters, self.constantValues[columnName])
+        elif(columnName in self.columnArrays):
+            columnArray = np.empty(self.rowCount, dtype = object)
+            columnArray[:] = [tryFunction(function, [i] + parameters, i) for i in self.columnArrays[columnName]]
+            self.columnArrays[columnName] = columnArray
+        return self
+
+    #Purpose: Return the values of a column for the rows that pass the filters (masked = False returns every row)
+    #    columnName <String>: The column to return
+    #    masked <Boolean>: Apply the row mask (default = True)
+    def columnValues(self, columnName, masked = True):
+        if(columnName in self.constantValues):
+            return np.full(len(self) if masked else self.rowCount, self.constantValues[columnName], dtype = object)
+        if(masked and self.rowMask is not None):
+            return self.columnArrays[columnName][self.rowMask]
+        return self.columnArrays[columnName]
+
+    #Purpose: Return a new batch with the columns renamed and arranged by a column mapping list (the splitListLoop blocks), the same as appendTableList does in sql.
+    #         The column buffers and row mask are shared with this batch, so nothing is copied. Target columns with no source column are null.
+    #    columnList <2D List>: The list of [target column, source column] to map together
+    def mapColumns(self, columnList):
+        mappedBatch = ReportBatch([], [])
+        mappedBatch.rowCount = self.rowCount
+        mappedBatch.rowMask = self.rowMask
+        for i in columnList:
+            sourceColumn = i[1] if indexExists(i, 1) else ""
+            if(sourceColumn in self.constantValues):
+                mappedBatch.addConstantColumn(i[0], self.constantValues[sourceColumn])
+            elif(sourceColumn in self.columnArrays):
+                mappedBatch.columnList += [i[0]]
+                mappedBatch.columnArrays[i[0]] = self.columnArrays[sourceColumn]
+            else:
+                mappedBatch.addConstantColumn(i[0], None)
+        return mappedBatch
+
+    #Purpose: Return the positions of the rows that pass the filters
+    def rowIndexes(self):
+        if(self.rowMask is None):
+            return np.arange(self.rowCount)
+        return np.flatnonzero(self.rowMask)
+
+    #Purpose: Build the rows that pass the filters as a list of tuples in column order, ready for executemany
+    #    start <Number>: The first filtered row to return (default = 0)
+    #    stop <Number>: The filtered row to stop before (default = None for all)
+    #    nullEmpty <Boolean>: If true, empty strings are returned as None (Oracle treats them as null anyway, and typed binds reject them) (default = False)
+    def rowTuples(self, start = 0, stop = None, nullEmpty = False):
+        indexes = self.rowIndexes()[start:stop]
+        columnValueList = []
+        for i in self.columnList:
+            if(i in self.constantValues):
+                columnValueList += [[ifEquals(self.constantValues[i], "", None, self.constantValues[i]) if nullEmpty else self.constantValues[i]] * len(indexes)]
+            else:
+                columnArray = self.columnArrays[i][indexes]
+                if(nullEmpty):
+                    columnArray[columnArray == ""] = None
+                columnValueList += [columnArray]
+        return list(zip(*columnValueList))
+
+    #Purpose: Yield the rows that pass the filters as lists of tuples of at most batchSize rows
+    #    batchSize <Number>: The number of rows in each list
+    #    nullEmpty <Boolean>: If true, empty strings are returned as None (default = False)
+    def iterRowBatches(self, batchSize, nullEmpty = False):
+        for i in range(0, len(self), batchSize):
+            yield self.rowTuples(i, i + batchSize, nullEmpty)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to convert the date columns of a ReportBatch to datetime objects in one pass per column, instead of calling stringToDate on every cell.
+#         Each column is factorized so every distinct string is parsed once (with pandas and the column's format), and the parsed strings are remembered in dateParseCache
+#         between chunks and reports, since the same dates repeat heavily. Values that cannot be parsed become None rather than staying as strings.
+#    batch <ReportBatch>: The batch to convert
+#    dateMaskList <2d String List>: the 2d list (column name, python datetime object mask) of the columns to convert
+#Returns: A dictionary of column name to a numpy boolean array (one per row of the batch) that is True where the value is null after the conversion
+#Tests:
+#    convertDateColumns(ReportBatch.fromRows(["d"],[["01/05/2016"],["bad"],[""]]),[["d","%m/%d/%Y"]])["d"] = array([False,  True,  True])
+def convertDateColumns(batch, dateMaskList):
+    nullMaskDict = {}
+    for i in dateMaskList:
+        if(i[0] in batch.constantValues):
+            if(not isinstance(batch.constantValues[i[0]], datetime.datetime)):
+                batch.constantValues[i[0]] = parseDateValues([batch.constantValues[i[0]]], i[1])[0]
+            nullMaskDict[i[0]] = np.full(batch.rowCount, batch.constantValues[i[0]] is None)
+        elif(i[0] in batch.columnArrays):
+            codeArray, uniqueValues = pd.factorize(batch.columnArrays[i[0]])
+            parsedValues = np.empty(len(uniqueValues) + 1, dtype = object)
+            parsedValues[:-1] = parseDateValues(uniqueValues, i[1])
+            # factorize codes missing values as -1, which picks the None on the end
+            columnArray = parsedValues[codeArray]
+            batch.setColumn(i[0], columnArray)
+            nullMaskDict[i[0]] = np.equal(columnArray, None)
+    return nullMaskDict
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The result is built from the values parsed for this call, and the cache is read, cleared and added to under dateParseCacheLock,
+#                 so another thread clearing the cache can no longer turn dates into None (V1 - V1.1)
+#Purpose: The purpose of this function is to parse a list of distinct date strings with one format, using dateParseCache for the strings seen before.
+#         Values that are already dates are kept, anything that cannot be parsed is returned as None.
+#    valueList <List>: The values to parse
+#    dateMask <String>: The python datetime mask (eg %m/%d/%Y)
+def parseDateValues(valueList, dateMask):
+    stringSet = set([i for i in valueList if isinstance(i, str)])
+    with dateParseCacheLock:
+        cacheDict = dateParseCache.setdefault(dateMask, {})
+        if(len(cacheDict) > dateParseCacheSize):
+            cacheDict.clear()
+        parsedDict = {i: cacheDict[i] for i in stringSet if i in cacheDict}
+    newValueList = [i for i in stringSet if i not in parsedDict]
+    if(newValueList != []):
+        parsedSeries = pd.to_datetime(pd.Series(newValueList, dtype = object), format = dateMask, errors = 'coerce')
+        newParsedDict = {}
+        for i, j in zip(newValueList, parsedSeries):
+            newParsedDict[i] = None if pd.isnull(j) else j.to_pydatetime()
+        parsedDict.update(newParsedDict)
+        with dateParseCacheLock:
+            cacheDict.update(newParsedDict)
+    return [i if isinstance(i, datetime.datetime) else parsedDict.get(i) for i in valueList]
+
+dateParseCache = {}
+dateParseCacheSize = 100000
+dateParseCacheLock = threading.Lock()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: save writes a temporary file and swaps it in with os.replace (V1 - V1.1)
+#     2026-10-18: A cache file that cannot be read or parsed is treated as empty, so the profiles are rebuilt instead of the load failing (V1.1 - V1.2)
+#Purpose: The purpose of this class is to infer narrow Oracle column types (NUMBER(p,s), DATE and VARCHAR2(n)) from the values of a report, instead of declaring everything VARCHAR.
+#         Every batch passed to observe widens a profile of each column (longest value, digits before and after the point, whether every value is a number or a date).
+#         The profile is kept per report in schemaCacheFile, so each run starts from the widest values seen before and the schema settles after the first few runs.
+#         Dates are only recognised once they are python dates, so observe the batch after convertDateColumns.
+#    reportIdentifier <String>: The report identifier the profile is cached under
+#    cacheFile <String>: The json file the profiles are kept in (default: None for schemaCacheFile)
+#Tests:
+#    ColumnTypeInference("test", "").observe(ReportBatch.fromRows(["a","b","c"],[["12.50","x","0012"]])).columnTypes(["a","b","c"])
+#        = OrderedDict([('a', NUMBER(precision=6, scale=2, asdecimal=True)), ('b', VARCHAR2(length=10)), ('c', VARCHAR2(length=10))])
+class ColumnTypeInference:
+    def __init__(self, reportIdentifier, cacheFile = None):
+        self.reportIdentifier = reportIdentifier
+        self.cacheFile = ifEquals(cacheFile, None, schemaCacheFile, cacheFile)
+        self.profileDict = {}
+        if(self.cacheFile != ""):
+            with schemaCacheLock:
+                self.profileDict = self.readCache().get(reportIdentifier, {})
+
+    #Purpose: Return the profiles of every report in the cache file, or an empty dictionary if it is missing, unreadable or not valid json
+    def readCache(self):
+        try:
+            with open(self.cacheFile, "r") as cacheFile:
+                cacheDict = json.load(cacheFile)
+        except (OSError, ValueError):
+            return {}
+        return ifEquals(isinstance(cacheDict, dict), True, cacheDict, {})
+
+    #Purpose: Widen the column profiles with the rows of a batch that pass its filters. Only the distinct values of each column are looked at.
+    #    batch <ReportBatch>: The batch to profile
+    def observe(self, batch):
+        for i in batch.columnList:
+            if(i in batch.constantValues):
+                self.observeValues(i, [batch.constantValues[i]])
+            else:
+                self.observeValues(i, pd.unique(batch.columnValues(i)))
+        return self
+
+    #Purpose: Widen the profile of one column with a list of values
+    #    columnName <String>: The column
+    #    valueList <List>: The values
+    def observeValues(self, columnName, valueList):
+        profile = self.profileDict.setdefault(columnName, {"length": 0, "number": True, "integerDigits": 0, "scale": 0, "date": True})
+        for i in valueList:
+            if(i is None or i == ""):
+                continue
+            if(isinstance(i, datetime.datetime)):
+                profile["length"] = max(profile["length"], 19)
+                profile["number"] = False
+                continue
+            i = str(i)
+            profile["length"] = max(profile["length"], len(i))
+            profile["date"] = False
+            numberMatch = numberPattern.match(i)
+            if(profile["number"] and numberMatch):
+                profile["integerDigits"] = max(profile["integerDigits"], len(numberMatch.group(1).lstrip("0")))
+                profile["scale"] = max(profile["scale"], len(numberMatch.group(2) or ""))
+            else:
+                profile["number"] = False
+
+    #Purpose: Return the sqlAlchemy type for a column from its profile. A column with no values yet is a small VARCHAR2.
+    #    columnName <String>: The column
+    def columnType(self, columnName):
+        profile = self.profileDict.get(columnName, {"length": 0, "number": False, "integerDigits": 0, "scale": 0, "date": False})
+        if(profile["length"] == 0):
+            return sqlalchemy.dialects.oracle.VARCHAR2(varcharRounding)
+        if(profile["date"]):
+            return sqlalchemy.types.DATE()
+        precision = profile["integerDigits"] + numberHeadroom + profile["scale"]
+        if(profile["number"] and precision <= 38):
+            return sqlalchemy.dialects.oracle.NUMBER(precision, profile["scale"])
+        if(profile["length"] > 4000):
+            return sqlalchemy.types.CLOB()
+        return sqlalchemy.dialects.oracle.VARCHAR2(min(4000, -(-profile["length"] // varcharRounding) * varcharRounding))
+
+    #Purpose: Return an ordered dictionary of column name to sqlAlchemy type, in the same form as the hand written columnTypeOrderedDict blocks
+    #    columnList <List>: The columns, in order
+    def columnTypes(self, columnList):
+        return collections.OrderedDict([[i, self.columnType(i)] for i in columnList])
+
+    #Purpose: Write the profiles of this report back to the cache file, keeping the profiles of the other reports
+    def save(self):
+        if(self.cacheFile == ""):
+            return
+        with schemaCacheLock:
+            cacheDict = self.readCache()
+            cacheDict[self.reportIdentifier] = self.profileDict
+            # Write a new file and swap it in, so a run that stops part way never leaves the cache half written
+            with open(self.cacheFile + ".tmp", "w") as cacheFile:
+                json.dump(cacheDict, cacheFile, indent = 1, sort_keys = True)
+            os.replace(self.cacheFile + ".tmp", self.cacheFile)
+
+schemaCacheFile = "reportSchemaCache.json"
+schemaCacheLock = threading.Lock()
+numberPattern = re.compile(r"^[-+]?(?=\.?[0-9])((?:0|[1-9][0-9]*)?)(?:\.([0-9]+))?$")
+numberHeadroom = 2
+varcharRounding = 10
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to convert the columns of a ReportBatch that are typed as numbers to Decimal, so they bind as numbers rather than strings.
+#         Each distinct value is converted once. Values that are not numbers are left as they are (Oracle rejects the row and the loader reports it).
+#    batch <ReportBatch>: The batch to convert
+#    columnTypeOrderedDict <ordered dictionary>: The sqlAlchemy column types
+def convertNumberColumns(batch, columnTypeOrderedDict):
+    for i in batch.columnList:
+        columnType = columnTypeOrderedDict.get(i)
+        if(not (isinstance(columnType, sqlalchemy.types.Numeric) or isinstance(columnType, type) and issubclass(columnType, sqlalchemy.types.Numeric))):
+            continue
+        if(i in batch.constantValues):
+            batch.constantValues[i] = tryFunction(decimal.Decimal, [batch.constantValues[i]], batch.constantValues[i])
+        elif(i in batch.columnArrays):
+            codeArray, uniqueValues = pd.factorize(batch.columnArrays[i])
+            convertedValues = np.empty(len(uniqueValues) + 1, dtype = object)
+            convertedValues[:-1] = [j if j == "" else tryFunction(decimal.Decimal, [j], j) for j in uniqueValues]
+            batch.setColumn(i, convertedValues[codeArray])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 2
+#Change Notes:
+#     2026-10-18: A column is only altered to a type that holds both its current and its inferred values (see widerColumnType), so a table created wider
+#                 (eg by hand, or by another report appending to it) is never narrowed. An alter that fails is counted in metrics and warned about. (V1 - V2)
+#Purpose: The purpose of this function is to widen the columns of an existing oracle table whose inferred type has grown (a longer VARCHAR2 or a bigger NUMBER).
+#         Columns that changed kind (eg NUMBER to VARCHAR2) cannot be altered once they hold data; those rows are rejected by the loader and the next run creates the wider type.
+#    tableName <String>: The table to alter
+#    oldTypeDict <ordered dictionary>: The column types the table has (eg from tableColumnTypes)
+#    newTypeDict <ordered dictionary>: The column types now inferred
+#    metrics <ImportMetrics>: The metrics to count the alters that failed in, as widenFailures (default: None)
+#Returns: The column types the table has after the alter
+def widenColumnTypes(tableName, oldTypeDict, newTypeDict, metrics = None):
+    oracleDialect = sqlalchemy.dialects.oracle.dialect()
+    tableTypeDict = collections.OrderedDict(newTypeDict)
+    with oracleConnection() as connection:
+        for i, j in newTypeDict.items():
+            if(i not in oldTypeDict):
+                continue
+            tableTypeDict[i] = oldTypeDict[i]
+            widerType = widerColumnType(oldTypeDict[i], j)
+            if(widerType is None or widerType.compile(dialect = oracleDialect) == oldTypeDict[i].compile(dialect = oracleDialect)):
+                continue
+            try:
+                connection.cursor().execute("alter table " + tableName + " modify (" + i + " " + widerType.compile(dialect = oracleDialect) + ")")
+                tableTypeDict[i] = widerType
+            except cx_Oracle.DatabaseError as e:
+                if(isConnectionLost(e)):
+                    raise
+                if(metrics is not None):
+                    metrics.addCount("widenFailures")
+                warnings.warn("Could not widen " + tableName + "." + i + " to " + widerType.compile(dialect = oracleDialect) + ": " + str(e).strip())
+    return tableTypeDict
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the narrowest column type that holds the values of two column types of the same kind, or None when the kinds differ
+#         (eg NUMBER and VARCHAR2). A NUMBER keeps the most integer digits and the largest scale of the two, and one with no precision holds any number.
+#    oldType <sqlAlchemy type>: The type of the column
+#    newType <sqlAlchemy type>: The type inferred for its values
+#Tests:
+#    widerColumnType(sqlalchemy.dialects.oracle.NUMBER(5, 2), sqlalchemy.dialects.oracle.NUMBER(4, 0)) = NUMBER(precision=6, scale=2, asdecimal=True)
+#    widerColumnType(sqlalchemy.dialects.oracle.VARCHAR2(100), sqlalchemy.dialects.oracle.VARCHAR2(20)) = VARCHAR2(length=100)
+def widerColumnType(oldType, newType):
+    oracleDialect = sqlalchemy.dialects.oracle.dialect()
+    oldKind = oldType.compile(dialect = oracleDialect).split("(")[0]
+    if(oldKind != newType.compile(dialect = oracleDialect).split("(")[0]):
+        return None
+    if(oldKind == "VARCHAR2"):
+        return sqlalchemy.dialects.oracle.VARCHAR2(max(oldType.length, newType.length))
+    if(oldKind != "NUMBER"):
+        return oldType
+    if(oldType.precision is None or newType.precision is None):
+        return sqlalchemy.dialects.oracle.NUMBER()
+    scale = max(oldType.scale or 0, newType.scale or 0)
+    precision = max(oldType.precision - (oldType.scale or 0), newType.precision - (newType.scale or 0)) + scale
+    if(precision > 38):
+        return sqlalchemy.dialects.oracle.NUMBER()
+    return sqlalchemy.dialects.oracle.NUMBER(precision, scale)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to create the table for a ReportBatch with sqlAlchemy, following the pandas if_exists parameter, and return the sqlAlchemy table
+#    batch <ReportBatch>: The batch that will be inserted (for the column names)
+#    tableName <String>: The name of the table to create
+#    columnTypeOrderedDict <ordered dictionary>: The sqlAlchemy column types. Columns that are not in the dictionary are created as Text.
+#    ifExists <String>: replace, append or fail (default: 'append')
+#    engine <sqlAlchemy engine>: The engine to use (default: None for engineSqlAlchemy)
+def createBatchTable(batch, tableName, columnTypeOrderedDict, ifExists = 'append', engine = None):
+    if(engine is None):
+        engine = engineSqlAlchemy
+    table = sqlalchemy.schema.Table(tableName, sqlalchemy.schema.MetaData(),
+                                    *[sqlalchemy.schema.Column(i, columnTypeOrderedDict.get(i, sqlalchemy.types.Text)) for i in batch.columnList])
+    if(ifExists == 'replace'):
+        table.drop(engine, checkfirst = True)
+    elif(ifExists == 'fail' and sqlalchemy.inspect(engine).has_table(tableName)):
+        raise ValueError("Table " + tableName + " already exists.")
+    table.create(engine, checkfirst = True)
+    return table
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: table creation moved to createBatchTable (V1 - V1.1)
+#Purpose: The purpose of this function is to send a ReportBatch to sql with sqlAlchemy executemany inserts, without building a dataframe
+#    batch <ReportBatch>: The batch to insert
+#    tableName <String>: The name of the table to create and/or insert to
+#    columnTypeOrderedDict <ordered dictionary>: The sqlAlchemy column types. Columns that are not in the dictionary are created as Text.
+#    ifExists <String>: replace, append or fail, the same as the pandas if_exists parameter (default: 'append')
+#    batchSize <Number>: The number of rows to send in each executemany (default: 5000)
+#    engine <sqlAlchemy engine>: The engine to use (default: None for engineSqlAlchemy)
+def batchToSql(batch, tableName, columnTypeOrderedDict, ifExists = 'append', batchSize = 5000, engine = None):
+    if(engine is None):
+        engine = engineSqlAlchemy
+    table = createBatchTable(batch, tableName, columnTypeOrderedDict, ifExists, engine)
+    with engine.begin() as connection:
+        for rowList in batch.iterRowBatches(batchSize):
+            connection.execute(table.insert(), [dict(zip(batch.columnList, i)) for i in rowList])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: String columns that hold python dates in the batch (eg a date mask on a VARCHAR column) bind as DATETIME, so Oracle converts them as it did before (V1 - V1.1)
+#Purpose: The purpose of this function is to turn the sqlAlchemy column types into the cx_Oracle setinputsizes parameters, so every batch binds with the same buffer sizes
+#         VARCHAR(n) binds as a string of n, dates as DATETIME and numbers as NUMBER. Anything else (eg Text) is left for cx_Oracle to decide (None).
+#    columnList <List>: The column names, in insert order
+#    columnTypeOrderedDict <ordered dictionary>: The sqlAlchemy column types
+#    batch <ReportBatch>: The batch that will be bound, used to find string columns holding dates (default: None)
+def oracleInputSizes(columnList, columnTypeOrderedDict, batch = None):
+    inputSizeList = []
+    for i in columnList:
+        columnType = columnTypeOrderedDict.get(i)
+        if(isinstance(columnType, type)):
+            columnType = columnType()
+        if(isinstance(columnType, (sqlalchemy.types.Date, sqlalchemy.types.DateTime))):
+            inputSizeList += [cx_Oracle.DATETIME]
+        elif(isinstance(columnType, sqlalchemy.types.Numeric)):
+            inputSizeList += [cx_Oracle.NUMBER]
+        elif(batch is not None and any(isinstance(j, datetime.datetime) for j in batch.columnValues(i)[:100])):
+            inputSizeList += [cx_Oracle.DATETIME]
+        elif(isinstance(columnType, sqlalchemy.types.String) and columnType.length is not None):
+            inputSizeList += [columnType.length]
+        else:
+            inputSizeList += [None]
+    return inputSizeList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: Added commit, so the insert can share a transaction with other work (eg oracleCheckpointInsert) (V1 - V1.1)
+#Purpose: The purpose of this function is to insert a ReportBatch into an existing Oracle table with cx_Oracle array binding (executemany) and commit it.
+#         Rows that Oracle rejects do not stop the load; they are returned as a 2D list of [batch number, offset in batch, row offset, error message].
+#         Without a connection, one is checked out of the pool. If that connection is lost before the commit, the batch is retried on a new one.
+#    batch <ReportBatch>: The batch to insert
+#    tableName <String>: The name of the table to insert to
+#    columnTypeOrderedDict <ordered dictionary>: The sqlAlchemy column types, used for setinputsizes
+#    batchSize <Number>: The number of rows to bind in each executemany (default: 5000)
+#    rowOffset <Number>: The row offset of the first row of the batch, when the batch is part of a larger load (default: 0)
+#    connection <cx_Oracle connection>: The connection to use (default: None to check one out of the pool)
+#    reconnectAttempts <Number>: The number of times to retry on a new pooled connection if the connection is lost (default: 2)
+#    commit <Boolean>: If false, the insert is left for the caller to commit on its connection (default: True)
+def oracleBulkInsert(batch, tableName, columnTypeOrderedDict, batchSize = 5000, rowOffset = 0, connection = None, reconnectAttempts = 2, commit = True):
+    if(connection is None):
+        for attempt in range(0, reconnectAttempts + 1):
+            try:
+                with oracleConnection() as pooledConnection:
+                    return oracleBulkInsert(batch, tableName, columnTypeOrderedDict, batchSize, rowOffset, pooledConnection)
+            except cx_Oracle.DatabaseError as e:
+                if(not isConnectionLost(e) or attempt == reconnectAttempts):
+                    raise
+    insertSql = ("insert into " + tableName + " (" + columnListString(batch.columnList) + ") values (" +
+                 columnListString([":" + str(i + 1) for i in range(0, len(batch.columnList))]) + ")")
+    inputSizeList = oracleInputSizes(batch.columnList, columnTypeOrderedDict, batch)
+    errorList = []
+    bulkCursor = connection.cursor()
+    try:
+        for batchNumber, rowList in enumerate(batch.iterRowBatches(batchSize, nullEmpty = True)):
+            bulkCursor.setinputsizes(*inputSizeList)
+            bulkCursor.executemany(insertSql, rowList, batcherrors = True)
+            for i in bulkCursor.getbatcherrors():
+                errorList += [[batchNumber, i.offset, rowOffset + batchNumber * batchSize + i.offset, i.message]]
+        if(commit):
+            connection.commit()
+    finally:
+        bulkCursor.close()
+    return errorList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is return true or false based on if a table exists in the oracle schema (without querying the table itself)
+#    tableName <String>: The name of the table
+#    connection <cx_Oracle connection>: The connection to use (default: None to check one out of the pool)
+def tableExists(tableName, connection = None):
+    if(connection is None):
+        with oracleConnection() as pooledConnection:
+            return tableExists(tableName, pooledConnection)
+    existsCursor = connection.cursor()
+    existsCursor.execute("select count(*) from user_tables where table_name = upper(:1)", [tableName])
+    return existsCursor.fetchone()[0] > 0
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the column types an oracle table has (from user_tab_columns) as an ordered dictionary of column name to sqlAlchemy type,
+#         in the form ColumnTypeInference gives them, so they can be widened (see widenColumnTypes). Columns of other types are left out. Empty if the table does not exist.
+#    tableName <String>: The name of the table
+def tableColumnTypes(tableName):
+    columnTypeDict = collections.OrderedDict()
+    with oracleConnection() as connection:
+        columnCursor = connection.cursor()
+        columnCursor.execute("select column_name, data_type, char_length, data_precision, data_scale from user_tab_columns where table_name = upper(:1) order by column_id",
+                             [tableName])
+        for columnName, dataType, charLength, precision, scale in columnCursor.fetchall():
+            if(dataType == "VARCHAR2"):
+                columnTypeDict[columnName] = sqlalchemy.dialects.oracle.VARCHAR2(int(charLength))
+            elif(dataType == "NUMBER" and precision is None):
+                columnTypeDict[columnName] = sqlalchemy.dialects.oracle.NUMBER()
+            elif(dataType == "NUMBER"):
+                columnTypeDict[columnName] = sqlalchemy.dialects.oracle.NUMBER(int(precision), int(scale or 0))
+            elif(dataType == "DATE"):
+                columnTypeDict[columnName] = sqlalchemy.types.DATE()
+            elif(dataType == "CLOB"):
+                columnTypeDict[columnName] = sqlalchemy.types.CLOB()
+    return columnTypeDict
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: gatherStats = 'stale' only gathers the statistics when Oracle counts them as stale (see tableStatsStale), for loads that run every few minutes (V1 - V1.1)
+#     2026-10-18: When the block fails and the restore fails as well, the restore error is warned about (with what is still set aside)
+#                 and the error of the block is raised, instead of the restore error hiding it (V1.1 - V1.2)
+#Purpose: The purpose of this function is to run a bulk load into a table (in a with block) without maintaining its indexes and constraints row by row.
+#         Before the block the indexes and constraints of the table are found in the data dictionary and set aside (see disableTableIndexes).
+#         After it they are rebuilt in parallel (see restoreTableIndexes) and the optimizer statistics of the table are gathered.
+#         If the block fails, the indexes and constraints are still restored, so the table is never left without them, but the statistics are not gathered.
+#    tableName <String>: The table being loaded
+#    parallel <Number>: The degree of parallelism for the rebuilds and the statistics (default: 4)
+#    dropIndexes <Boolean>: If true, every index is dropped and created again, otherwise only unique indexes are (they cannot be left unusable during inserts)
+#                           and the rest are marked unusable and rebuilt (default: False)
+#    constraints <Boolean>: If true, the enabled primary key, unique and foreign key constraints are disabled during the load and enabled (validated) afterwards.
+#                           If false, the indexes behind primary key and unique constraints are left as they are. (default: True)
+#    gatherStats <Boolean or String>: If true, gather the optimizer statistics of the table (and its indexes) afterwards.
+#                                     'stale' gathers them only when the table has none yet or enough of it changed for Oracle to count them as stale. (default: True)
+#    keepIndexList <List>: Indexes to leave in place (eg one the load itself looks rows up with) (default: [])
+#    rebuildWorkers <Number>: The number of indexes to rebuild at the same time, each on its own pooled connection (default: 2)
+#    metrics <ImportMetrics>: If given, the index work is timed as the postSql stage (default: None)
+#Tests:
+#    with bulkLoadMode("OPPORTUNITY_HISTORY", keepIndexList = ["OPPORTUNITY_HISTORY_ROWHASH"]):
+#        consolidateTableChanges("OPPORTUNITY_HISTORY", tableMappingList)
+@contextlib.contextmanager
+def bulkLoadMode(tableName, parallel = 4, dropIndexes = False, constraints = True, gatherStats = True, keepIndexList = [], rebuildWorkers = 2, metrics = None):
+    with metricsStage(metrics, "postSql"):
+        disabledList = disableTableIndexes(tableName, dropIndexes, constraints, keepIndexList)
+    try:
+        yield disabledList
+    except BaseException as loadError:
+        try:
+            with metricsStage(metrics, "postSql"):
+                restoreTableIndexes(tableName, disabledList, parallel, rebuildWorkers)
+        except Exception as restoreError:
+            warnings.warn("Could not restore the indexes and constraints of " + tableName + " after the load failed (" + str(restoreError).strip() +
+                          "), these may still be set aside: " + ", ".join([i[0] + " " + i[1] for i in disabledList]))
+            raise loadError from restoreError
+        raise
+    with metricsStage(metrics, "postSql"):
+        restoreTableIndexes(tableName, disabledList, parallel, rebuildWorkers)
+        if(gatherStats == 'stale'):
+            gatherStats = tableStatsStale(tableName)
+        if(gatherStats):
+            gatherTableStats(tableName, parallel)
+    if(metrics is not None):
+        metrics.addCount("indexesRebuilt", len([i for i in disabledList if i[0] != "constraint"]))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to set aside the indexes and constraints of a table before a bulk load, and return what was done so restoreTableIndexes can undo it.
+#         Foreign keys are disabled. Primary key and unique constraints are disabled with their index dropped (its DDL is kept to create it again),
+#         unless a foreign key of another table refers to them, in which case they and their index are left as they are.
+#         Other unique indexes are dropped (an unusable unique index stops inserts), and the rest are marked unusable, which inserts skip.
+#         Only valid, non partitioned, non LOB indexes are touched.
+#    tableName <String>: The table being loaded
+#    dropIndexes <Boolean>: If true, drop every index instead of marking it unusable
+#    constraints <Boolean>: If true, disable the primary key, unique and foreign key constraints
+#    keepIndexList <List>: Indexes to leave in place (default: [])
+#Returns: A 2D list of [kind ("unusable", "dropped" or "constraint"), name, index DDL or constraint type, original index degree]
+def disableTableIndexes(tableName, dropIndexes, constraints, keepIndexList = []):
+    disabledList = []
+    keepIndexList = [i.upper() for i in keepIndexList]
+    with oracleConnection() as connection:
+        indexCursor = connection.cursor()
+        if(constraints):
+            indexCursor.execute("select c.constraint_name, c.constraint_type, c.index_name from user_constraints c " +
+                                "where c.table_name = upper(:1) and c.status = 'ENABLED' and c.constraint_type in ('P', 'U', 'R') and not exists " +
+                                "(select 1 from user_constraints r where r.r_constraint_name = c.constraint_name and r.table_name <> c.table_name and r.status = 'ENABLED') " +
+                                "order by c.constraint_type desc", [tableName])
+            for constraintName, constraintType, indexName in indexCursor.fetchall():
+                if(constraintType != "R" and indexName in keepIndexList):
+                    continue
+                if(constraintType != "R"):
+                    disabledList += [["dropped", indexName, indexDdl(indexName, connection), indexDegree(indexName, connection)]]
+                connection.cursor().execute("alter table " + tableName + " disable constraint " + constraintName + ifEquals(constraintType, "R", "", " drop index"))
+                disabledList += [["constraint", constraintName, constraintType, None]]
+        indexCursor.execute("select i.index_name, i.uniqueness, trim(i.degree) from user_indexes i where i.table_name = upper(:1) and i.status = 'VALID' " +
+                            "and i.index_type not in ('LOB', 'IOT - TOP') and not exists (select 1 from user_constraints c where c.table_name = i.table_name " +
+                            "and c.index_name = i.index_name and c.constraint_type in ('P', 'U') and c.status = 'ENABLED')", [tableName])
+        for indexName, uniqueness, degree in indexCursor.fetchall():
+            if(indexName in keepIndexList):
+                continue
+            if(dropIndexes or uniqueness == "UNIQUE"):
+                disabledList += [["dropped", indexName, indexDdl(indexName, connection), degree]]
+                connection.cursor().execute("drop index " + indexName)
+            else:
+                connection.cursor().execute("alter index " + indexName + " unusable")
+                disabledList += [["unusable", indexName, None, degree]]
+    return disabledList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: Parallel ddl is turned off again in a finally, so a failed rebuild does not hand a parallel session back to the pool (V1 - V1.1)
+#Purpose: The purpose of this function is to undo disableTableIndexes after a bulk load: the indexes are rebuilt (or created again from their DDL) rebuildWorkers at a time,
+#         each with parallel DDL, and set back to their original degree. Then the constraints are enabled again (validating the rows that were loaded).
+#         Every index is attempted; if any of them failed, the first error is raised afterwards.
+#    tableName <String>: The table that was loaded
+#    disabledList <2D List>: What disableTableIndexes returned
+#    parallel <Number>: The degree of parallelism for each rebuild (default: 4)
+#    rebuildWorkers <Number>: The number of indexes to rebuild at the same time (default: 2)
+def restoreTableIndexes(tableName, disabledList, parallel = 4, rebuildWorkers = 2):
+    def restoreIndex(disabledIndex):
+        kind, indexName, ddl, degree = disabledIndex
+        with oracleConnection() as connection:
+            restoreCursor = connection.cursor()
+            if(parallel > 1):
+                restoreCursor.execute("alter session force parallel ddl parallel " + str(parallel))
+            try:
+                if(kind == "unusable"):
+                    restoreCursor.execute("alter index " + indexName + " rebuild")
+                else:
+                    restoreCursor.execute(ddl)
+                restoreCursor.execute("alter index " + indexName + ifEquals(degree in [None, "1", "0"], True, " noparallel", " parallel " + str(degree)))
+            finally:
+                # The pooled session goes back with parallel ddl off, even when the rebuild failed
+                if(parallel > 1):
+                    restoreCursor.execute("alter session disable parallel ddl")
+
+    errorList = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers = max(rebuildWorkers, 1)) as executor:
+        for i in concurrent.futures.as_completed([executor.submit(restoreIndex, j) for j in disabledList if j[0] != "constraint"]):
+            try:
+                i.result()
+            except Exception as e:
+                errorList += [e]
+    if(errorList != []):
+        raise errorList[0]
+
+    # The primary key and unique constraints go before the foreign keys (which may refer to them)
+    with oracleConnection() as connection:
+        for i in sorted([j for j in disabledList if j[0] == "constraint"], key = lambda j: j[2] == "R"):
+            connection.cursor().execute("alter table " + tableName + " enable constraint " + i[1])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the DDL of an index from the data dictionary (dbms_metadata), so it can be created again after it is dropped
+#    indexName <String>: The index
+#    connection <cx_Oracle connection>: The connection to use
+def indexDdl(indexName, connection):
+    ddlCursor = connection.cursor()
+    ddlCursor.execute("select dbms_metadata.get_ddl('INDEX', :1) from dual", [indexName])
+    return ddlCursor.fetchone()[0].read().strip()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the degree of parallelism an index is defined with (eg "1" or "DEFAULT")
+#    indexName <String>: The index
+#    connection <cx_Oracle connection>: The connection to use
+def indexDegree(indexName, connection):
+    degreeCursor = connection.cursor()
+    degreeCursor.execute("select trim(degree) from user_indexes where index_name = :1", [indexName])
+    return degreeCursor.fetchone()[0]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to gather the optimizer statistics of a table and its indexes (eg after a bulk load), so the plans that read it see its new size
+#    tableName <String>: The table
+#    parallel <Number>: The degree of parallelism to gather with (default: 4)
+def gatherTableStats(tableName, parallel = 4):
+    with oracleConnection() as connection:
+        connection.cursor().execute("begin dbms_stats.gather_table_stats(ownname => user, tabname => upper(:1), degree => :2, cascade => true); end;",
+                                    [tableName, parallel])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return true if a table has no optimizer statistics, or Oracle counts them as stale (more than the table's STALE_PERCENT,
+#         10% by default, of its rows changed since they were gathered). The changes are flushed from memory first when the schema is allowed to,
+#         otherwise the count Oracle last flushed (every few minutes) is used.
+#    tableName <String>: The table
+def tableStatsStale(tableName):
+    with oracleConnection() as connection:
+        staleCursor = connection.cursor()
+        try:
+            staleCursor.execute("begin dbms_stats.flush_database_monitoring_info; end;")
+        except cx_Oracle.DatabaseError as e:
+            if(isConnectionLost(e)):
+                raise
+        staleCursor.execute("select count(*) from user_tab_statistics where table_name = upper(:1) and object_type = 'TABLE' " +
+                            "and (stale_stats = 'YES' or last_analyzed is null)", [tableName])
+        return staleCursor.fetchone()[0] > 0
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to create a bookkeeping table (eg the watermark or checkpoint table) if it does not exist yet.
+#         Concurrent jobs can all find it missing at once, so the one that loses the race (ORA-00955, name already used) carries on with the table the other created.
+#    tableName <String>: The table
+#    columnSql <String>: The column definitions (eg "(REPORT_ID VARCHAR2(100), WATERMARK DATE)")
+#    connection <cx_Oracle connection>: The connection to use
+def createTableIfMissing(tableName, columnSql, connection):
+    if(tableExists(tableName, connection)):
+        return
+    try:
+        connection.cursor().execute("create table " + tableName + " " + columnSql)
+    except cx_Oracle.DatabaseError as e:
+        if(e.args[0].code != 955):
+            raise
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The watermark table is created with createTableIfMissing, so concurrent jobs do not fail on ORA-00955 (V1 - V1.1)
+#Purpose: The purpose of this function is to return the high-water mark stored for a report and table by setWatermark, or None if there is not one yet.
+#         The watermark table (watermarkTableName) is created the first time it is needed.
+#    reportIdentifier <String>: The report identifier for the salesforce report
+#    tableName <String>: The table the report is loaded into
+def getWatermark(reportIdentifier, tableName):
+    with oracleConnection() as connection:
+        watermarkCursor = connection.cursor()
+        createTableIfMissing(watermarkTableName, "(REPORT_ID VARCHAR2(100), TABLE_NAME VARCHAR2(100), WATERMARK DATE, UPDATED_DATE DATE)", connection)
+        watermarkCursor.execute("select WATERMARK from " + watermarkTableName + " where REPORT_ID = :1 and TABLE_NAME = :2", [reportIdentifier, tableName])
+        row = watermarkCursor.fetchone()
+        if(row is None):
+            return None
+        return row[0]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to store the high-water mark for a report and table. It is not committed, so it can share the transaction of the load it describes.
+#    reportIdentifier <String>: The report identifier for the salesforce report
+#    tableName <String>: The table the report is loaded into
+#    watermark <datetime>: The latest LAST_MODIFIED_DATE that has been loaded
+#    connection <cx_Oracle connection>: The connection (and transaction) to use
+def setWatermark(reportIdentifier, tableName, watermark, connection):
+    connection.cursor().execute("merge into " + watermarkTableName + """ t
+using (select :1 as REPORT_ID, :2 as TABLE_NAME, :3 as WATERMARK from dual) s
+on (t.REPORT_ID = s.REPORT_ID and t.TABLE_NAME = s.TABLE_NAME)
+when matched then update set t.WATERMARK = s.WATERMARK, t.UPDATED_DATE = sysdate
+when not matched then insert (REPORT_ID, TABLE_NAME, WATERMARK, UPDATED_DATE) values (s.REPORT_ID, s.TABLE_NAME, s.WATERMARK, sysdate)""",
+                                [reportIdentifier, tableName, watermark])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to merge one table into another by key: every row of table1 with a key that is in table2 is deleted,
+#         then every row of table2 is inserted. So an opportunity in the delta replaces the whole set of rows it had (eg a product line that was removed is gone),
+#         and the key does not have to identify a single row. It is not committed.
+#         Keys that are not in table2 are left alone, so rows deleted in salesforce (or no longer in the report) are not removed; a full load removes them.
+#         The key columns must not be null (null keys never match, so their rows are only inserted).
+#    table1 <String>: The table to merge into
+#    table2 <String>: The table to merge from
+#    columnList <List>: The columns to insert (the same names in both tables)
+#    keyColumnList <List>: The columns that identify the rows to replace (eg ["OPPORTUNITY_ID","PY_INSTANCE"])
+#    connection <cx_Oracle connection>: The connection (and transaction) to use
+def mergeTable(table1, table2, columnList, keyColumnList, connection):
+    missingColumnList = [i for i in keyColumnList if i not in columnList]
+    if(missingColumnList != []):
+        raise ValueError("The key columns " + ", ".join(missingColumnList) + " are not in " + table2)
+    mergeCursor = connection.cursor()
+    mergeCursor.execute("delete from " + table1 + " where (" + columnListString(keyColumnList) + ") in (select " + columnListString(keyColumnList) + " from " + table2 + ")")
+    mergeCursor.execute("insert into " + table1 + " (" + columnListString(columnList) + ") select " + columnListString(columnList) + " from " + table2)
+
+watermarkTableName = "PY_LOAD_WATERMARK"
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The checkpoint table is created with createTableIfMissing, so concurrent jobs do not fail on ORA-00955 (V1 - V1.1)
+#Purpose: The purpose of this function is to return the checkpoint of a resumable load (see setCheckpoint) as [export hash, chunk rows, chunks loaded, rows loaded], or None.
+#         The checkpoint table (checkpointTableName) is created the first time it is needed.
+#    tableName <String>: The table the report is loaded into
+#    exportKey <String>: The cached export being loaded (the name exportCacheFile gives it, eg na5_00OF0000006h3bl)
+def getCheckpoint(tableName, exportKey):
+    with oracleConnection() as connection:
+        checkpointCursor = connection.cursor()
+        createTableIfMissing(checkpointTableName, "(TABLE_NAME VARCHAR2(100), EXPORT_KEY VARCHAR2(200), EXPORT_HASH VARCHAR2(64), " +
+                             "CHUNK_ROWS NUMBER, CHUNKS_LOADED NUMBER, ROWS_LOADED NUMBER, UPDATED_DATE DATE)", connection)
+        checkpointCursor.execute("select EXPORT_HASH, CHUNK_ROWS, CHUNKS_LOADED, ROWS_LOADED from " + checkpointTableName +
+                                 " where TABLE_NAME = :1 and EXPORT_KEY = :2", [tableName, exportKey])
+        row = checkpointCursor.fetchone()
+        if(row is None):
+            return None
+        return [row[0], int(row[1]), int(row[2]), int(row[3])]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to store how far a resumable load has got: the chunks of the export (and the rows they held) that are committed in the table.
+#         It is not committed, so it shares the transaction of the chunk it describes, and the checkpoint can never be ahead of (or behind) the table.
+#    tableName <String>: The table the report is loaded into
+#    exportKey <String>: The cached export being loaded (see getCheckpoint)
+#    exportHash <String>: The data hash of the export (see ExportHash), so a checkpoint is only used to resume the same export
+#    chunkRows <Number>: The chunkRows of the load, which the chunks are counted in
+#    chunksLoaded <Number>: The number of chunks of the export that are loaded
+#    rowsLoaded <Number>: The number of rows (after the filters) that are loaded
+#    connection <cx_Oracle connection>: The connection (and transaction) to use
+def setCheckpoint(tableName, exportKey, exportHash, chunkRows, chunksLoaded, rowsLoaded, connection):
+    connection.cursor().execute("merge into " + checkpointTableName + """ t
+using (select :1 as TABLE_NAME, :2 as EXPORT_KEY, :3 as EXPORT_HASH, :4 as CHUNK_ROWS, :5 as CHUNKS_LOADED, :6 as ROWS_LOADED from dual) s
+on (t.TABLE_NAME = s.TABLE_NAME and t.EXPORT_KEY = s.EXPORT_KEY)
+when matched then update set t.EXPORT_HASH = s.EXPORT_HASH, t.CHUNK_ROWS = s.CHUNK_ROWS, t.CHUNKS_LOADED = s.CHUNKS_LOADED,
+                             t.ROWS_LOADED = s.ROWS_LOADED, t.UPDATED_DATE = sysdate
+when not matched then insert (TABLE_NAME, EXPORT_KEY, EXPORT_HASH, CHUNK_ROWS, CHUNKS_LOADED, ROWS_LOADED, UPDATED_DATE)
+    values (s.TABLE_NAME, s.EXPORT_KEY, s.EXPORT_HASH, s.CHUNK_ROWS, s.CHUNKS_LOADED, s.ROWS_LOADED, sysdate)""",
+                                [tableName, exportKey, exportHash, chunkRows, chunksLoaded, rowsLoaded])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to remove the checkpoint of a load once it has finished, or every checkpoint of a table when it is replaced
+#         (the rows the other checkpoints describe are gone, so those reports must be loaded again from the start).
+#    tableName <String>: The table the report is loaded into
+#    exportKey <String>: The cached export (see getCheckpoint) (default: None for every export loaded into the table)
+def clearCheckpoint(tableName, exportKey = None):
+    with oracleConnection() as connection:
+        if(not tableExists(checkpointTableName, connection)):
+            return
+        if(exportKey is None):
+            connection.cursor().execute("delete from " + checkpointTableName + " where TABLE_NAME = :1", [tableName])
+        else:
+            connection.cursor().execute("delete from " + checkpointTableName + " where TABLE_NAME = :1 and EXPORT_KEY = :2", [tableName, exportKey])
+        connection.commit()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to insert a chunk into its tables (eg the staging table and the history table) and move the load checkpoint, all in one transaction.
+#         Rows that Oracle rejects are returned as they are by oracleBulkInsert. If the connection is lost before the commit, the chunk is retried on a new one.
+#    insertList <2D List>: The inserts as [ReportBatch, table name, column types (see oracleBulkInsert)]
+#    checkpointList <List>: The setCheckpoint parameters (table name, export key, export hash, chunk rows, chunks loaded, rows loaded)
+#    batchSize <Number>: The number of rows to bind in each executemany (default: 5000)
+#    rowOffset <Number>: The row offset of the first row of the chunk (default: 0)
+#    reconnectAttempts <Number>: The number of times to retry on a new pooled connection if the connection is lost (default: 2)
+def oracleCheckpointInsert(insertList, checkpointList, batchSize = 5000, rowOffset = 0, reconnectAttempts = 2):
+    for attempt in range(0, reconnectAttempts + 1):
+        try:
+            with oracleConnection() as connection:
+                errorList = []
+                for i in insertList:
+                    errorList += oracleBulkInsert(i[0], i[1], i[2], batchSize, rowOffset, connection, commit = False)
+                setCheckpoint(*(checkpointList + [connection]))
+                connection.commit()
+                return errorList
+        except cx_Oracle.DatabaseError as e:
+            if(not isConnectionLost(e) or attempt == reconnectAttempts):
+                raise
+
+checkpointTableName = "PY_LOAD_CHECKPOINT"
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to record where the time of one import goes, and how much it moved, so slow runs can be explained afterwards.
+#         Time is kept per stage (download, parse, filter, typeConversion, load, postSql). Stages can be nested, and a nested stage pauses the one around it,
+#         so each second is counted in exactly one stage (eg the socket reads inside the parse of a chunk count as download, not parse).
+#         Stages that run on other threads (see pipelineIterator) add to the same totals, so with the pipeline the stages can add up to more than the run.
+#         The queues between pipelined stages are recorded with observeQueue.
+#         write() appends the run as one JSON line to runLogFile, and when prometheusTextfile is set, rewrites it with the latest run of every table and report.
+#    tableName <String>: The table being loaded
+#    reportIdentifier <String>: The report (or step) being run
+#    instanceName <String>: The name of the salesforce instance (default: "")
+class ImportMetrics:
+    def __init__(self, tableName, reportIdentifier, instanceName = ""):
+        self.tableName = tableName
+        self.reportIdentifier = reportIdentifier
+        self.instanceName = instanceName
+        self.startDateTime = datetime.datetime.now()
+        self.endDateTime = None
+        self.status = "running"
+        self.stageSeconds = collections.OrderedDict([[i, 0.0] for i in metricsStageList])
+        self.countDict = collections.OrderedDict([["bytesReceived", 0], ["rows", 0], ["chunks", 0], ["batches", 0], ["rejectedRows", 0]])
+        self.queueDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.threadState = threading.local()
+
+    #Purpose: Time the code in a with block as a stage. The stage open around it (on the same thread) is paused until the block ends.
+    #    stageName <String>: The name of the stage
+    @contextlib.contextmanager
+    def stage(self, stageName):
+        stageStack = self.threadState.__dict__.setdefault("stageStack", [])
+        startTime = time.perf_counter()
+        if(stageStack != []):
+            self.addSeconds(stageStack[-1][0], startTime - stageStack[-1][1])
+        stageStack.append([stageName, startTime])
+        try:
+            yield self
+        finally:
+            endTime = time.perf_counter()
+            self.addSeconds(stageName, endTime - stageStack.pop()[1])
+            if(stageStack != []):
+                stageStack[-1][1] = endTime
+
+    #Purpose: Add seconds to a stage
+    def addSeconds(self, stageName, seconds):
+        with self.lock:
+            self.stageSeconds[stageName] = self.stageSeconds.get(stageName, 0.0) + seconds
+
+    #Purpose: Add to a counter (eg rows, batches)
+    def addCount(self, countName, value = 1):
+        with self.lock:
+            self.countDict[countName] = self.countDict.get(countName, 0) + value
+
+    #Purpose: Record the depth of a queue as a value goes through it, and how long the producer waited for room (the consumer is slower)
+    #         or the consumer waited for a value (the producer is slower)
+    #    queueName <String>: The name of the queue
+    #    depth <Number>: The number of values in the queue
+    #    putWaitSeconds <Number>: The time the producer waited to put the value (default: 0)
+    #    getWaitSeconds <Number>: The time the consumer waited to get the value (default: 0)
+    def observeQueue(self, queueName, depth, putWaitSeconds = 0, getWaitSeconds = 0):
+        with self.lock:
+            queueStats = self.queueDict.setdefault(queueName, collections.OrderedDict([["maxDepth", 0], ["depthTotal", 0], ["samples", 0],
+                                                                                       ["putWaitSeconds", 0.0], ["getWaitSeconds", 0.0]]))
+            queueStats["maxDepth"] = max(queueStats["maxDepth"], depth)
+            queueStats["depthTotal"] += depth
+            queueStats["samples"] += 1
+            queueStats["putWaitSeconds"] += putWaitSeconds
+            queueStats["getWaitSeconds"] += getWaitSeconds
+
+    #Purpose: Yield the values of an iterable, timing each step of it as a stage and (optionally) adding the length of each value to a counter
+    #    iterable <iterable>: The values (eg the chunks of a report)
+    #    stageName <String>: The stage to time the steps in
+    #    countName <String>: The counter to add len(value) to (default: None)
+    def timedIterator(self, iterable, stageName, countName = None):
+        iterator = iter(iterable)
+        while True:
+            with self.stage(stageName):
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    return
+            if(countName is not None):
+                self.addCount(countName, len(value))
+            yield value
+
+    #Purpose: Mark the run as finished. Returns the metrics so it can be written on the same line.
+    #    status <String>: "success" or "failed" (default: None for "success", unless the run set its own status, eg "unchanged")
+    def finish(self, status = None):
+        self.endDateTime = datetime.datetime.now()
+        if(status is not None or self.status == "running"):
+            self.status = ifEquals(status, None, "success", status)
+        return self
+
+    #Purpose: Return the run as a dictionary (what write() logs)
+    def record(self):
+        endDateTime = ifEquals(self.endDateTime, None, datetime.datetime.now(), self.endDateTime)
+        seconds = (endDateTime - self.startDateTime).total_seconds()
+        with self.lock:
+            recordDict = collections.OrderedDict([["tableName", self.tableName], ["reportIdentifier", self.reportIdentifier],
+                                                  ["instanceName", self.instanceName], ["status", self.status],
+                                                  ["startDateTime", self.startDateTime.isoformat()], ["endDateTime", endDateTime.isoformat()],
+                                                  ["seconds", round(seconds, 6)]])
+            recordDict.update(self.countDict)
+            recordDict["rowsPerSecond"] = round(self.countDict["rows"] / seconds, 1) if seconds > 0 else 0.0
+            recordDict["stageSeconds"] = collections.OrderedDict([[i, round(j, 6)] for i, j in self.stageSeconds.items()])
+            recordDict["stageRowsPerSecond"] = collections.OrderedDict([[i, round(self.countDict["rows"] / j, 1)]
+                                                                        for i, j in self.stageSeconds.items() if j > 0])
+            recordDict["queues"] = collections.OrderedDict([[i, collections.OrderedDict([["maxDepth", j["maxDepth"]],
+                                                                                         ["meanDepth", round(j["depthTotal"] / float(max(j["samples"], 1)), 2)],
+                                                                                         ["putWaitSeconds", round(j["putWaitSeconds"], 6)],
+                                                                                         ["getWaitSeconds", round(j["getWaitSeconds"], 6)]])]
+                                                            for i, j in self.queueDict.items()])
+        return recordDict
+
+    #Purpose: Return the one line summary of the run (eg for printing in the notebook)
+    def summary(self):
+        endDateTime = ifEquals(self.endDateTime, None, datetime.datetime.now(), self.endDateTime)
+        return ("Salesforce Report: " + self.reportIdentifier + " - Inserted " + str(self.countDict["rows"]) + " rows into " + self.tableName +
+                " (" + self.status + ")! Time: " + timeDifference(self.startDateTime, endDateTime))
+
+    #Purpose: Append the run to the JSON lines run log and refresh the prometheus textfile (if prometheusTextfile is set)
+    #    fileName <String>: The run log file (default: None for runLogFile)
+    def write(self, fileName = None):
+        recordDict = self.record()
+        with metricsFileLock:
+            with open(ifEquals(fileName, None, runLogFile, fileName), "a") as runLog:
+                runLog.write(json.dumps(recordDict) + "\n")
+            latestRecordDict[(self.tableName, self.reportIdentifier)] = recordDict
+            if(prometheusTextfile is not None):
+                writePrometheusTextfile(list(latestRecordDict.values()), prometheusTextfile)
+        return recordDict
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to time a with block as a stage of an ImportMetrics, or do nothing when there are no metrics
+#    metrics <ImportMetrics>: The metrics (or None)
+#    stageName <String>: The name of the stage
+def metricsStage(metrics, stageName):
+    if(metrics is None):
+        return contextlib.nullcontext()
+    return metrics.stage(stageName)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to write run records (see ImportMetrics.record) in the prometheus text format, for the node_exporter textfile collector.
+#         The file is written beside the target and renamed over it, so the collector never reads half a file.
+#    recordList <List of dictionaries>: The latest record of each table and report
+#    fileName <String>: The .prom file to write
+def writePrometheusTextfile(recordList, fileName):
+    def labelString(recordDict, extraLabelList = []):
+        labelList = [["table", recordDict["tableName"]], ["report", recordDict["reportIdentifier"]], ["instance", recordDict["instanceName"]]] + extraLabelList
+        return "{" + ",".join([i + '="' + str(j).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for i, j in labelList]) + "}"
+
+    metricList = [["jetdataload_last_run_timestamp_seconds", "End time of the last run", lambda r: datetime.datetime.fromisoformat(r["endDateTime"]).timestamp()],
+                  ["jetdataload_last_run_success", "1 if the last run succeeded", lambda r: int(r["status"] == "success")],
+                  ["jetdataload_run_seconds", "Length of the last run", lambda r: r["seconds"]],
+                  ["jetdataload_rows", "Rows loaded by the last run", lambda r: r["rows"]],
+                  ["jetdataload_rejected_rows", "Rows rejected by the database in the last run", lambda r: r["rejectedRows"]],
+                  ["jetdataload_bytes_received", "Bytes of report export received by the last run", lambda r: r["bytesReceived"]],
+                  ["jetdataload_batches", "Insert batches sent by the last run", lambda r: r["batches"]],
+                  ["jetdataload_rows_per_second", "Rows per second of the last run", lambda r: r["rowsPerSecond"]]]
+    lineList = []
+    for name, helpString, valueFunction in metricList:
+        lineList += ["# HELP " + name + " " + helpString, "# TYPE " + name + " gauge"]
+        lineList += [name + labelString(i) + " " + str(valueFunction(i)) for i in recordList]
+    lineList += ["# HELP jetdataload_stage_seconds Seconds spent in each stage of the last run", "# TYPE jetdataload_stage_seconds gauge"]
+    for i in recordList:
+        lineList += ["jetdataload_stage_seconds" + labelString(i, [["stage", j]]) + " " + str(k) for j, k in i["stageSeconds"].items()]
+    for name, helpString, key in [["jetdataload_queue_max_depth", "Deepest a pipeline queue got in the last run", "maxDepth"],
+                                  ["jetdataload_queue_mean_depth", "Mean depth of a pipeline queue in the last run", "meanDepth"],
+                                  ["jetdataload_queue_put_wait_seconds", "Seconds the stage before a pipeline queue waited for room in the last run", "putWaitSeconds"],
+                                  ["jetdataload_queue_get_wait_seconds", "Seconds the stage after a pipeline queue waited for work in the last run", "getWaitSeconds"]]:
+        lineList += ["# HELP " + name + " " + helpString, "# TYPE " + name + " gauge"]
+        for i in recordList:
+            lineList += [name + labelString(i, [["queue", j]]) + " " + str(k[key]) for j, k in i.get("queues", {}).items()]
+    with open(fileName + ".tmp", "w") as promFile:
+        promFile.write("\n".join(lineList) + "\n")
+    os.replace(fileName + ".tmp", fileName)
+
+metricsStageList = ["download", "parse", "filter", "typeConversion", "archive", "load", "postSql"]
+runLogFile = "importRunLog.jsonl"
+prometheusTextfile = None
+latestRecordDict = collections.OrderedDict()
+metricsFileLock = threading.Lock()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to run an iterable (eg a generator of chunks) on its own thread, handing its values over through a bounded queue,
+#         so the work that produces the next value overlaps with the work done on the current one. When the queue is full the producer waits (back-pressure),
+#         so at most queueSize values are held between the two. An error in the producer is raised in the consumer.
+#         If the consumer stops early (or fails), the producer is stopped and the iterable closed (eg the export response) on its own thread.
+#    iterable <iterable>: The values
+#    queueSize <Number>: The most values to hold in the queue
+#    metrics <ImportMetrics>: If given, the queue depth and waits are recorded with observeQueue (default: None)
+#    queueName <String>: The name to record the queue as (default: "queue")
+#Tests:
+#    list(pipelineIterator(range(5), 2)) = [0, 1, 2, 3, 4]
+def pipelineIterator(iterable, queueSize, metrics = None, queueName = "queue"):
+    valueQueue = queue.Queue(maxsize = queueSize)
+    stopEvent = threading.Event()
+    endMarker = object()
+
+    def putValue(item):
+        waitStart = time.perf_counter()
+        while(not stopEvent.is_set()):
+            try:
+                valueQueue.put(item, timeout = 0.1)
+                break
+            except queue.Full:
+                pass
+        if(metrics is not None and not stopEvent.is_set()):
+            metrics.observeQueue(queueName, valueQueue.qsize(), putWaitSeconds = time.perf_counter() - waitStart)
+
+    def produce():
+        endItem = [endMarker, None]
+        try:
+            for value in iterable:
+                putValue([value, None])
+                if(stopEvent.is_set()):
+                    break
+        except BaseException as e:
+            endItem = [endMarker, e]
+        finally:
+            if(hasattr(iterable, "close")):
+                iterable.close()
+        putValue(endItem)
+
+    producerThread = threading.Thread(target = produce, name = queueName, daemon = True)
+    producerThread.start()
+    try:
+        while True:
+            waitStart = time.perf_counter()
+            value, error = valueQueue.get()
+            if(metrics is not None):
+                metrics.observeQueue(queueName, valueQueue.qsize(), getWaitSeconds = time.perf_counter() - waitStart)
+            if(value is endMarker):
+                if(error is not None):
+                    raise error
+                return
+            yield value
+    finally:
+        stopEvent.set()
+        producerThread.join()
+
+#Date Created: 2016-03-20
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 17.1
+#Change Notes:
+#     2026-10-18: The export is streamed and parsed with salesforceReportChunks, and each chunk is transformed and sent to sql on its own (V1 - V2)
+#     2026-10-18: Each chunk is held as a ReportBatch and sent with batchToSql instead of copying lists into a dataframe (V2 - V3)
+#     2026-10-18: Added the cx_Oracle array binding loader (oracleBulkInsert) as the default. Returns the rejected rows. (V3 - V4)
+#     2026-10-18: Added the client parameter so imports from different instances can run at the same time (V4 - V5)
+#     2026-10-18: Each chunk is loaded on its own pooled connection, so concurrent imports no longer wait on each other (V5 - V5.1)
+#     2026-10-18: Added the incremental mode (V5.1 - V6)
+#     2026-10-18: Dates are converted with convertDateColumns. Dates that cannot be parsed are now loaded as null instead of as the original string (V6 - V6.1)
+#     2026-10-18: columnTypeOrderedDict = None infers the column types with ColumnTypeInference. Number columns are bound as numbers. (V6.1 - V7)
+#     2026-10-18: Added historyTableName to stream the rows straight into the history table as well as (or instead of) the staging table (V7 - V8)
+#     2026-10-18: Each run is timed by stage and logged with ImportMetrics (V8 - V9)
+#     2026-10-18: Added the export cache (exportCache), which skips the load when the export has not changed since it was last loaded (V9 - V10)
+#     2026-10-18: Added extractMode to pull the report through SOQL or Bulk API 2.0 instead of the export link (V10 - V11)
+#     2026-10-18: The download and parse, the transform and the load run on their own threads with bounded queues between them (pipelineDepth) (V11 - V12)
+#     2026-10-18: Added resumable, which checkpoints each chunk so a load that stopped part way carries on from the cached export (V12 - V13)
+#     2026-10-18: Added archiveSnapshot to keep each transformed extract in the parquet snapshot archive (V13 - V14)
+#     2026-10-18: Added bulkLoad, which sets aside the indexes of the tables being appended to during the load (see bulkLoadMode) (V14 - V15)
+#     2026-10-18: Added parseWorkers to parse and transform the export on a process pool (see shardedReportBatches) (V15 - V16)
+#     2026-10-18: Added partitionList to export a report in date ranges at the same time and merge them (V16 - V17)
+#     2026-10-18: stagingTable False needs resumable, so the chunks streamed into the history table are committed with checkpoints (V17 - V17.1)
+#Purpose: The purpose of this function is to load data from salesforce into a sql database.
+#         In incremental mode only the rows modified since the stored watermark are pulled (with a report filter override), loaded into <tableName>_DELTA
+#         and merged into the table. The first incremental run (no watermark yet) is a full load. The watermark is moved in the same transaction as the merge.
+#         With exportCache the export goes through exportCacheDirectory. When a table is loaded from several reports (eg a replace then an append),
+#         run them with importSalesForceToSqlConcurrent, which reloads all of them when any one changed.
+#         With resumable, every chunk is committed together with a checkpoint (see oracleCheckpointInsert). When the same export is loaded again after a failure
+#         (eg the database dropped, or the session timed out), the table is not replaced: the chunks that were committed are skipped and the load carries on after them.
+#    tableName <String>: The name of the table to create in the sql database
+#    reportIdentifier <String>: the report identifier for the salesforce report 
+#    instance <String>: The string before "salesforce.com" for the instance
+#    columnTypeOrderedDict <ordered dictionary>: The ordered dictionary that is used with sqlAlchemy to specify the column types.
+#                                                If None, the types are inferred from the report and cached per report in schemaCacheFile; a later chunk with wider values widens the table.
+#    dateMaskList <2d String List>: the 2d list (column name, python datetime object mask) to use to change string dates to datetime objects
+#    instanceName <String>: The name of the instance to add into the sql table
+#    ifExists <String>: the sqlAlchemy if_exists parameter for replace, append or fail as possible values.
+#    chunkRows <Number>: The number of report rows to transform and send to sql at a time (default: 5000)
+#    loader <String>: 'oracle' to insert with cx_Oracle array binding, or 'sqlalchemy' to insert through the sqlAlchemy engine (default: 'oracle')
+#    batchSize <Number>: The number of rows bound in each executemany (default: 5000)
+#    client <SalesforceClient>: The salesforce session to export with (default: None for the salesforceConnection session)
+#    incremental <Boolean>: If true, only pull and merge the rows changed since the last run (default: False)
+#    watermarkColumn <String>: The (date masked) column that holds the last modified date of a row (default: "LAST_MODIFIED_DATE")
+#    watermarkFilter <String>: The report filter column to override with the watermark (default: "LAST_UPDATE", the report name of Last Modified Date)
+#    keyColumnList <List>: The columns the merge replaces rows by: every row of a key in the delta replaces the rows of that key in the table, so a key
+#                          can have several rows (eg a row per product line). Opportunities deleted in salesforce are not removed (see mergeTable). (default: ["OPPORTUNITY_ID","PY_INSTANCE"])
+#    historyTableName <String>: A table (eg OPPORTUNITY_HISTORY) to append each chunk to, mapped with historyColumnList, instead of running appendTableList afterwards (default: None)
+#                               Each chunk is committed on its own (with its checkpoint when resumable), so use consolidateTableChanges instead when the history
+#                               must never be partly appended.
+#    historyColumnList <2D List>: The column mapping list (see appendTableList) for the history table (default: None)
+#    stagingTable <Boolean>: If false, the rows are only sent to the history table and tableName is not loaded. Needs resumable, as there is no staging table
+#                            to append the history from again if the load stops part way. (default: True)
+#    exportCache <String>: None to stream the export straight from salesforce, 'refresh' to download it into the export cache first,
+#                          or 'replay' to load the cached export without going to salesforce (default: None)
+#    skipUnchanged <Boolean>: With exportCache, skip the load (the run is logged as "unchanged") when the export hashes the same as the one last loaded
+#                             into the table. Use False to rebuild a table from the cache regardless. (default: True)
+#    extractMode <String>: 'report' for the csv export link, or 'soql' / 'bulk' to query the rows through the api (see soqlReportChunks), which is not held
+#                          to the export row limit. The api returns dates as yyyy-mm-dd (and datetimes as ISO 8601), so dateMaskList must match. (default: 'report')
+#    soql <String>: With extractMode 'soql' or 'bulk', the query to run instead of the one built from the report definition (default: None)
+#    fieldMapDict <dictionary>: With extractMode 'soql' or 'bulk', the SOQL fields of report columns with no standard field (see reportSoql) (default: {})
+#    pipelineDepth <Number>: The number of chunks that can wait between the stages: the download and parse of the export, the transform of each chunk
+#                            (filter, constant columns and dates) and the load (with the column types and numbers, which depend on the table) each run on their own thread,
+#                            so the next chunk downloads while this one is inserted. 0 runs the stages one after another on the calling thread. (default: 2)
+#    resumable <Boolean>: If true, checkpoint each chunk and resume from the last checkpoint of the same export (same data hash and chunkRows).
+#                         Needs exportCache (the export is replayed from the cache, so use 'replay' to resume without going to salesforce) and the oracle loader. (default: False)
+#    archiveSnapshot <Boolean>: If true, write the transformed extract to the snapshot archive (see SnapshotWriter), committed once every chunk is loaded.
+#                               A resumed load (see resumable) only transforms the chunks after its checkpoint, so it is not archived. (default: False)
+#    bulkLoad <Boolean>: If true, the table being appended to (a replaced table has no indexes yet) and the history table are loaded in bulkLoadMode:
+#                        their indexes and constraints are set aside for the load, then rebuilt in parallel and the statistics gathered.
+#                        Do not use it for jobs that run at the same time into the same history table. (default: False)
+#    parseWorkers <Number>: With extractMode 'report', the number of processes to parse and transform the export on. The export is split into shards of chunkRows records,
+#                           which the workers parse, filter and convert the dates of, and send back through shared memory (see shardedReportBatches).
+#                           Needs pyarrow. 0 parses on the pipeline thread. (default: 0)
+#    partitionFilter <String>: With partitionList, the report filter column to partition the report on (default: "CREATED_DATE")
+#    partitionList <2D List>: The [start date, end date] of each partition (eg datePartitions(datetime.date(2012,1,1))), to keep each export under the export size and time limit.
+#                             Every partition is exported into the export cache at the same time (see refreshPartitionCache), then they are loaded in order as one export,
+#                             dropping the rows whose first column of keyColumnList (eg OPPORTUNITY_ID) came from an earlier partition (see mergePartitionChunks).
+#                             With exportCache None the partitions still go through the cache, but the load is never skipped. Needs extractMode 'report'. (default: [] for one export)
+#    metrics <ImportMetrics>: The metrics to record the run in (default: None to record and write its own run log entry)
+#Returns: A 2D list of the rows Oracle rejected as [batch number, offset in batch, row offset, error message] (always empty for the sqlalchemy loader)
+def importSalesForceToSql (tableName, reportIdentifier, instance, columnTypeOrderedDict, dateMaskList, instanceName = "", ifExists = 'replace', chunkRows = 5000,
+                           loader = 'oracle', batchSize = 5000, client = None, incremental = False, watermarkColumn = "LAST_MODIFIED_DATE",
+                           watermarkFilter = "LAST_UPDATE", keyColumnList = ["OPPORTUNITY_ID","PY_INSTANCE"], historyTableName = None, historyColumnList = None,
+                           stagingTable = True, exportCache = None, skipUnchanged = True, extractMode = 'report', soql = None, fieldMapDict = {}, pipelineDepth = 2,
+                           resumable = False, archiveSnapshot = False, bulkLoad = False, parseWorkers = 0, partitionFilter = "CREATED_DATE", partitionList = [],
+                           metrics = None):
+    ownMetrics = metrics is None
+    if(ownMetrics):
+        metrics = ImportMetrics(tableName, reportIdentifier, instanceName)
+    try:
+        errorList = importSalesForceToSqlRun(tableName, reportIdentifier, instance, columnTypeOrderedDict, dateMaskList, instanceName, ifExists, chunkRows,
+                                             loader, batchSize, client, incremental, watermarkColumn, watermarkFilter, keyColumnList, historyTableName,
+                                             historyColumnList, stagingTable, exportCache, skipUnchanged, extractMode, soql, fieldMapDict, pipelineDepth,
+                                             resumable, archiveSnapshot, bulkLoad, parseWorkers, partitionFilter, partitionList, metrics)
+    except Exception:
+        if(ownMetrics):
+            metrics.finish("failed").write()
+        raise
+    if(ownMetrics):
+        metrics.finish().write()
+    return errorList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to run the stages of importSalesForceToSql (see it for the parameters), recording each one in metrics
+def importSalesForceToSqlRun(tableName, reportIdentifier, instance, columnTypeOrderedDict, dateMaskList, instanceName, ifExists, chunkRows,
+                             loader, batchSize, client, incremental, watermarkColumn, watermarkFilter, keyColumnList, historyTableName,
+                             historyColumnList, stagingTable, exportCache, skipUnchanged, extractMode, soql, fieldMapDict, pipelineDepth, resumable,
+                             archiveSnapshot, bulkLoad, parseWorkers, partitionFilter, partitionList, metrics):
+    extractedDateTime = datetime.datetime.now()
+    ifExistsParam = ifExists
+    rowOffset = 0
+    errorList = []
+    typeInference = None
+    tableTypeDict = None
+    if(columnTypeOrderedDict is None):
+        typeInference = ColumnTypeInference(reportIdentifier)
+
+    # In incremental mode with a watermark, pull only the changed rows into the delta table.
+    #     The report filter only has day precision, so the watermark day is pulled again (the merge makes that harmless)
+    loadTableName = tableName
+    filterList = []
+    newWatermark = None
+    if(incremental):
+        with metrics.stage("postSql"):
+            watermark = getWatermark(reportIdentifier, tableName)
+            deltaLoad = watermark is not None and tableExists(tableName)
+        if(deltaLoad):
+            loadTableName = tableName[:24] + "_DELTA"
+            ifExistsParam = 'replace'
+            filterList = [[watermarkFilter, "ge", str(watermark.month) + "/" + str(watermark.day) + "/" + str(watermark.year)]]
+
+    if((historyTableName is None) != (historyColumnList is None)):
+        raise ValueError("historyTableName and historyColumnList are given together")
+    if(not stagingTable and historyTableName is None):
+        raise ValueError("With stagingTable False the rows only go to the history table, so historyTableName is needed")
+    if(not stagingTable and not resumable):
+        raise ValueError("With stagingTable False the history chunks are committed with checkpoints, so resumable is needed")
+    if(exportCache is not None and extractMode != 'report'):
+        raise ValueError("The export cache only holds report exports (extractMode = 'report')")
+    if(resumable and (exportCache is None or loader != 'oracle')):
+        raise ValueError("Resumable loads replay the cached export with the oracle loader (exportCache and loader = 'oracle')")
+    if(parseWorkers > 0 and extractMode != 'report'):
+        raise ValueError("Only report exports are split for the parse workers (extractMode = 'report')")
+    if(partitionList != [] and (extractMode != 'report' or parseWorkers > 0)):
+        raise ValueError("Partitions are report exports loaded through the export cache (extractMode = 'report' and parseWorkers = 0)")
+
+    # With partitionList, each partition is its own filtered export. The partitions are known as a whole (for the loaded hash and the checkpoints) by one filter list naming them all
+    partitionFilterList = []
+    exportFilterList = filterList
+    if(partitionList != []):
+        partitionFilterList = reportPartitionFilters(filterList, partitionFilter, partitionList)
+        exportFilterList = partitionKeyFilter(filterList, partitionFilter, partitionList)
+
+    # With the export cache, the load is skipped when the export is the same as the one last loaded into the table
+    contentHash = None
+    replaceTable = ifExistsParam == 'replace'
+    if(partitionList != [] and exportCache != 'replay'):
+        partitionHash = refreshPartitionCache(reportIdentifier, instance, client, partitionFilterList, metrics)
+        contentHash = ifEquals(exportCache, None, None, partitionHash)
+    elif(partitionList != []):
+        contentHash = cachedPartitionHash(reportIdentifier, instance, partitionFilterList)
+    elif(exportCache == 'refresh'):
+        contentHash = refreshExportCache(reportIdentifier, instance, client, filterList, metrics = metrics)
+    elif(exportCache == 'replay'):
+        contentHash = cachedExportHash(reportIdentifier, instance, filterList)
+    if(skipUnchanged and contentHash is not None and contentHash == exportLoadedHash(loadTableName, reportIdentifier, instance, exportFilterList)):
+        metrics.status = "unchanged"
+        return []
+
+    # With resumable, pick up after the chunks the last run of this export committed, without replacing the table.
+    #     A fresh load that replaces the table forgets the checkpoints of every report loaded into it, since their rows are gone
+    skipChunks = 0
+    exportKey = None
+    if(resumable):
+        exportKey = os.path.basename(exportCacheFile(reportIdentifier, instance, exportFilterList))
+        with metrics.stage("postSql"):
+            checkpoint = getCheckpoint(loadTableName, exportKey)
+            if(checkpoint is not None and checkpoint[0] == contentHash and checkpoint[1] == chunkRows):
+                skipChunks, rowOffset = checkpoint[2], checkpoint[3]
+                ifExistsParam = 'append'
+                metrics.addCount("resumedRows", rowOffset)
+            elif(ifExistsParam == 'replace'):
+                clearCheckpoint(loadTableName)
+
+    # Archive the transformed extract, unless the load is resumed part way through it
+    snapshotWriter = None
+    if(archiveSnapshot and skipChunks == 0):
+        snapshotWriter = SnapshotWriter(reportIdentifier, instance, instanceName, extractedDateTime, listColumn(dateMaskList, 0),
+                                        {"tableName": tableName, "filterList": exportFilterList, "sha256": contentHash})
+    if(parseWorkers > 0 and exportCache is None):
+        if(client is None):
+            client = SalesforceClient.fromConnection(salesforceConnectionVariable, instance, credentialList = salesforceCredentialList)
+        shardIterator = shardedReportBatches(client.exportBytes(reportIdentifier, filterList = filterList, metrics = metrics), dateMaskList, chunkRows,
+                                             parseWorkers, skipChunks, metrics)
+    elif(parseWorkers > 0):
+        shardIterator = shardedReportBatches(cachedExportBytes(reportIdentifier, instance, filterList = filterList, metrics = metrics), dateMaskList, chunkRows,
+                                             parseWorkers, skipChunks, metrics)
+    elif(partitionList != []):
+        chunkIterator = mergePartitionChunks([cachedReportChunks(reportIdentifier, instance, chunkRows, filterList = i, metrics = metrics) for i in partitionFilterList],
+                                             keyColumnList[:1], metrics)
+    elif(extractMode != 'report'):
+        chunkIterator = soqlReportChunks(reportIdentifier, instance, chunkRows, client, filterList, metrics, extractMode, soql, fieldMapDict)
+    elif(exportCache is None):
+        chunkIterator = salesforceReportChunks(reportIdentifier, instance, chunkRows, client = client, filterList = filterList, metrics = metrics)
+    else:
+        chunkIterator = cachedReportChunks(reportIdentifier, instance, chunkRows, filterList = filterList, metrics = metrics)
+
+    # Turn each chunk (2 dimensional list) into a ReportBatch. Reading the next chunk is the parse stage (less the socket reads, which are the download stage)
+    def transformChunks(chunkIterator):
+        columnList = None
+        for chunkNumber, dataList in enumerate(chunkIterator):
+            with metrics.stage("parse"):
+                # The header is the first row of the first chunk. First make sure the names of the columns will be unique
+                if(columnList is None):
+                    columnList = reportColumnList(dataList[0])
+                    dataList = dataList[1:]
+
+                # When resuming, the chunks that were already committed are only parsed (to reach the rest of the export)
+                if(chunkNumber < skipChunks):
+                    continue
+                batch = ReportBatch.fromRows(columnList, dataList)
+
+            with metrics.stage("filter"):
+                # Remove invalid enteries where the id contains spaces. Ensure an ID is used as the first column.
+                batch.filterString(columnList[0], " ", False)
+
+            with metrics.stage("typeConversion"):
+                # Convert the dates in the batch to a datetime object for sqlAlchemy
+                convertDateColumns(batch, dateMaskList)
+            yield batch
+
+    # Add the report identifier, salesforce instance and extracted date to each batch, and archive it
+    def finishBatches(batchIterator):
+        for batch in batchIterator:
+            with metrics.stage("filter"):
+                batch.addConstantColumn("PY_DATA_SOURCE",reportIdentifier)
+                batch.addConstantColumn("PY_INSTANCE",instanceName)
+                batch.addConstantColumn("PY_EXTRACTED_DATE_VALUE",extractedDateTime)
+
+            if(snapshotWriter is not None):
+                with metrics.stage("archive"):
+                    snapshotWriter.write(batch)
+            yield batch
+
+    # With the pipeline, the download and parse and the transform each run on their own thread, a bounded queue ahead of the next stage.
+    #     With the parse workers, the export is split and sent to them on one thread, and the batches come back in order
+    if(parseWorkers > 0 and pipelineDepth > 0):
+        batchIterator = pipelineIterator(finishBatches(shardIterator), pipelineDepth, metrics, "transformed")
+    elif(parseWorkers > 0):
+        batchIterator = finishBatches(shardIterator)
+    elif(pipelineDepth > 0):
+        chunkIterator = metrics.timedIterator(chunkIterator, "parse")
+        batchIterator = pipelineIterator(finishBatches(transformChunks(pipelineIterator(chunkIterator, pipelineDepth, metrics, "parsed"))), pipelineDepth,
+                                         metrics, "transformed")
+    else:
+        batchIterator = finishBatches(transformChunks(metrics.timedIterator(chunkIterator, "parse")))
+
+    # With bulkLoad, the indexes of the tables being appended to are set aside until every chunk is loaded
+    bulkLoadTableList = []
+    if(bulkLoad and loader == 'oracle'):
+        if(stagingTable and ifExistsParam == 'append' and tableExists(loadTableName)):
+            bulkLoadTableList += [loadTableName]
+        if(historyTableName is not None):
+            bulkLoadTableList += [historyTableName]
+
+    # import data from salesforce one chunk at a time. If the load fails, closing the iterator stops the pipeline threads (before the snapshot is aborted
+    #     and the indexes are restored)
+    batch = None
+    chunksLoaded = skipChunks
+    batchTableCreated = False
+    with contextlib.ExitStack() as bulkLoadStack, ifEquals(snapshotWriter, None, contextlib.nullcontext(), snapshotWriter), contextlib.closing(batchIterator):
+        for i in bulkLoadTableList:
+            bulkLoadStack.enter_context(bulkLoadMode(i, metrics = metrics))
+        for batch in batchIterator:
+            with metrics.stage("typeConversion"):
+                # Infer the column types from everything seen so far, widening the table if it has already been created.
+                #     A table that is appended to (or resumed) starts from the types it already has, which other reports may have widened
+                if(typeInference is not None):
+                    columnTypeOrderedDict = typeInference.observe(batch).columnTypes(batch.columnList)
+                    if(stagingTable and loader == 'oracle'):
+                        with metrics.stage("load"):
+                            if(tableTypeDict is None and ifExistsParam == 'append'):
+                                tableTypeDict = tableColumnTypes(loadTableName)
+                            if(tableTypeDict is not None):
+                                columnTypeOrderedDict = widenColumnTypes(loadTableName, tableTypeDict, columnTypeOrderedDict, metrics)
+                    tableTypeDict = columnTypeOrderedDict
+                convertNumberColumns(batch, columnTypeOrderedDict)
+
+                # Keep track of the latest modified date for the next incremental run
+                if(incremental and watermarkColumn in batch.columnList):
+                    for i in batch.columnValues(watermarkColumn):
+                        if(isinstance(i, datetime.datetime) and (newWatermark is None or i > newWatermark)):
+                            newWatermark = i
+
+            with metrics.stage("load"):
+                # Send the first chunk with the if_exists parameter, then append the remaining chunks
+                chunkErrorList = []
+                chunksLoaded += 1
+                if(stagingTable and loader == 'oracle'):
+                    # The table is created (or replaced) with the first chunk loaded; the later chunks only insert
+                    if(not batchTableCreated):
+                        createBatchTable(batch, loadTableName, columnTypeOrderedDict, ifExistsParam)
+                        batchTableCreated = True
+                    if(not resumable):
+                        chunkErrorList += oracleBulkInsert(batch, loadTableName, columnTypeOrderedDict, batchSize, rowOffset)
+                elif(stagingTable):
+                    batchToSql(batch, loadTableName, columnTypeOrderedDict, ifExistsParam, batchSize)
+
+                # Stream the chunk straight into the history table (the column types there are already set, so the binds are left to cx_Oracle)
+                if(historyTableName is not None and not resumable):
+                    chunkErrorList += oracleBulkInsert(batch.mapColumns(historyColumnList), historyTableName, {}, batchSize, rowOffset)
+
+                # With resumable, the staging and history inserts are committed with the checkpoint, and the column profile is saved to match
+                if(resumable):
+                    insertList = ifEquals(stagingTable, True, [[batch, loadTableName, columnTypeOrderedDict]], [])
+                    if(historyTableName is not None):
+                        insertList += [[batch.mapColumns(historyColumnList), historyTableName, {}]]
+                    chunkErrorList += oracleCheckpointInsert(insertList, [loadTableName, exportKey, contentHash, chunkRows, chunksLoaded, rowOffset + len(batch)],
+                                                             batchSize, rowOffset)
+                    if(typeInference is not None):
+                        typeInference.save()
+            errorList += chunkErrorList
+            metrics.addCount("rows", len(batch))
+            metrics.addCount("chunks")
+            metrics.addCount("batches", (len(batch) + batchSize - 1) // batchSize * (int(stagingTable) + int(historyTableName is not None)))
+            metrics.addCount("rejectedRows", len(chunkErrorList))
+            ifExistsParam = 'append'
+            rowOffset += len(batch)
+    if(typeInference is not None):
+        typeInference.save()
+
+    # Merge the delta into the table and move the watermark in one transaction
+    if(incremental):
+        with metrics.stage("postSql"), oracleConnection() as connection:
+            if(loadTableName != tableName and batch is not None):
+                mergeTable(tableName, loadTableName, batch.columnList, keyColumnList, connection)
+            if(newWatermark is not None):
+                setWatermark(reportIdentifier, tableName, newWatermark, connection)
+            connection.commit()
+    if(resumable):
+        with metrics.stage("postSql"):
+            clearCheckpoint(loadTableName, exportKey)
+    if(contentHash is not None):
+        setExportLoadedHash(loadTableName, reportIdentifier, instance, exportFilterList, contentHash, replaceTable)
+    return errorList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: Tables loaded by several cached reports are skipped or reloaded as a whole (V1 - V1.1)
+#     2026-10-18: Partitioned reports (partitionList) are refreshed a partition at a time as well (V1.1 - V1.2)
+#Purpose: The purpose of this function is to run several importSalesForceToSql jobs at the same time on a thread pool, so the report downloads overlap.
+#         Jobs that load the same table run one after another in the order given (eg a replace followed by an append).
+#         When all of the jobs of a table use exportCache = 'refresh' (and are not incremental), every export is refreshed first. The jobs are then
+#         replayed from the cache and either all skipped (nothing changed) or all loaded (something changed), so the table is never left with only part of the reports.
+#         Every job is allowed to finish; if any of them failed, the first error is raised afterwards.
+#    jobList <List of dictionaries>: The importSalesForceToSql parameters for each job (tableName, reportIdentifier, instance, columnTypeOrderedDict, dateMaskList, client, ...)
+#    maxWorkers <Number>: The maximum number of jobs to run at once (default: 4)
+#Returns: A 2D list of [table name, report identifier, rejected rows] for each job, in the order given
+def importSalesForceToSqlConcurrent(jobList, maxWorkers = 4):
+    tableJobDict = collections.OrderedDict()
+    for i in jobList:
+        tableJobDict.setdefault(i["tableName"], []).append(i)
+
+    resultDict = {}
+    def runTableJobs(tableJobList):
+        if(len(tableJobList) > 1 and all([i.get("exportCache") == 'refresh' and not i.get("incremental", False) for i in tableJobList])):
+            changed = False
+            for i in tableJobList:
+                if(i.get("partitionList", []) != []):
+                    partitionFilter = i.get("partitionFilter", "CREATED_DATE")
+                    contentHash = refreshPartitionCache(i["reportIdentifier"], i["instance"], i.get("client"), reportPartitionFilters([], partitionFilter, i["partitionList"]))
+                    loadedHash = exportLoadedHash(i["tableName"], i["reportIdentifier"], i["instance"], partitionKeyFilter([], partitionFilter, i["partitionList"]))
+                else:
+                    contentHash = refreshExportCache(i["reportIdentifier"], i["instance"], i.get("client"))
+                    loadedHash = exportLoadedHash(i["tableName"], i["reportIdentifier"], i["instance"])
+                changed = changed or contentHash != loadedHash
+            for i in tableJobList:
+                resultDict[id(i)] = importSalesForceToSql(**dict(i, exportCache = 'replay', skipUnchanged = not changed))
+            return
+        for i in tableJobList:
+            resultDict[id(i)] = importSalesForceToSql(**i)
+
+    errorList = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers = maxWorkers) as executor:
+        for i in concurrent.futures.as_completed([executor.submit(runTableJobs, j) for j in tableJobDict.values()]):
+            try:
+                i.result()
+            except Exception as e:
+                errorList += [e]
+    if(errorList != []):
+        raise errorList[0]
+    return [[i["tableName"], i["reportIdentifier"], resultDict[id(i)]] for i in jobList]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to keep the process running as a service that refreshes each entry (a named list of jobs) on its own interval,
+#         eg IS_MARKETING hourly and the opportunities every 15 minutes. The clients of the jobs keep their salesforce sessions and the oracle pool stays open between runs,
+#         so a small refresh does not pay for the imports and logins again. Each run goes through importSalesForceToSqlConcurrent, then the afterFunction of the entry.
+#         An entry never runs twice at the same time: when it comes due (or runNow is called) while it is running, the triggers are coalesced into one run once it finishes.
+#         Entries that load the same table wait for each other. A failed run is kept as the lastError of the entry, which runs again at its next interval.
+#    maxWorkers <Number>: The number of entries that can run at the same time (default: 2)
+#Tests:
+#    importScheduler = ImportScheduler()
+#    importScheduler.add("IS_MARKETING", [i for i in importJobList if i["tableName"] == "IS_MARKETING"], 60)
+#    importScheduler.run()
+class ImportScheduler:
+    def __init__(self, maxWorkers = 2):
+        self.maxWorkers = maxWorkers
+        self.entryDict = collections.OrderedDict()
+        self.tableLockDict = {}
+        self.condition = threading.Condition()
+        self.stopped = False
+
+    #Purpose: Add an entry to the schedule
+    #    name <String>: The name of the entry
+    #    jobList <List of dictionaries>: The keyword arguments of each importSalesForceToSql call (see importSalesForceToSqlConcurrent)
+    #    intervalMinutes <Number>: The minutes from the start of one run to the start of the next
+    #    afterFunction <function>: A function to call (with no arguments) after the jobs have loaded, eg to consolidate the history table (default: None)
+    #    maxWorkers <Number>: The number of the entry's jobs to run at the same time (default: 4)
+    #    runFirst <Boolean>: If true, the entry runs as soon as the scheduler starts, otherwise after its first interval (default: True)
+    def add(self, name, jobList, intervalMinutes, afterFunction = None, maxWorkers = 4, runFirst = True):
+        with self.condition:
+            self.entryDict[name] = dict(jobList = list(jobList), intervalSeconds = intervalMinutes * 60, afterFunction = afterFunction, maxWorkers = maxWorkers,
+                                        nextRun = time.monotonic() + ifEquals(runFirst, True, 0, intervalMinutes * 60), running = False, pending = False,
+                                        runCount = 0, lastRun = None, lastSeconds = None, lastError = None)
+            for i in jobList:
+                self.tableLockDict.setdefault(i["tableName"], threading.Lock())
+            self.condition.notify_all()
+        return self
+
+    #Purpose: Run an entry now (or, if it is running, once more when it finishes), then carry on with its interval
+    #    name <String>: The name of the entry
+    def runNow(self, name):
+        with self.condition:
+            if(self.entryDict[name]["running"]):
+                self.entryDict[name]["pending"] = True
+            else:
+                self.entryDict[name]["nextRun"] = time.monotonic()
+            self.condition.notify_all()
+
+    #Purpose: Stop the scheduler. The runs in progress finish, and run() returns once they have.
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    #Purpose: Return the state of each entry as [name, running, runs, last run time, seconds the last run took, seconds to the next run, last error]
+    def status(self):
+        with self.condition:
+            return [[i, j["running"], j["runCount"], j["lastRun"], j["lastSeconds"], max(j["nextRun"] - time.monotonic(), 0), j["lastError"]]
+                    for i, j in self.entryDict.items()]
+
+    #Purpose: Run the entries as they come due until stop() is called (eg from another thread) or the process is interrupted
+    def run(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.maxWorkers) as executor, self.condition:
+            self.stopped = False
+            while(not self.stopped):
+                now = time.monotonic()
+                waitSeconds = None
+                for i, j in self.entryDict.items():
+                    if(j["running"]):
+                        continue
+                    if(j["nextRun"] <= now):
+                        j["running"] = True
+                        executor.submit(self.runEntry, i)
+                    elif(waitSeconds is None or j["nextRun"] - now < waitSeconds):
+                        waitSeconds = j["nextRun"] - now
+                self.condition.wait(waitSeconds)
+
+    #Purpose: Run the jobs of an entry, holding the locks of its tables, and set when it runs next. A run that took longer than the interval is followed by one more straight away.
+    #    name <String>: The name of the entry
+    def runEntry(self, name):
+        entry = self.entryDict[name]
+        startTime = time.monotonic()
+        error = None
+        try:
+            with contextlib.ExitStack() as lockStack:
+                for i in sorted(set([j["tableName"] for j in entry["jobList"]])):
+                    lockStack.enter_context(self.tableLockDict[i])
+                importSalesForceToSqlConcurrent(entry["jobList"], entry["maxWorkers"])
+                if(entry["afterFunction"] is not None):
+                    entry["afterFunction"]()
+        except Exception as e:
+            error = e
+        with self.condition:
+            entry["running"] = False
+            entry["runCount"] += 1
+            entry["lastRun"] = datetime.datetime.now()
+            entry["lastSeconds"] = time.monotonic() - startTime
+            entry["lastError"] = error
+            entry["nextRun"] = ifEquals(entry["pending"], True, time.monotonic(), startTime + entry["intervalSeconds"])
+            entry["pending"] = False
+            self.condition.notify_all()
@@ -0,0 +1,472 @@
+# coding: utf-8
+
+# Jet Dataload Jobs
+# Author: Steven Henkel
+# Purpose: The reports the Jet Dataload loads (by table), how often they are refreshed, and the opportunity history they are consolidated into.
+#          Nothing is read or logged into until a job is built: the credentials of an instance are read the first time one of its jobs is (see instanceClient).
+
+import collections
+import datetime
+import threading
+
+from jetdataload import core
+from jetdataload.core import *
+
+# The credential file of each instance: the username, password and instance (and, where hasToken, the security token before the instance)
+instanceCredentialDict = collections.OrderedDict([["BlackBerry", ["BB_USER", False]],
+                                                  ["Good", ["GOOD_USER", False]],
+                                                  ["AtHoc", ["ATHOC_USER", True]]])
+
+# The options the jobs are run with: refreshed through the export cache, checkpointed and archived, or replayed from the cache
+refreshOptionDict = dict(exportCache = 'refresh', resumable = True, archiveSnapshot = True)
+replayOptionDict = dict(exportCache = 'replay', skipUnchanged = False, resumable = True)
+
+instanceClientDict = {}
+instanceClientLock = threading.Lock()
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to open the oracle pool from the login file (the schema, password and connection string), unless it is already open
+#    loginFile <String>: The credential file (default: "login")
+def connectOracle(loginFile = "login"):
+    if(core.oraclePool is None):
+        dbCred = txtToList(loginFile)
+        cxOracleConnection(name = dbCred[0],
+                           password = dbCred[1],
+                           connection = dbCred[2])
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the SalesforceClient of an instance, reading its credential file (see instanceCredentialDict) the first time.
+#         The same client is returned after that, so its session is reused by every job of the instance. The client logs in on its first export,
+#         so replaying the export cache never goes to salesforce.
+#    instanceName <String>: The instance (eg BlackBerry)
+def instanceClient(instanceName):
+    with instanceClientLock:
+        if(instanceName not in instanceClientDict):
+            fileName, hasToken = instanceCredentialDict[instanceName]
+            userList = txtToList(fileName)
+            if(hasToken):
+                instanceClientDict[instanceName] = SalesforceClient(userList[0], userList[1], userList[2], userList[3], instanceName)
+            else:
+                instanceClientDict[instanceName] = SalesforceClient(userList[0], userList[1], "", userList[2], instanceName)
+        return instanceClientDict[instanceName]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The column types are inferred from the report (see ColumnTypeInference) instead of declaring every column VARCHAR (V1 - V1.1)
+#Purpose: The purpose of this function is to return the jobs (the keyword arguments of importSalesForceToSql) that load BB_OPPORTUNITIES from the BlackBerry instance
+def blackBerryOpportunityJobs():
+    client = instanceClient("BlackBerry")
+
+    # https://docs.python.org/2/library/datetime.html#strftime-and-strptime-behavior
+    dateMaskList = [["CLOSE_DATE","%m/%d/%Y"],
+                    ["CREATED_DATE","%m/%d/%Y"],
+                    ["LAST_MODIFIED_DATE","%m/%d/%Y"],
+                    ["LAST_STAGE_CHANGE_DATE","%m/%d/%Y"]]
+
+    jobList = [dict(tableName = "BB_OPPORTUNITIES",
+                    reportIdentifier = "00OF0000006hM3t",
+                    instance = client.instance,
+                    columnTypeOrderedDict = None,
+                    dateMaskList = dateMaskList,
+                    instanceName = "BlackBerry",
+                    ifExists = 'replace',
+                    client = client)]
+    return jobList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The column types are inferred from the report (see ColumnTypeInference) instead of declaring every column VARCHAR (V1 - V1.1)
+#Purpose: The purpose of this function is to return the jobs (the keyword arguments of importSalesForceToSql) that load IS_MARKETING from the BlackBerry instance (the first report replaces the table and the second is appended to it)
+def blackBerryMarketingJobs():
+    client = instanceClient("BlackBerry")
+
+    dateMaskList = [["PY_EXTRACTED_DATE_VALUE","%Y-%m-%d %H:%M:%S"]]
+
+    jobList = [dict(tableName = "IS_MARKETING",
+                    reportIdentifier = "00OF0000006h3bl",
+                    instance = client.instance,
+                    columnTypeOrderedDict = None,
+                    dateMaskList = dateMaskList,
+                    instanceName = "BlackBerry",
+                    ifExists = 'replace',
+                    client = client)]
+
+    dateMaskList = [["PY_EXTRACTED_DATE_VALUE","%Y-%m-%d %H:%M:%S"]]
+
+    jobList += [dict(tableName = "IS_MARKETING",
+                     reportIdentifier = "00OF0000006h3bq",
+                     instance = client.instance,
+                     columnTypeOrderedDict = None,
+                     dateMaskList = dateMaskList,
+                     instanceName = "BlackBerry",
+                     ifExists = 'append',
+                     client = client)]
+    return jobList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: The report is exported a year of created dates at a time, as it is close to the export limit (V1 - V1.1)
+#     2026-10-18: The column types are inferred from the report (see ColumnTypeInference) instead of declaring every column VARCHAR (V1.1 - V1.2)
+#Purpose: The purpose of this function is to return the jobs (the keyword arguments of importSalesForceToSql) that load GOOD_OPPORTUNITIES from the Good instance
+def goodOpportunityJobs():
+    client = instanceClient("Good")
+
+    # https://docs.python.org/2/library/datetime.html#strftime-and-strptime-behavior
+    dateMaskList = [["CLOSE_DATE","%m/%d/%Y"],
+                    ["CREATED_DATE","%m/%d/%Y"],
+                    ["LAST_MODIFIED_DATE","%m/%d/%Y"],
+                    ["LAST_STAGE_CHANGE_DATE","%m/%d/%Y"]]
+
+    jobList = [dict(tableName = "GOOD_OPPORTUNITIES",
+                    reportIdentifier = "00O16000007gKx8",
+                    instance = client.instance,
+                    columnTypeOrderedDict = None,
+                    dateMaskList = dateMaskList,
+                    instanceName = "Good",
+                    ifExists = 'replace',
+                    client = client,
+                    partitionFilter = "CREATED_DATE",
+                    partitionList = datePartitions(datetime.date(2012, 1, 1)))]
+    return jobList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The column types are inferred from the report (see ColumnTypeInference) instead of declaring every column VARCHAR (V1 - V1.1)
+#Purpose: The purpose of this function is to return the jobs (the keyword arguments of importSalesForceToSql) that load ATHOC_OPPORTUNITIES from the AtHoc instance
+def athocOpportunityJobs():
+    client = instanceClient("AtHoc")
+
+    # https://docs.python.org/2/library/datetime.html#strftime-and-strptime-behavior
+    dateMaskList = [["CLOSE_DATE","%m/%d/%Y"],
+                    ["CREATED_DATE","%m/%d/%Y"],
+                    ["LAST_MODIFIED_DATE","%m/%d/%Y"]]
+
+    jobList = [dict(tableName = "ATHOC_OPPORTUNITIES",
+                    reportIdentifier = "00O37000001YKC1",
+                    instance = client.instance,
+                    columnTypeOrderedDict = None,
+                    dateMaskList = dateMaskList,
+                    instanceName = "AtHoc",
+                    ifExists = 'replace',
+                    client = client)]
+    return jobList
+
+# The job functions by the table they load
+jobFunctionDict = collections.OrderedDict([["BB_OPPORTUNITIES", blackBerryOpportunityJobs],
+                                           ["IS_MARKETING", blackBerryMarketingJobs],
+                                           ["GOOD_OPPORTUNITIES", goodOpportunityJobs],
+                                           ["ATHOC_OPPORTUNITIES", athocOpportunityJobs]])
+
+bbHistoryColumnList = splitListLoop("""OPPORTUNITY_ID,OPPORTUNITY_ID
+STAGE,STAGE
+PRODUCT_FAMILY,PRODUCT_FAMILY
+BLACKBERRY_REGION,BLACKBERRY_REGION
+BLACKBERRY_COUNTRY,BLACKBERRY_COUNTRY
+ACCOUNT_NAME,ACCOUNT_NAME
+PRODUCT_NAME,PRODUCT_NAME
+AMOUNT_CONVERTED_CURRENCY,AMOUNT_CONVERTED_CURRENCY
+AMOUNT_CONVERTED_,AMOUNT_CONVERTED_
+NET_TO_BLACKBERRY_REVENUE_CONV,NET_TO_BLACKBERRY_REVENUE_CONV
+NET_TO_BLACKBERRY_REVENUE_CON1,NET_TO_BLACKBERRY_REVENUE_CON1
+OPPORTUNITY_NAME,OPPORTUNITY_NAME
+OPPORTUNITY_OWNER,OPPORTUNITY_OWNER
+CLOSE_DATE,CLOSE_DATE
+LAST_STAGE_CHANGE_DATE,LAST_STAGE_CHANGE_DATE
+PROBABILITY_,PROBABILITY_
+AGE,AGE
+STAGE_DURATION,STAGE_DURATION
+CREATED_DATE,CREATED_DATE
+LAST_MODIFIED_DATE,LAST_MODIFIED_DATE
+FORECAST_CATEGORY,FORECAST_CATEGORY
+ACCOUNT_OWNER,ACCOUNT_OWNER
+PRODUCT_CODE,PRODUCT_CODE
+ACCOUNT_ID,ACCOUNT_ID
+PRIMARY_CAMPAIGN_SOURCE,PRIMARY_CAMPAIGN_SOURCE
+LEAD_SOURCE,LEAD_SOURCE
+CREATED_BY,
+TYPE,
+LOGO_TYPE,
+TERRITORY_NAME,BLACKBERRY_SALES_SUB_GROUP
+BUDGET_LIKELIHOOD,
+SECTOR,
+BILLING_COUNTRY,BILLING_COUNTRY
+PY_DATA_SOURCE,PY_DATA_SOURCE
+PY_INSTANCE,PY_INSTANCE
+PY_EXTRACTED_DATE_VALUE,PY_EXTRACTED_DATE_VALUE""".split("\n"),",")
+
+goodHistoryColumnList = splitListLoop("""OPPORTUNITY_ID,OPPORTUNITY_ID
+STAGE,STAGE
+PRODUCT_FAMILY,PRODUCT_FAMILY
+BLACKBERRY_REGION,
+BLACKBERRY_COUNTRY,
+ACCOUNT_NAME,ACCOUNT_NAME
+PRODUCT_NAME,PRODUCT_NAME
+AMOUNT_CONVERTED_CURRENCY,AMOUNT_CONVERTED_CURRENCY
+AMOUNT_CONVERTED_,AMOUNT_CONVERTED_
+NET_TO_BLACKBERRY_REVENUE_CONV,TOTAL_SALES_PRICE_CONVERTED_CU
+NET_TO_BLACKBERRY_REVENUE_CON1,TOTAL_SALES_PRICE_CONVERTED_
+OPPORTUNITY_NAME,OPPORTUNITY_NAME
+OPPORTUNITY_OWNER,OPPORTUNITY_OWNER
+CLOSE_DATE,CLOSE_DATE
+LAST_STAGE_CHANGE_DATE,LAST_STAGE_CHANGE_DATE
+PROBABILITY_,PROBABILITY_
+AGE,AGE
+STAGE_DURATION,STAGE_DURATION
+CREATED_DATE,CREATED_DATE
+LAST_MODIFIED_DATE,LAST_MODIFIED_DATE
+FORECAST_CATEGORY,FORECAST_CATEGORY
+ACCOUNT_OWNER,ACCOUNT_OWNER
+PRODUCT_CODE,PRODUCT_CODE
+ACCOUNT_ID,ACCOUNT_ID
+PRIMARY_CAMPAIGN_SOURCE,PRIMARY_CAMPAIGN_SOURCE
+LEAD_SOURCE,LEAD_SOURCE
+CREATED_BY,CREATED_BY
+TYPE,TYPE
+LOGO_TYPE,LOGO_TYPE
+TERRITORY_NAME,TERRITORY_NAME
+BUDGET_LIKELIHOOD,
+SECTOR,
+BILLING_COUNTRY,BILLING_COUNTRY
+PY_DATA_SOURCE,PY_DATA_SOURCE
+PY_INSTANCE,PY_INSTANCE
+PY_EXTRACTED_DATE_VALUE,PY_EXTRACTED_DATE_VALUE""".split("\n"),",")
+
+athocHistoryColumnList = splitListLoop("""OPPORTUNITY_ID,OPPORTUNITY_ID
+STAGE,ATHOC_STAGE
+PRODUCT_FAMILY,
+BLACKBERRY_REGION,
+BLACKBERRY_COUNTRY,
+ACCOUNT_NAME,ACCOUNT_NAME
+PRODUCT_NAME,PRODUCT
+AMOUNT_CONVERTED_CURRENCY,AMOUNT_CONVERTED_CURRENCY
+AMOUNT_CONVERTED_,AMOUNT_CONVERTED_
+NET_TO_BLACKBERRY_REVENUE_CONV,AMOUNT_CONVERTED_CURRENCY
+NET_TO_BLACKBERRY_REVENUE_CON1,AMOUNT_CONVERTED_
+OPPORTUNITY_NAME,OPPORTUNITY_NAME
+OPPORTUNITY_OWNER,OPPORTUNITY_OWNER
+CLOSE_DATE,CLOSE_DATE
+LAST_STAGE_CHANGE_DATE,
+PROBABILITY_,
+AGE,AGE
+STAGE_DURATION,STAGE_DURATION
+CREATED_DATE,CREATED_DATE
+LAST_MODIFIED_DATE,LAST_MODIFIED_DATE
+FORECAST_CATEGORY,FORECAST_CATEGORY
+ACCOUNT_OWNER,ACCOUNT_OWNER
+PRODUCT_CODE,
+ACCOUNT_ID,ACCOUNT_ID
+PRIMARY_CAMPAIGN_SOURCE,
+LEAD_SOURCE,LEAD_SOURCE
+CREATED_BY,
+TYPE,
+LOGO_TYPE,
+TERRITORY_NAME,
+BUDGET_LIKELIHOOD,BUDGET_LIKELIHOOD
+SECTOR,SECTOR
+BILLING_COUNTRY,BILLING_COUNTRY
+PY_DATA_SOURCE,PY_DATA_SOURCE
+PY_INSTANCE,PY_INSTANCE
+PY_EXTRACTED_DATE_VALUE,PY_EXTRACTED_DATE_VALUE""".split("\n"),",")
+
+#Date Created: 2016-03-20
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The engine is passed to create_all, since sqlAlchemy 2 has no bound metadata (V1 - V1.1)
+#Purpose: The purpose of this function is to create the history table only if it doesn't exist
+def createOpportunityHistory():
+    from sqlalchemy import schema, types
+
+    # This code creates the history table only if it doesn't exist
+    if(not tableExists("OPPORTUNITY_HISTORY")):
+        metadata = schema.MetaData()
+
+        schema.Table('OPPORTUNITY_HISTORY', metadata,
+            schema.Column('OPPORTUNITY_ID', types.VARCHAR(1000)),
+            schema.Column('STAGE', types.VARCHAR(1000)),
+            schema.Column('PRODUCT_FAMILY', types.VARCHAR(1000)),
+            schema.Column('BLACKBERRY_REGION', types.VARCHAR(1000)),
+            schema.Column('BLACKBERRY_COUNTRY', types.VARCHAR(1000)),
+            schema.Column('ACCOUNT_NAME', types.VARCHAR(1000)),
+            schema.Column('PRODUCT_NAME', types.VARCHAR(1000)),
+            schema.Column('AMOUNT_CONVERTED_CURRENCY', types.VARCHAR(1000)),
+            schema.Column('AMOUNT_CONVERTED_', types.VARCHAR(1000)),
+            schema.Column('NET_TO_BLACKBERRY_REVENUE_CONV', types.VARCHAR(1000)),
+            schema.Column('NET_TO_BLACKBERRY_REVENUE_CON1', types.VARCHAR(1000)),
+            schema.Column('OPPORTUNITY_NAME', types.VARCHAR(1000)),
+            schema.Column('OPPORTUNITY_OWNER', types.VARCHAR(1000)),
+            schema.Column('CLOSE_DATE', types.DATE),
+            schema.Column('LAST_STAGE_CHANGE_DATE', types.DATE),
+            schema.Column('PROBABILITY_', types.VARCHAR(1000)),
+            schema.Column('AGE', types.VARCHAR(1000)),
+            schema.Column('STAGE_DURATION', types.VARCHAR(1000)),
+            schema.Column('CREATED_DATE', types.DATE),
+            schema.Column('LAST_MODIFIED_DATE', types.DATE),
+            schema.Column('FORECAST_CATEGORY', types.VARCHAR(1000)),
+            schema.Column('ACCOUNT_OWNER', types.VARCHAR(1000)),
+            schema.Column('PRODUCT_CODE', types.VARCHAR(1000)),
+            schema.Column('ACCOUNT_ID', types.VARCHAR(1000)),
+            schema.Column('PRIMARY_CAMPAIGN_SOURCE', types.VARCHAR(1000)),
+            schema.Column('LEAD_SOURCE', types.VARCHAR(1000)),
+            schema.Column('CREATED_BY', types.VARCHAR(1000)),
+            schema.Column('TYPE', types.VARCHAR(1000)),
+            schema.Column('LOGO_TYPE', types.VARCHAR(1000)),
+            schema.Column('TERRITORY_NAME', types.VARCHAR(1000)),
+            schema.Column('BUDGET_LIKELIHOOD', types.VARCHAR(1000)),
+            schema.Column('SECTOR', types.VARCHAR(1000)),
+            schema.Column('BILLING_COUNTRY', types.VARCHAR(1000)),
+            schema.Column('PY_DATA_SOURCE', types.VARCHAR(1000)),
+            schema.Column('PY_INSTANCE', types.VARCHAR(1000)),
+            schema.Column('PY_EXTRACTED_DATE_VALUE', types.DATE),
+            schema.Column('ROW_HASH', types.VARCHAR(32)),
+            schema.Column('VALID_FROM', types.DATE),
+            schema.Column('VALID_TO', types.DATE)
+        )
+
+        metadata.create_all(core.engineSqlAlchemy, checkfirst=True)
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.2
+#Change Notes:
+#     2026-10-18: The statistics are only gathered when they are stale, since the schedule runs this every 15 minutes (V1 - V1.1)
+#     2026-10-18: The indexes are only set aside with bulkLoad (the nightly full load). The 15 minute runs change a few rows, which the indexes take as they go (V1.1 - V1.2)
+#Purpose: The purpose of this function is to add the rows of the 3 instances that are new or changed since the last run to the history table,
+#         and close the rows that changed, in one transaction. With bulkLoad the other indexes of the history table are set aside for the load and rebuilt afterwards
+#         (the row hash index is kept, the load looks rows up with it).
+#    bulkLoad <Boolean>: If true, load the history table in bulkLoadMode (default: False)
+#    gatherStats <Boolean or String>: When to gather the statistics of the history table afterwards (see bulkLoadMode) (default: 'stale')
+def consolidateOpportunityHistory(bulkLoad = False, gatherStats = 'stale'):
+    tableMappingList = [["BB_OPPORTUNITIES", bbHistoryColumnList],
+                        ["GOOD_OPPORTUNITIES", goodHistoryColumnList],
+                        ["ATHOC_OPPORTUNITIES", athocHistoryColumnList]]
+    if(bulkLoad):
+        with bulkLoadMode("OPPORTUNITY_HISTORY", gatherStats = gatherStats, keepIndexList = ["OPPORTUNITY_HISTORY_ROWHASH"]):
+            consolidateTableChanges("OPPORTUNITY_HISTORY", tableMappingList)
+        return
+    consolidateTableChanges("OPPORTUNITY_HISTORY", tableMappingList)
+    if(gatherStats == 'stale'):
+        gatherStats = tableStatsStale("OPPORTUNITY_HISTORY")
+    if(gatherStats):
+        gatherTableStats("OPPORTUNITY_HISTORY")
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to consolidate the opportunity history after the nightly full load, setting its indexes aside and gathering its statistics
+def consolidateOpportunityHistoryNightly():
+    consolidateOpportunityHistory(bulkLoad = True, gatherStats = True)
+
+# The options of the 15 minute refresh: only the rows modified since the watermark are pulled and merged (see importSalesForceToSql incremental)
+incrementalOptionDict = dict(refreshOptionDict, incremental = True)
+
+# The schedule entries as [name, tables, minutes between runs, function to run after the tables have loaded,
+#     extra options for the jobs when scheduled (over the scheduler's), run as soon as the scheduler starts].
+#     The opportunities are merged incrementally every 15 minutes and loaded in full once a day, which also picks up the rows the watermark misses
+scheduleList = [["OPPORTUNITIES", ["BB_OPPORTUNITIES", "GOOD_OPPORTUNITIES", "ATHOC_OPPORTUNITIES"], 15, consolidateOpportunityHistory, incrementalOptionDict, True],
+                ["OPPORTUNITIES_NIGHTLY", ["BB_OPPORTUNITIES", "GOOD_OPPORTUNITIES", "ATHOC_OPPORTUNITIES"], 1440, consolidateOpportunityHistoryNightly, {}, False],
+                ["IS_MARKETING", ["IS_MARKETING"], 60, None, {}, True]]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the tables of the tables or schedule entries named, once each and in order, without building their jobs
+#    nameList <List>: The tables (see jobFunctionDict) or schedule entries (see scheduleList) (default: None for every table)
+#Tests:
+#    jobTableNames(["OPPORTUNITIES", "BB_OPPORTUNITIES"]) = ['BB_OPPORTUNITIES', 'GOOD_OPPORTUNITIES', 'ATHOC_OPPORTUNITIES']
+#    jobTableNames(["OPPORTUNITY"]) raises KeyError
+def jobTableNames(nameList = None):
+    tableNameList = []
+    for i in ifEquals(nameList, None, list(jobFunctionDict.keys()), nameList):
+        scheduleTableList = [j[1] for j in scheduleList if j[0] == i]
+        if(scheduleTableList != []):
+            tableNameList += scheduleTableList[0]
+        elif(i in jobFunctionDict):
+            tableNameList += [i]
+        else:
+            raise KeyError("There is no table or schedule entry named " + i + " (" + ", ".join(list(jobFunctionDict.keys()) + [j[0] for j in scheduleList]) + ")")
+    return list(collections.OrderedDict.fromkeys(tableNameList))
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to return the jobs of the tables or schedule entries named, in order. Only the instances of those jobs are logged into.
+#    nameList <List>: The tables (see jobFunctionDict) or schedule entries (see scheduleList) (default: None for every table)
+#    optionDict <dictionary>: Extra keyword arguments for every job (eg refreshOptionDict) (default: {})
+#Tests:
+#    [i["tableName"] for i in importJobs(["IS_MARKETING"])] = ['IS_MARKETING', 'IS_MARKETING']
+def importJobs(nameList = None, optionDict = {}):
+    jobList = []
+    for i in jobTableNames(nameList):
+        jobList += [dict(j, **optionDict) for j in jobFunctionDict[i]()]
+    return jobList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The options of the schedule entries are not used here, so a schedule entry run once loads its tables in full (V1 - V1.1)
+#Purpose: The purpose of this function is to run the jobs of the tables or schedule entries named, then the functions of the schedule entries that were named (eg the history)
+#    nameList <List>: The tables or schedule entries (see importJobs)
+#    optionDict <dictionary>: Extra keyword arguments for every job (default: refreshOptionDict)
+#    maxWorkers <Number>: The number of tables to load at the same time (default: 4)
+def runJobs(nameList, optionDict = refreshOptionDict, maxWorkers = 4):
+    resultList = importSalesForceToSqlConcurrent(importJobs(nameList, optionDict), maxWorkers = maxWorkers)
+    for i in scheduleList:
+        if(i[0] in nameList and i[3] is not None):
+            i[3]()
+    return resultList
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1.1
+#Change Notes:
+#     2026-10-18: The options of each schedule entry are added over optionDict (eg the 15 minute opportunities are incremental), and entries can wait for their first interval (V1 - V1.1)
+#Purpose: The purpose of this function is to return an ImportScheduler with the schedule entries (see scheduleList), ready to run()
+#    nameList <List>: The schedule entries to include (default: None for all of them)
+#    optionDict <dictionary>: Extra keyword arguments for every job, under the options of the entry (default: refreshOptionDict)
+#    maxWorkers <Number>: The number of entries that can run at the same time (default: 2)
+def jobScheduler(nameList = None, optionDict = refreshOptionDict, maxWorkers = 2):
+    importScheduler = ImportScheduler(maxWorkers = maxWorkers)
+    for i in scheduleList:
+        if(nameList is None or i[0] in nameList):
+            importScheduler.add(i[0], importJobs([i[0]], dict(optionDict, **i[4])), i[2], afterFunction = i[3], runFirst = i[5])
+    return importScheduler
@@ -0,0 +1,479 @@
+# coding: utf-8
+
+# Jet Dataload Tests
+# Author: Steven Henkel
+# Purpose: To check the helpers of jetdataload.core that can run without salesforce or oracle.
+# Usage: python -m pytest test_jetdataload.py
+
+import contextlib
+import datetime
+import hashlib
+import random
+import re
+import sqlite3
+import time
+
+import pytest
+
+import jetdataload.core
+from jetdataload.core import *
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to make a random salesforce csv export, with commas, quotes and newlines inside fields, blank fields
+#         and a footer after a blank line
+#    randomGenerator <random.Random>: The generator to use
+#    rowCount <Number>: The number of rows after the header
+def randomExportBytes(randomGenerator, rowCount):
+    characterList = ["a", "b", "1", " ", ",", "\"", "\n", "\r\n", "é"]
+    rowList = [["Opportunity ID", "Name", "Amount"]]
+    for i in range(rowCount):
+        rowList += [["".join(randomGenerator.choice(characterList) for j in range(randomGenerator.randint(0, 6))) for k in range(3)]]
+    lineList = [",".join("\"" + j.replace("\"", "\"\"") + "\"" for j in i) for i in rowList]
+    return ("\n".join(lineList) + "\n\n\"Footer\"\n\"Copyright\"\n").encode("utf-8")
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this function is to split bytes into blocks at random points, with some blocks empty or a single byte
+#    randomGenerator <random.Random>: The generator to use
+#    exportBytes <bytes>: The bytes to split
+def randomBlocks(randomGenerator, exportBytes):
+    blockList = []
+    start = 0
+    while(start < len(exportBytes)):
+        end = start + randomGenerator.choice([0, 1, 2, randomGenerator.randint(1, 64)])
+        blockList += [exportBytes[start:end]]
+        start = end
+    return blockList
+
+#Purpose: The shards of shardExportRecords must parse to the same rows as the chunks of streamCsvRows, however the export is split into blocks
+def testShardExportRecordsMatchesStreamCsvRows():
+    randomGenerator = random.Random(20261018)
+    for i in range(300):
+        exportBytes = randomExportBytes(randomGenerator, randomGenerator.randint(0, 12))
+        chunkRows = randomGenerator.randint(1, 5)
+        blockList = randomBlocks(randomGenerator, exportBytes)
+        shardList = list(shardExportRecords(iter(blockList), chunkRows))
+        assert [list(streamCsvRows([j]))[0] for j in shardList] == list(streamCsvRows([exportBytes], chunkRows))
+
+#Purpose: A block that holds only the blank line before the footer must end the export (the block has no record end of its own)
+def testShardExportRecordsFooterBlock():
+    assert list(shardExportRecords(iter([b'"A","B"\n"1","x"\n', b'\n"footer"\n']), 5)) == [b'"A","B"\n"1","x"\n']
+
+#Purpose: The parse workers filter out the invalid ids and convert the dates of every shard, in order. Empty blocks in the export are skipped over,
+#         a shard that every row is filtered out of is an empty batch, and an export smaller than chunkRows is a single shard.
+def testShardedReportBatches():
+    blockList = [b'"Opportunity ID","Close Date"\n"1","01/05/2016"\n', b'', b'"2 x","01/06/2016"\n"3 y","bad"\n', b'', b'"4","01/07/2016"\n\n"Footer"\n']
+    dateMaskList = [["CLOSE_DATE", "%m/%d/%Y"]]
+    batchList = list(shardedReportBatches(iter(blockList), dateMaskList, 2, 2))
+    assert [i.rowTuples() for i in batchList] == [[("1", datetime.datetime(2016, 1, 5))], [], [("4", datetime.datetime(2016, 1, 7))]]
+    assert batchList[0].columnList == ["OPPORTUNITY_ID", "CLOSE_DATE"]
+    batchList = list(shardedReportBatches(iter(blockList), dateMaskList, 100, 1))
+    assert [i.rowTuples() for i in batchList] == [[("1", datetime.datetime(2016, 1, 5)), ("4", datetime.datetime(2016, 1, 7))]]
+    assert [i.rowTuples() for i in shardedReportBatches(iter(blockList), dateMaskList, 2, 2, skipChunks = 1)] == [[], [("4", datetime.datetime(2016, 1, 7))]]
+
+#Date Created: 2026-10-18
+#Last Editted: 2026-10-18
+#Author(s): Steven Henkel
+#Edited by: Steven Henkel
+#Version: 1
+#Purpose: The purpose of this class is to stand in for a cx_Oracle connection with an in-memory sqlite database, so the sql of the history and merge helpers can run here.
+#         The oracle functions they use (standard_hash, rawtohex, nvl2, to_char) are registered with sqlite, the binds (:1) are numbered the sqlite way (?1),
+#         and the few statements sqlite words differently (an update alias, fetch first) are rewritten. user_tab_columns and user_indexes are views of sqlite_master
+#         (every column is a VARCHAR2).
+class SqliteOracleConnection:
+    def __init__(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.create_function("standard_hash", 2, lambda i, j: hashlib.md5(str(i).encode("utf-8")).digest())
+        self.connection.create_function("rawtohex", 1, lambda i: None if i is None else bytes(i).hex().upper())
+        self.connection.create_function("nvl2", 3, lambda i, j, k: ifEquals(i is None, True, k, j))
+        self.connection.create_function("to_char", 1, lambda i: None if i is None else str(i))
+        self.connection.execute("create view user_tab_columns as select upper(m.name) as table_name, c.name as column_name, 'VARCHAR2' as data_type " +
+                                "from sqlite_master m, pragma_table_info(m.name) c where m.type = 'table'")
+        self.connection.execute("create view user_indexes as select upper(name) as index_name from sqlite_master where type = 'index'")
+
+    #Purpose: Return a cursor that rewrites the oracle sql for sqlite
+    def cursor(self):
+        return SqliteOracleCursor(self.connection.cursor())
+
+    #Purpose: Commit the transaction
+    def commit(self):
+        self.connection.commit()
+
+    #Purpose: Roll the transaction back
+    def rollback(self):
+        self.connection.rollback()
+
+    #Purpose: Create a table
+    #    tableName <String>: The table
+    #    columnList <List>: The columns
+    def createTable(self, tableName, columnList):
+        self.connection.execute("create table " + tableName + " (" + ", ".join(columnList) + ")")
+
+    #Purpose: Return the rows of a query, sorted
+    #    sql <String>: The query
+    def rows(self, sql):
+        return sorted(self.connection.execute(sql).fetchall(), key = repr)
+
+#Purpose: The cursor of SqliteOracleConnection
+class SqliteOracleCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    #Purpose: Run a statement written for oracle
+    def execute(self, sql, parameterList = []):
+        sql = re.sub(r":([0-9]+)", r"?\1", sql)
+        sql = re.sub(r"^update (\w+) h set", r"update \1 as h set", sql)
+        sql = sql.replace("fetch first 1 rows only", "limit 1")
+        self.cursor.execute(sql, parameterList)
+
+    #Purpose: Return the next row
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    #Purpose: Return the remaining rows
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+#Purpose: Point oracleConnection at a SqliteOracleConnection for one test
+@pytest.fixture
+def sqliteOracle(monkeypatch):
+    connection = SqliteOracleConnection()
+    monkeypatch.setattr(jetdataload.core, "oracleConnection", lambda: contextlib.nullcontext(connection))
+    return connection
+
+#Purpose: Open history rows that have no ROW_HASH (appended before it was added) are hashed and matched, so an unchanged row is not appended again.
+#         A changed row closes its open version and appends a new one.
+def testConsolidateTableChangesKeepsUnchangedRows(sqliteOracle):
+    sqliteOracle.createTable("BB_OPPORTUNITIES", ["OPPORTUNITY_ID", "PY_INSTANCE", "STAGE", "PY_EXTRACTED_DATE_VALUE"])
+    sqliteOracle.createTable("OPPORTUNITY_HISTORY", ["OPPORTUNITY_ID", "PY_INSTANCE", "STAGE", "PY_EXTRACTED_DATE_VALUE", "ROW_HASH", "VALID_FROM", "VALID_TO"])
+    sqliteOracle.connection.executemany("insert into BB_OPPORTUNITIES values (?, ?, ?, '2026-10-18')", [["1", "BB", "Won"], ["2", "BB", "Open"], ["2", "BB", None]])
+    sqliteOracle.connection.executemany("insert into OPPORTUNITY_HISTORY values (?, ?, ?, '2026-10-17', null, null, null)", [["1", "BB", "Won"], ["2", "BB", "Open"], ["2", "BB", None]])
+    mappingList = [[i, i] for i in ["OPPORTUNITY_ID", "PY_INSTANCE", "STAGE", "PY_EXTRACTED_DATE_VALUE"]]
+
+    for i in range(2):
+        metrics = ImportMetrics("OPPORTUNITY_HISTORY", "test")
+        consolidateTableChanges("OPPORTUNITY_HISTORY", [["BB_OPPORTUNITIES", mappingList]], metrics = metrics)
+        assert metrics.countDict["rows"] == 0 and metrics.countDict["closedRows"] == 0
+        assert metrics.countDict["rehashedRows"] == ifEquals(i, 0, 3, 0)
+    assert sqliteOracle.rows("select count(*), count(ROW_HASH) from OPPORTUNITY_HISTORY where VALID_TO is null") == [(3, 3)]
+
+    sqliteOracle.connection.execute("update BB_OPPORTUNITIES set STAGE = 'Lost' where OPPORTUNITY_ID = '1'")
+    metrics = ImportMetrics("OPPORTUNITY_HISTORY", "test")
+    consolidateTableChanges("OPPORTUNITY_HISTORY", [["BB_OPPORTUNITIES", mappingList]], metrics = metrics)
+    assert metrics.countDict["rows"] == 1 and metrics.countDict["closedRows"] == 1
+    assert sqliteOracle.rows("select OPPORTUNITY_ID, STAGE from OPPORTUNITY_HISTORY where VALID_TO is null") == [("1", "Lost"), ("2", "Open"), ("2", None)]
+
+#Purpose: A key with several rows in the delta (eg one per product line) replaces every row of that key in the table, and the keys not in the delta are left alone
+def testMergeTableReplacesDuplicateKeys(sqliteOracle):
+    columnList = ["OPPORTUNITY_ID", "PY_INSTANCE", "PRODUCT"]
+    sqliteOracle.createTable("BB_OPPORTUNITIES", columnList)
+    sqliteOracle.createTable("BB_OPPORTUNITIES_DELTA", columnList)
+    sqliteOracle.connection.executemany("insert into BB_OPPORTUNITIES values (?, ?, ?)", [["1", "BB", "a"], ["1", "BB", "b"], ["2", "BB", "c"], ["1", "GOOD", "d"]])
+    sqliteOracle.connection.executemany("insert into BB_OPPORTUNITIES_DELTA values (?, ?, ?)", [["1", "BB", "a"], ["1", "BB", "z"], ["3", "BB", "q"], ["3", "BB", "r"]])
+    mergeTable("BB_OPPORTUNITIES", "BB_OPPORTUNITIES_DELTA", columnList, ["OPPORTUNITY_ID", "PY_INSTANCE"], sqliteOracle)
+    assert sqliteOracle.rows("select * from BB_OPPORTUNITIES") == sorted([("1", "BB", "a"), ("1", "BB", "z"), ("1", "GOOD", "d"), ("2", "BB", "c"),
+                                                                         ("3", "BB", "q"), ("3", "BB", "r")], key = repr)
+    with pytest.raises(ValueError):
+        mergeTable("BB_OPPORTUNITIES", "BB_OPPORTUNITIES_DELTA", ["OPPORTUNITY_ID", "PRODUCT"], ["OPPORTUNITY_ID", "PY_INSTANCE"], sqliteOracle)
+
+#Purpose: Stand in for a SalesforceClient that exports the same blocks every time
+class BlockExportClient:
+    def __init__(self, blockList):
+        self.blockList = blockList
+
+    #Purpose: Yield the blocks of the export
+    def exportBytes(self, reportIdentifier, byteChunkSize = 65536, filterList = [], metrics = None):
+        for i in self.blockList:
+            yield i
+
+#Purpose: The cached hash covers the data and not the footer, the index is swapped in with no temporary file left over,
+#         and an index that cannot be read is a cache miss
+def testRefreshExportCacheIndex(tmp_path, monkeypatch):
+    monkeypatch.setattr(jetdataload.core, "exportCacheDirectory", str(tmp_path))
+    dataBytes = b'"A","B"\n"1","x\n\ny"\n'
+    contentHash = refreshExportCache("00O1", "na1", BlockExportClient([dataBytes, b'\n"Footer ', b'2026"\n']))
+    assert contentHash == hashlib.sha256(dataBytes).hexdigest() == cachedExportHash("00O1", "na1")
+    assert refreshExportCache("00O1", "na1", BlockExportClient([dataBytes + b'\n"Footer 2027"\n'])) == contentHash
+    assert sorted(i.name for i in tmp_path.iterdir()) == ["na1_00O1.csv.gz", "na1_00O1.json"]
+
+    (tmp_path / "na1_00O1.json").write_text('{"sha256": ')
+    assert cachedExportHash("00O1", "na1") is None
+    (tmp_path / "na1_00O1.json").write_text('["sha256"]')
+    assert cachedExportHash("00O1", "na1") is None
+    assert cachedExportHash("00O2", "na1") is None
+
+#Purpose: A stored session is read back with the same credentials and not with others, and the key is derived once per process rather than on every read
+def testSalesforceSessionCacheDerivesKeyOnce(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    monkeypatch.setattr(jetdataload.core, "sessionCacheFile", str(tmp_path / "sessions.json"))
+    monkeypatch.setattr(jetdataload.core, "sessionKeyCache", {})
+    derivedList = []
+    pbkdf2 = hashlib.pbkdf2_hmac
+    monkeypatch.setattr(hashlib, "pbkdf2_hmac", lambda *i: derivedList.append(i) or pbkdf2(*i))
+
+    storeSalesforceSession("user", "password", "token", "session1", "na1.salesforce.com")
+    storeSalesforceSession("other", "password2", "token", "session2", "na2.salesforce.com")
+    for i in range(3):
+        assert cachedSalesforceSession("user", "password", "token") == ["session1", "na1.salesforce.com"]
+    assert cachedSalesforceSession("other", "password2", "token") == ["session2", "na2.salesforce.com"]
+    assert cachedSalesforceSession("user", "wrong", "token") is None
+    assert len(derivedList) == 3
+
+#Purpose: Stand in for a streamed requests response
+class ClosingResponse:
+    def __init__(self):
+        self.closeCount = 0
+        self.headers = {}
+
+    #Purpose: Count the closes
+    def close(self):
+        self.closeCount += 1
+
+#Purpose: A streamed response keeps its slot until it is closed, and closing it again does not give back a second slot.
+#         A call that raises and a throttled attempt that is retried give their slots back straight away.
+def testRequestGovernorHoldsStreamSlot(monkeypatch):
+    monkeypatch.setattr(jetdataload.core, "governorBackoffSeconds", 0)
+    governor = RequestGovernor(4, 2)
+    response = governor.holdResponse(governor.call(lambda: [ClosingResponse(), False, None], "export", holdSlot = True))
+    assert governor.status()[1] == 1
+    response.close()
+    response.close()
+    assert governor.status()[1] == 0 and response.closeCount == 2
+
+    attemptList = []
+    response = governor.holdResponse(governor.call(lambda: attemptList.append(1) or [ClosingResponse(), len(attemptList) < 3, None], "export", holdSlot = True))
+    assert len(attemptList) == 3 and governor.status()[1] == 1
+    response.close()
+    with pytest.raises(ValueError):
+        governor.call(lambda: int("x"), "export", holdSlot = True)
+    assert governor.status()[1] == 0
+
+#Purpose: The sql name of a header as the 2016 version of convertSQLNames made it, with 21 replaces and the underscores collapsed 10 at a time down to 2
+def baselineSqlName(columnEntry):
+    for i in " <>:;,?\\()/[]#.$%-!&":
+        columnEntry = columnEntry.replace(i, "_")
+    columnEntry = columnEntry.replace("'", "")
+    for i in range(10, 1, -1):
+        columnEntry = columnEntry.replace("_" * i, "_")
+    if(isNumber(columnEntry[0])):
+        columnEntry = "C_" + columnEntry
+    return columnEntry[:30].upper()
+
+#Purpose: reportColumnList names the columns as the 2016 loader did (convertSQLNames, then addUniqueListElement against the names so far),
+#         for headers with repeated names, reserved characters, leading digits and names cut at 30 characters, and again from headerColumnCache
+def testReportColumnListMatchesBaseline():
+    randomGenerator = random.Random(20261018)
+    nameList = ["Stage", "stage", "Stage 1", "STAGE1", "Amount (converted)", "Amount  (converted)", "1st Owner's Region", "a__b", "a_____________b",
+                "Net to BlackBerry Revenue (converted)", "Net to BlackBerry Revenue (converted) 2", "#%$!", "x" * 29, "x" * 31, "Owner: Name/Role [1]"]
+    for i in range(200):
+        headerRow = [randomGenerator.choice(nameList) for j in range(randomGenerator.randint(1, 12))]
+        expectedList = []
+        for j in headerRow:
+            assert convertSQLNames(j) == baselineSqlName(j)
+            expectedList += [addUniqueListElement(expectedList, baselineSqlName(j))]
+        assert reportColumnList(headerRow) == expectedList
+        assert reportColumnList(headerRow) == expectedList
+
+#Purpose: When the load fails and the indexes cannot be restored either, the error of the load is raised (from the restore error) and the restore failure is warned about
+def testBulkLoadModeRaisesLoadErrorWhenRestoreFails(monkeypatch):
+    def restoreTableIndexes(tableName, disabledList, parallel, rebuildWorkers):
+        raise RuntimeError("ORA-01652")
+    monkeypatch.setattr(jetdataload.core, "disableTableIndexes", lambda *i: [["unusable", "OPPORTUNITY_HISTORY_STAGE", None, "1"]])
+    monkeypatch.setattr(jetdataload.core, "restoreTableIndexes", restoreTableIndexes)
+    with pytest.warns(UserWarning, match = "unusable OPPORTUNITY_HISTORY_STAGE"):
+        with pytest.raises(ValueError) as errorInfo:
+            with bulkLoadMode("OPPORTUNITY_HISTORY"):
+                raise ValueError("load failed")
+    assert isinstance(errorInfo.value.__cause__, RuntimeError)
+
+#Purpose: Fields keep their quoted commas, newlines (either kind) and doubled quotes, the chunks hold at most chunkRows rows with the header first,
+#         and the footer after the blank line is dropped
+def testStreamCsvRows():
+    exportBytes = '﻿"Name","Note"\n"a,b","line 1\nline 2"\n"say ""hi""","x\r\ny"\n"","é"\n\n"Generated By:","someone"\n'.encode("utf-8")
+    rowList = [["Name", "Note"], ["a,b", "line 1\nline 2"], ['say "hi"', "x\r\ny"], ["", "é"]]
+    assert list(streamCsvRows([exportBytes])) == [rowList]
+    assert list(streamCsvRows([exportBytes[i:i + 1] for i in range(len(exportBytes))], 3)) == [rowList[:3], rowList[3:]]
+    assert list(streamCsvRows([b'"a"\n"1"\n'], 1)) == [[["a"]], [["1"]]]
+    assert list(streamCsvRows([b''])) == []
+
+#Purpose: Filters only mask the rows, constant columns are stored once, and mapColumns renames and arranges the columns (null where there is no source) sharing the mask
+def testReportBatchFilterAndMapColumns():
+    batch = ReportBatch.fromRows(["ID", "STAGE", "AMOUNT"], [["1", "Won", "10"], ["2 x", "Lost"], ["3", "Open", "30"]])
+    assert len(batch) == 3 and batch.rowTuples() == [("1", "Won", "10"), ("2 x", "Lost", ""), ("3", "Open", "30")]
+    batch.filterString("ID", " ", False).addConstantColumn("PY_INSTANCE", "BB")
+    assert len(batch) == 2 and batch.rowCount == 3
+    assert batch.rowTuples() == [("1", "Won", "10", "BB"), ("3", "Open", "30", "BB")]
+    batch.filterString("STAGE", "Open", False)
+    assert list(batch.columnValues("ID")) == ["1"] and list(batch.columnValues("ID", masked = False)) == ["1", "2 x", "3"]
+
+    mappedBatch = batch.mapColumns([["OPPORTUNITY_ID", "ID"], ["PY_INSTANCE", "PY_INSTANCE"], ["REGION", ""], ["TYPE"]])
+    assert mappedBatch.columnList == ["OPPORTUNITY_ID", "PY_INSTANCE", "REGION", "TYPE"]
+    assert mappedBatch.rowTuples() == [("1", "BB", None, None)]
+    assert list(mappedBatch.iterRowBatches(1, nullEmpty = True)) == [[("1", "BB", None, None)]]
+    assert ReportBatch.fromRows(["A", "B"], [["", "x"]]).rowTuples(nullEmpty = True) == [(None, "x")]
+
+#Purpose: Each date column is parsed with its own mask. Dates that cannot be parsed and empty dates become None (and are flagged in the null mask),
+#         dates that are already datetimes are kept, and a constant date column is parsed once
+def testConvertDateColumns():
+    batch = ReportBatch.fromRows(["CLOSE_DATE", "CREATED_DATE", "NAME"], [["01/05/2016", "2016-01-05 10:20:30", "a"], ["13/45/2016", "", "b"],
+                                                                          ["", "bad", "c"], ["01/05/2016", "2016-02-29 00:00:00", "d"]])
+    batch.addConstantColumn("PY_EXTRACTED_DATE_VALUE", "2026-10-18 01:02:03")
+    nullMaskDict = convertDateColumns(batch, [["CLOSE_DATE", "%m/%d/%Y"], ["CREATED_DATE", "%Y-%m-%d %H:%M:%S"], ["PY_EXTRACTED_DATE_VALUE", "%Y-%m-%d %H:%M:%S"],
+                                              ["MISSING", "%m/%d/%Y"]])
+    assert list(batch.columnValues("CLOSE_DATE")) == [datetime.datetime(2016, 1, 5), None, None, datetime.datetime(2016, 1, 5)]
+    assert list(batch.columnValues("CREATED_DATE")) == [datetime.datetime(2016, 1, 5, 10, 20, 30), None, None, datetime.datetime(2016, 2, 29)]
+    assert list(nullMaskDict["CLOSE_DATE"]) == [False, True, True, False]
+    assert list(nullMaskDict["PY_EXTRACTED_DATE_VALUE"]) == [False] * 4 and "MISSING" not in nullMaskDict
+    assert batch.constantValues["PY_EXTRACTED_DATE_VALUE"] == datetime.datetime(2026, 10, 18, 1, 2, 3)
+
+    for i in range(2):
+        assert parseDateValues(["01/05/2016", "bad", "", None, datetime.datetime(2020, 1, 1), "01/05/2016"], "%m/%d/%Y") == \
+            [datetime.datetime(2016, 1, 5), None, None, None, datetime.datetime(2020, 1, 1), datetime.datetime(2016, 1, 5)]
+
+#Purpose: The inferred types widen with every batch: numbers keep their digits and scale (with headroom), a non-number makes the column a VARCHAR2 rounded up,
+#         python dates make a DATE, and blank values change nothing. A corrupt cache file starts from nothing.
+def testColumnTypeInference(tmp_path):
+    typeInference = ColumnTypeInference("00O1", "")
+    typeInference.observe(ReportBatch.fromRows(["A", "B", "C", "D", "E"], [["12.50", "x", "0012", "", "-3"]]))
+    typeInference.observe(ReportBatch.fromRows(["A", "B", "C", "D", "E"], [["1234", "abcdefghijkl", "7", "", "+.125"]]))
+    dateBatch = ReportBatch.fromRows(["F"], [["01/05/2016"]])
+    convertDateColumns(dateBatch, [["F", "%m/%d/%Y"]])
+    typeInference.observe(dateBatch)
+    assert [repr(i) for i in typeInference.columnTypes(["A", "B", "C", "D", "E", "F"]).values()] == \
+        ["NUMBER(precision=8, scale=2, asdecimal=True)", "VARCHAR2(length=20)", "VARCHAR2(length=10)", "VARCHAR2(length=10)",
+         "NUMBER(precision=6, scale=3, asdecimal=True)", "DATE()"]
+
+    (tmp_path / "schema.json").write_text("{not json")
+    typeInference = ColumnTypeInference("00O1", str(tmp_path / "schema.json"))
+    assert typeInference.profileDict == {}
+    typeInference.observeValues("A", ["5"])
+    typeInference.save()
+    assert ColumnTypeInference("00O1", str(tmp_path / "schema.json")).profileDict == typeInference.profileDict
+
+#Purpose: widerColumnType keeps the most integer digits and the largest scale of two NUMBERs, the longer VARCHAR2, and gives up (None) on different kinds
+def testWiderColumnType():
+    oracleTypes = sqlalchemy.dialects.oracle
+    assert repr(widerColumnType(oracleTypes.NUMBER(5, 2), oracleTypes.NUMBER(4, 0))) == "NUMBER(precision=6, scale=2, asdecimal=True)"
+    assert repr(widerColumnType(oracleTypes.NUMBER(38, 0), oracleTypes.NUMBER(3, 2))) == "NUMBER(asdecimal=False)"
+    assert repr(widerColumnType(oracleTypes.NUMBER(), oracleTypes.NUMBER(3, 2))) == "NUMBER(asdecimal=False)"
+    assert repr(widerColumnType(oracleTypes.VARCHAR2(20), oracleTypes.VARCHAR2(100))) == "VARCHAR2(length=100)"
+    assert widerColumnType(oracleTypes.NUMBER(5, 2), oracleTypes.VARCHAR2(10)) is None
+    assert repr(widerColumnType(sqlalchemy.types.DATE(), sqlalchemy.types.DATE())) == "DATE()"
+
+#Purpose: The governor raises its limit by 1/limit for each response in good time (up to maxConcurrency), and halves it (down to 1) when the org throttles a request,
+#         the api usage is over the high water mark, or a request is much slower than the average of its kind, at most once per average request time
+def testRequestGovernorAimd(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    governor = RequestGovernor(4, 2)
+    for i in range(2):
+        governor.acquire()
+        governor.release(1.0)
+    assert governor.concurrency == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+    for i in range(20):
+        governor.acquire()
+        governor.release(1.0)
+    assert governor.concurrency == 4.0 and governor.status()[:3] == [4, 0, {"request": 1.0}]
+
+    governor.acquire()
+    governor.release(0.1, throttled = True)
+    governor.acquire()
+    governor.release(0.1, throttled = True)
+    assert governor.concurrency == 2.0 and governor.throttleCount == 2
+    clock[0] += 1.0
+    governor.acquire()
+    governor.release(1.0, apiUsage = 0.95)
+    assert governor.concurrency == 1.0 and governor.apiUsage == 0.95
+    clock[0] += 1.0
+    governor.acquire()
+    governor.release(1.0, latencyKey = "export")
+    governor.acquire()
+    governor.release(10.0, latencyKey = "export")
+    assert governor.concurrency == 1.0 and governor.latencyDict["export"] == pytest.approx(1.0 + 0.2 * 9.0)
+
+    governor.acquire()
+    governor.release()
+    assert governor.concurrency == 1.0 and governor.inFlight == 0
+
+#Purpose: A throttled call is retried after the backoff (doubling each time, or the Retry-After of the response), and the last result is returned once the retries run out
+def testRequestGovernorBackoff(monkeypatch):
+    sleepList = []
+    monkeypatch.setattr(time, "sleep", lambda i: sleepList.append(i))
+    monkeypatch.setattr(jetdataload.core, "governorMaxRetries", 3)
+    governor = RequestGovernor(4, 4)
+    attemptList = []
+    assert governor.call(lambda: attemptList.append(1) or [len(attemptList), len(attemptList) < 3, None]) == 3
+    assert sleepList == [2, 4]
+    assert governor.call(lambda: ["throttled", True, None]) == "throttled"
+    assert sleepList == [2, 4, 2, 4, 8]
+    response = ClosingResponse()
+    response.headers = {"Retry-After": "7"}
+    attemptList = []
+    assert governor.call(lambda: attemptList.append(1) or [response, len(attemptList) < 2, None]) is response
+    assert sleepList[-1] == 7 and governor.inFlight == 0
+
+#Purpose: The partitions are yielded as one export with the header once. A key that came from an earlier partition is dropped,
+#         the rows of a key within one partition are all kept, and partitions with different columns are refused
+def testMergePartitionChunks():
+    partitionList = [[[["Opportunity ID", "Product"], ["1", "a"], ["1", "b"]], [["2", "c"]]],
+                     [[["Opportunity ID", "Product"], ["2", "c"], ["3", "d"]], [["3", "e"], ["1", "z"]]],
+                     [[["Opportunity ID", "Product"], ["1", "y"]]]]
+    metrics = ImportMetrics("BB_OPPORTUNITIES", "test")
+    chunkList = list(mergePartitionChunks([iter(i) for i in partitionList], ["OPPORTUNITY_ID", "PY_INSTANCE"], metrics))
+    assert chunkList == [[["Opportunity ID", "Product"], ["1", "a"], ["1", "b"]], [["2", "c"]], [["3", "d"]], [["3", "e"]]]
+    assert metrics.countDict["duplicateRows"] == 3
+    assert sum(len(i) for i in mergePartitionChunks([iter(i) for i in partitionList], ["NOT_A_COLUMN"])) == 9
+    with pytest.raises(ValueError):
+        list(mergePartitionChunks([iter([[["A"], ["1"]]]), iter([[["B"], ["2"]]])], ["A"]))
+
+#Purpose: The export hash stops at the first blank line outside of quotes, however the export is split into blocks,
+#         so exports that only differ in the footer (or in blank lines inside a field) hash as they should
+def testExportHash():
+    dataBytes = b'"A","B"\n"1","x\n\ny"\n"2",""\n'
+    for i in range(len(dataBytes) + 1):
+        for footerBytes in [b'\n"Generated By: a"\n', b'\n\n"Generated By: b', b'']:
+            exportBytes = dataBytes + footerBytes
+            contentHash = ExportHash()
+            for j in [exportBytes[:i], exportBytes[i:i + 1], exportBytes[i + 1:]]:
+                contentHash.update(j)
+            assert contentHash.hexdigest() == hashlib.sha256(dataBytes).hexdigest()
+
+#Purpose: The values come through in order, an error in the producer is raised in the consumer after the values before it,
+#         and a consumer that stops early closes the iterable on the producer's thread
+def testPipelineIterator():
+    assert list(pipelineIterator(iter(range(50)), 2)) == list(range(50))
+
+    def failingValues():
+        yield 1
+        yield 2
+        raise KeyError("export failed")
+    valueList = []
+    with pytest.raises(KeyError):
+        for i in pipelineIterator(failingValues(), 1):
+            valueList += [i]
+    assert valueList == [1, 2]
+
+    closedList = []
+    def endlessValues():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closedList.append(True)
+    valueIterator = pipelineIterator(endlessValues(), 2)
+    assert [next(valueIterator) for i in range(3)] == [0, 1, 2]
+    valueIterator.close()
+    assert closedList == [True]